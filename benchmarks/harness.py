@@ -0,0 +1,233 @@
+"""
+Timing/memory harness shared by the benchmark scripts.
+
+A Case is a named piece of work over `bars` bars: setup() builds fresh
+state for one run (not timed), run(state) is the timed part. measure()
+times `repeat` runs, then one extra run under tracemalloc for the peak of
+Python + NumPy allocations during run().
+
+The code under test is imported from BENCH_SRC (default: this checkout's
+src/), so the same benchmark scripts can measure another tree;
+run_interleaved() uses that to time two trees in alternating processes.
+"""
+
+import json
+import os
+import platform
+import subprocess
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = Path(os.environ.get("BENCH_SRC") or ROOT / "src")
+sys.path.insert(0, str(SRC))
+
+
+@dataclass
+class Case:
+    name: str
+    bars: int
+    run: Callable[[Any], Any]
+    setup: Callable[[], Any] = lambda: None
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}@{self.bars}"
+
+
+def quartiles(values: List[float]) -> tuple:
+    q1, q2, q3 = np.percentile(values, [25, 50, 75])
+    return float(q1), float(q2), float(q3)
+
+
+def measure(case: Case, repeat: int = 3, memory: bool = True) -> Dict[str, Any]:
+    runs = []
+    for _ in range(repeat):
+        state = case.setup()
+        start = time.perf_counter()
+        case.run(state)
+        runs.append(time.perf_counter() - start)
+
+    peak_mb = None
+    if memory:
+        state = case.setup()
+        tracemalloc.start()
+        try:
+            case.run(state)
+            peak_mb = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        finally:
+            tracemalloc.stop()
+
+    q1, seconds, q3 = quartiles(runs)
+    return {
+        "case": case.name,
+        "bars": case.bars,
+        "runs": runs,
+        "seconds": seconds,
+        "iqr": q3 - q1,
+        "bars_per_sec": case.bars / seconds if seconds > 0 else float("inf"),
+        "peak_mb": peak_mb,
+    }
+
+
+def environment() -> Dict[str, Any]:
+    import pandas as pd
+    from utils.jit import backend
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "kernels": backend(),
+    }
+
+
+def write_report(results: List[Dict[str, Any]], path: Path, **meta) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    report = {"environment": environment(), **meta, "results": results}
+    path.write_text(json.dumps(report, indent=2) + "\n")
+    return path
+
+
+def load_report(path: Path) -> Dict[str, Any]:
+    return json.loads(Path(path).read_text())
+
+
+def print_table(results: List[Dict[str, Any]], header: bool = True) -> None:
+    if header:
+        print(f"{'case':<44}{'bars':>11}{'median s':>11}{'IQR s':>9}{'bars/s':>13}{'peak MB':>10}")
+    for row in results:
+        peak = "-" if row["peak_mb"] is None else f"{row['peak_mb']:.1f}"
+        print(
+            f"{row['case']:<44}{row['bars']:>11,}{row['seconds']:>11.4f}{row['iqr']:>9.4f}"
+            f"{row['bars_per_sec']:>13,.0f}{peak:>10}"
+        )
+
+
+# ---- Regression comparison ----
+
+def run_interleaved(
+    command: Sequence[str], sources: Dict[str, Path], rounds: int = 5,
+) -> Dict[str, List[List[Dict[str, Any]]]]:
+    """
+    Run `command <report path>` once per source tree per round, each in a
+    fresh process with BENCH_SRC pointing at that tree, and return every
+    side's reports' results. Sides alternate which goes first, so drift
+    in machine speed (thermal, other load) hits both trees alike.
+    """
+    names = list(sources)
+    reports: Dict[str, List[List[Dict[str, Any]]]] = {name: [] for name in names}
+    with tempfile.TemporaryDirectory() as tmp:
+        for index in range(rounds):
+            order = names if index % 2 == 0 else names[::-1]
+            for name in order:
+                output = Path(tmp) / f"{name}_{index}.json"
+                env = {**os.environ, "BENCH_SRC": str(sources[name])}
+                subprocess.run([*command, str(output)], cwd=ROOT, env=env, check=True)
+                reports[name].append(load_report(output)["results"])
+    return reports
+
+
+def merge_processes(reports: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    One row per case whose runs are the per-process medians, so the IQR
+    compare_results() allows for is the spread between processes (import
+    layout, allocator state, CPU frequency), not just within one.
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+    for results in reports:
+        for row in results:
+            entry = merged.setdefault(
+                f"{row['case']}@{row['bars']}",
+                {"case": row["case"], "bars": row["bars"], "runs": [], "peaks": []},
+            )
+            entry["runs"].append(row["seconds"])
+            if row.get("peak_mb") is not None:
+                entry["peaks"].append(row["peak_mb"])
+    rows = []
+    for entry in merged.values():
+        q1, seconds, q3 = quartiles(entry["runs"])
+        peaks = entry.pop("peaks")
+        rows.append({
+            **entry,
+            "seconds": seconds,
+            "iqr": q3 - q1,
+            "bars_per_sec": entry["bars"] / seconds if seconds > 0 else float("inf"),
+            "peak_mb": statistics.median(peaks) if peaks else None,
+        })
+    return rows
+
+
+def compare_results(
+    baseline: List[Dict[str, Any]],
+    current: List[Dict[str, Any]],
+    rel_tol: float = 0.10,
+    noise_mult: float = 2.0,
+    mem_tol: float = 0.10,
+    mem_slack_mb: float = 1.0,
+) -> List[Dict[str, Any]]:
+    """
+    Compare two result lists case by case (matched on case@bars).
+
+    A case is slower when its median run time exceeds
+        baseline median * (1 + rel_tol) + noise_mult * baseline IQR
+    and its interquartile box lies entirely above the baseline's (current
+    Q1 > baseline Q3), so one noisy run on either side cannot fail or pass
+    the gate alone. It regresses on memory when its tracemalloc peak grows
+    by more than mem_tol plus mem_slack_mb. Cases missing on one side are
+    reported, not failed.
+    """
+    base_by_key = {f"{row['case']}@{row['bars']}": row for row in baseline}
+    rows = []
+    for row in current:
+        key = f"{row['case']}@{row['bars']}"
+        base = base_by_key.pop(key, None)
+        cur_q1, cur_med, cur_q3 = quartiles(row["runs"])
+        if base is None:
+            rows.append({"key": key, "status": "new", "current_s": cur_med})
+            continue
+        base_q1, base_med, base_q3 = quartiles(base["runs"])
+        allowed = base_med * (1 + rel_tol) + noise_mult * (base_q3 - base_q1)
+        status = "ok"
+        if cur_med > allowed and cur_q1 > base_q3:
+            status = "slower"
+        elif base.get("peak_mb") is not None and row.get("peak_mb") is not None \
+                and row["peak_mb"] > base["peak_mb"] * (1 + mem_tol) + mem_slack_mb:
+            status = "memory"
+        rows.append({
+            "key": key,
+            "status": status,
+            "baseline_s": base_med,
+            "current_s": cur_med,
+            "allowed_s": allowed,
+            "change": cur_med / base_med - 1 if base_med > 0 else 0.0,
+            "baseline_mb": base.get("peak_mb"),
+            "current_mb": row.get("peak_mb"),
+        })
+    rows += [{"key": key, "status": "missing"} for key in base_by_key]
+    return rows
+
+
+def regressions(comparison: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [row for row in comparison if row["status"] in ("slower", "memory")]
+
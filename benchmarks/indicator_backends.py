@@ -0,0 +1,61 @@
+"""
+Micro-benchmark: pandas indicator_engine vs indicators.numpy_backend.
+
+    python benchmarks/indicator_backends.py [--bars 1000000] [--repeat 5]
+
+Prints the best-of-N time per indicator for both backends on synthetic
+candles (data.synthetic_data), plus the speedup.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from data.synthetic_data import synthetic_ohlcv  # noqa: E402
+from indicators import indicator_engine as ie  # noqa: E402
+from indicators import numpy_backend as nb  # noqa: E402
+
+
+def best_of(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--bars", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    df = synthetic_ohlcv(args.bars, timeframe="1min")
+    close, high, low = df["close"], df["high"], df["low"]
+    out = np.empty(args.bars)
+
+    cases = {
+        "sma200": (lambda: ie.sma(close, 200), lambda: nb.sma(close, 200, out=out)),
+        "ema21": (lambda: ie.ema(close, 21), lambda: nb.ema(close, 21, out=out)),
+        "rsi14": (lambda: ie.rsi(close, 14), lambda: nb.rsi(close, 14, out=out)),
+        "atr14": (lambda: ie.atr(df, 14), lambda: nb.atr(high, low, close, 14, out=out)),
+        "macd": (lambda: ie.macd(close), lambda: nb.macd(close)),
+        "range_high_50": (lambda: ie.rolling_high(high, 50), lambda: nb.rolling_high(high, 50, out=out)),
+    }
+
+    print(f"{args.bars:,} bars, best of {args.repeat}")
+    print(f"{'indicator':<15}{'pandas ms':>12}{'numpy ms':>12}{'speedup':>10}")
+    for name, (pandas_fn, numpy_fn) in cases.items():
+        pandas_s = best_of(pandas_fn, args.repeat)
+        numpy_s = best_of(numpy_fn, args.repeat)
+        print(f"{name:<15}{pandas_s * 1e3:>12.1f}{numpy_s * 1e3:>12.1f}{pandas_s / numpy_s:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Performance-regression gate: this tree against a git ref, measured back to back.
+
+    python benchmarks/regression_gate.py                       # working tree vs HEAD, exit 1 on regression
+    python benchmarks/regression_gate.py --ref origin/main     # e.g. a branch against its base
+    python benchmarks/regression_gate.py --baseline a.json --current b.json   # compare saved suite reports
+
+The gate covers the paths sweeps spend their time in: add_indicators,
+MeanReversionStrategy signal generation, the backtest loop and both
+sweeps. The ref's src/ is exported to a temp directory and both trees run
+the same gate cases in fresh processes, alternating over --rounds rounds
+(see harness.run_interleaved). Each side's samples are per-process
+medians, so the noise allowance in harness.compare_results covers the
+spread between processes, and drift in machine speed during the run hits
+both sides alike. A baseline measured earlier, or on another machine,
+is not comparable; saved reports are only compared when passed explicitly.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from harness import ROOT, SRC, compare_results, load_report, merge_processes, regressions, run_interleaved
+from suite import run_suite
+
+GATE_CASES = (
+    "add_indicators[pandas]",
+    "MeanReversionStrategy.generate_signal",
+    "BacktestEngine.run[MeanReversion]",
+    "live_config_sweep",
+    "consistency_sweep",
+)
+GATE_SETTINGS = {"sizes": [100_000], "repeat": 3, "loop_bars": 5_000, "signal_bars": 2_000}
+
+
+def _run_gate_cases(settings: dict, cases=GATE_CASES, output: Path = None, verbose: bool = True):
+    return run_suite(
+        settings["sizes"],
+        repeat=settings["repeat"],
+        loop_bars=settings["loop_bars"],
+        signal_bars=settings["signal_bars"],
+        output=output,
+        verbose=verbose,
+        only=cases,
+    )
+
+
+def measure_command(settings: dict = GATE_SETTINGS, cases=GATE_CASES) -> list:
+    """Command that measures the gate cases in a fresh process; run_interleaved appends the report path."""
+    spec = json.dumps({"settings": settings, "cases": list(cases)})
+    return [sys.executable, str(Path(__file__).resolve()), "--measure", spec]
+
+
+def export_src(ref: str, dest: Path) -> Path:
+    """Write src/ as of a git ref into dest and return the exported src path."""
+    archive = subprocess.run(
+        ["git", "archive", "--format=tar", ref, "src"], cwd=ROOT, capture_output=True, check=True,
+    ).stdout
+    subprocess.run(["tar", "-x", "-C", str(dest)], input=archive, check=True)
+    return Path(dest) / "src"
+
+
+def _print_comparison(rows) -> None:
+    print(f"\n{'case':<52}{'baseline s':>12}{'current s':>12}{'change':>9}{'MB base/now':>14}  status")
+    for row in rows:
+        if "baseline_s" not in row:
+            print(f"{row['key']:<52}{'':>47}  {row['status']}")
+            continue
+        mb = "-" if row["baseline_mb"] is None else f"{row['baseline_mb']:.1f}/{row['current_mb']:.1f}"
+        print(
+            f"{row['key']:<52}{row['baseline_s']:>12.4f}{row['current_s']:>12.4f}"
+            f"{row['change']:>+9.1%}{mb:>14}  {row['status']}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Fail when key backtest paths regress against a git ref.")
+    parser.add_argument("--ref", default="HEAD", help="git ref to measure against (default: HEAD)")
+    parser.add_argument("--rounds", type=int, default=5, help="alternating processes per side")
+    parser.add_argument("--baseline", type=Path, default=None, help="saved suite report to compare against")
+    parser.add_argument("--current", type=Path, default=None, help="saved suite report to check (with --baseline)")
+    parser.add_argument("--rel-tol", type=float, default=0.10, help="allowed slowdown of the median")
+    parser.add_argument("--noise", type=float, default=2.0, help="IQR multiples added to the allowance")
+    parser.add_argument("--mem-tol", type=float, default=0.10, help="allowed growth of peak memory")
+    parser.add_argument("--measure", nargs=2, metavar=("SPEC", "OUTPUT"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        spec, output = json.loads(args.measure[0]), Path(args.measure[1])
+        _run_gate_cases(spec["settings"], spec["cases"], output=output, verbose=False)
+        return 0
+
+    if args.baseline is not None:
+        baseline = load_report(args.baseline)["results"]
+        current = load_report(args.current)["results"] if args.current is not None else _run_gate_cases(GATE_SETTINGS)
+    else:
+        print(f"Measuring src/ at {args.ref} and the working tree, {args.rounds} alternating rounds...")
+        with tempfile.TemporaryDirectory() as tmp:
+            reports = run_interleaved(
+                measure_command(), {"baseline": export_src(args.ref, Path(tmp)), "current": SRC}, args.rounds,
+            )
+        baseline, current = merge_processes(reports["baseline"]), merge_processes(reports["current"])
+
+    rows = compare_results(baseline, current, rel_tol=args.rel_tol, noise_mult=args.noise, mem_tol=args.mem_tol)
+    _print_comparison(rows)
+
+    failed = regressions(rows)
+    if failed:
+        print(f"\nFAIL: {len(failed)} regression(s): " + ", ".join(row["key"] for row in failed))
+        return 1
+    print("\nOK: no regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
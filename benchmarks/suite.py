@@ -0,0 +1,204 @@
+"""
+Backtest benchmark suite on seeded synthetic OHLCV.
+
+    python benchmarks/suite.py [--sizes 10k,100k,1m,10m] [--repeat 3]
+                               [--loop-bars 20000] [--output report.json]
+
+For every size it times add_indicators (pandas and numpy backends) and
+SessionState.summary on the full data. Per-bar Python paths (each
+strategy's generate_signal, the backtest loop, the sweeps) run on the
+first --loop-bars bars (signals on --signal-bars sampled bars), so 10M-bar
+sizes finish; bars/sec keeps them comparable. Results (all run times,
+median, IQR, bars/sec, tracemalloc peak) go to JSON, by default
+benchmarks/results/<UTC time>.json.
+"""
+
+import argparse
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from harness import ROOT, Case, measure, print_table, write_report
+
+from backtesting import consistency_sweep, live_config_sweep  # noqa: E402
+from backtesting.engine import WARMUP_BARS, BacktestEngine  # noqa: E402
+from backtesting.monte_carlo import simulate  # noqa: E402
+from backtesting.run_window_backtests import year_windows  # noqa: E402
+from backtesting.session_state import SessionState, TradeRecord  # noqa: E402
+from data.synthetic_data import synthetic_ohlcv  # noqa: E402
+from indicators.indicator_engine import add_indicators  # noqa: E402
+from indicators.registry import clear_cache  # noqa: E402
+from strategy.btc_trend_pullback import BTCTrendPullbackStrategy  # noqa: E402
+from strategy.variants import (  # noqa: E402
+    MeanReversionStrategy,
+    MomentumCrossoverStrategy,
+    TrendBreakoutStrategy,
+)
+from utils.logger import setup_logging  # noqa: E402
+
+SYMBOL = "BTC/USDC"
+DEFAULT_SIZES = "10k,100k,1m,10m"
+STRATEGIES = (MeanReversionStrategy, TrendBreakoutStrategy, MomentumCrossoverStrategy, BTCTrendPullbackStrategy)
+
+
+def parse_size(label: str) -> int:
+    label = label.strip().lower()
+    scale = {"k": 1_000, "m": 1_000_000}.get(label[-1], 1)
+    return int(float(label.rstrip("km")) * scale)
+
+
+def fit_timeframe(bars: int, start: str = "2000-01-01") -> str:
+    """Longest of 1h / 5min / 1min whose span fits pandas timestamps."""
+    room = pd.Timestamp.max.value - pd.Timestamp(start).value
+    for timeframe in ("1h", "5min", "1min"):
+        if pd.Timedelta(timeframe).value * bars < room:
+            return timeframe
+    raise ValueError(f"{bars} bars do not fit pandas timestamps at 1min.")
+
+
+def _indicator_cases(raw: pd.DataFrame) -> List[Case]:
+    def setup():
+        clear_cache()   # otherwise every run after the first is a registry cache hit
+        return raw.copy()
+
+    return [
+        Case(f"add_indicators[{backend}]", len(raw), lambda df, b=backend: add_indicators(df, backend=b), setup)
+        for backend in ("pandas", "numpy")
+    ]
+
+
+def _summary_case(bars: int, seed: int) -> Case:
+    # one closed trade per ~20 bars, like an active intraday strategy
+    pnls = np.random.default_rng(seed).normal(0.0005, 0.01, max(bars // 20, 1))
+
+    def setup():
+        session = SessionState()
+        ts = pd.Timestamp("2000-01-01", tz="UTC")
+        for pnl in pnls:
+            session.record_trade(TradeRecord(SYMBOL, "LONG", 1.0, 1.0 + pnl, float(pnl), "bench", ts))
+        return session
+
+    return Case("SessionState.summary", bars, lambda session: session.summary(), setup)
+
+
+def _monte_carlo_case(bars: int, seed: int, paths: int = 10_000) -> Case:
+    # trades of a loop-sized backtest (one per ~20 bars), resampled like a sweep would
+    pnls = np.random.default_rng(seed).normal(0.0005, 0.01, max(bars // 20, 1))
+    return Case("monte_carlo[bootstrap 10k paths]", bars, lambda _: simulate(pnls, paths=paths, seed=seed))
+
+
+def _signal_cases(candles: pd.DataFrame, signal_bars: int) -> List[Case]:
+    positions = np.linspace(WARMUP_BARS, len(candles), num=min(signal_bars, len(candles) - WARMUP_BARS), dtype=int)
+
+    def run(strategy):
+        for i in positions:
+            strategy.generate_signal(candles.iloc[:i])
+
+    return [
+        Case(f"{cls.__name__}.generate_signal", len(positions), run, lambda cls=cls: cls(SYMBOL))
+        for cls in STRATEGIES
+    ]
+
+
+def _loop_cases(candles: pd.DataFrame) -> List[Case]:
+    bars = len(candles)
+    live_configs = [
+        live_config_sweep.SweepConfig(rsi_low=low, rsi_high=100 - low, atr_mult=1.0, min_stretch=0.004)
+        for low in (28.0, 32.0, 35.0)
+    ]
+    consistency_configs = [
+        consistency_sweep.SweepConfig(
+            rsi_low=low, rsi_high=100 - low, atr_mult=1.0, min_stretch=0.004,
+            min_stretch_atr_mult=None, allowed_regimes=None, allowed_utc_hours=None,
+        )
+        for low in (28.0, 32.0)
+    ]
+    first, last = candles["timestamp"].iloc[0], candles["timestamp"].iloc[-1]
+    windows = year_windows(first.year, last.year, str(last))
+
+    def backtest(_):
+        BacktestEngine(MeanReversionStrategy(SYMBOL), SYMBOL).run(candles)
+
+    return [
+        Case("BacktestEngine.run[MeanReversion]", bars, backtest),
+        Case("live_config_sweep", bars * len(live_configs),
+             lambda _: live_config_sweep.sweep_candles(candles, live_configs)),
+        Case("consistency_sweep", bars * len(consistency_configs),
+             lambda _: consistency_sweep.sweep_windows(candles, windows, consistency_configs)),
+    ]
+
+
+def build_cases(sizes: List[int], loop_bars: int, signal_bars: int, seed: int = 7) -> Iterator[Case]:
+    """Cases size by size (lazily, so only one size's data is alive at a time)."""
+    loop_sizes_done = set()
+    for bars in sizes:
+        raw = synthetic_ohlcv(bars, seed=seed, timeframe=fit_timeframe(bars))
+        yield from _indicator_cases(raw)
+        yield _summary_case(bars, seed)
+
+        loop_size = min(bars, loop_bars)
+        if loop_size in loop_sizes_done:
+            continue
+        loop_sizes_done.add(loop_size)
+        candles = add_indicators(raw.iloc[:loop_size].copy())
+        yield from _signal_cases(candles, signal_bars)
+        yield from _loop_cases(candles)
+        yield _monte_carlo_case(loop_size, seed)
+
+
+def run_suite(
+    sizes: List[int],
+    repeat: int = 3,
+    loop_bars: int = 20_000,
+    signal_bars: int = 2_000,
+    memory: bool = True,
+    output: Optional[Path] = None,
+    verbose: bool = True,
+    only: Optional[Iterable[str]] = None,
+) -> List[Dict]:
+    """Measure every case (or only those whose name is in `only`)."""
+    setup_logging("silent")
+    only = set(only) if only is not None else None
+    results = []
+    for case in build_cases(sizes, loop_bars, signal_bars):
+        if only is not None and case.name not in only:
+            continue
+        results.append(measure(case, repeat=repeat, memory=memory))
+        if verbose:
+            print_table(results[-1:], header=len(results) == 1)
+    if output is not None:
+        write_report(
+            results, output, sizes=list(sizes), repeat=repeat, loop_bars=loop_bars, signal_bars=signal_bars,
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest benchmark suite (synthetic OHLCV).")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="comma-separated bar counts, e.g. 10k,100k,1m")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--loop-bars", type=int, default=20_000, help="bars for the per-bar Python paths")
+    parser.add_argument("--signal-bars", type=int, default=2_000, help="sampled bars per generate_signal case")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args()
+
+    output = args.output or ROOT / "benchmarks" / "results" / (
+        datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ") + ".json"
+    )
+    run_suite(
+        [parse_size(size) for size in args.sizes.split(",")],
+        repeat=args.repeat,
+        loop_bars=args.loop_bars,
+        signal_bars=args.signal_bars,
+        memory=not args.no_memory,
+        output=output,
+    )
+    print(f"\nWrote {output}")
+
+
+if __name__ == "__main__":
+    main()
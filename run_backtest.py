@@ -1,6 +1,8 @@
 import sys
 sys.path.append("src")
 from backtesting.run_backtest import run_backtest
+from utils.logger import setup_logging
 
 if __name__ == "__main__":
-    run_backtest()
\ No newline at end of file
+    setup_logging()
+    run_backtest()
@@ -0,0 +1,251 @@
+"""
+Risk and performance analytics for a backtest session.
+
+SessionState.summary() covers return, win rate, averages, expectancy and
+max drawdown. This module works on the session's arrays instead: trade
+PnLs, exit/entry times and the equity curve are extracted once
+(TradeArrays), and every metric is a vectorized expression over them:
+
+    metrics()         total return, CAGR, Sharpe, Sortino, Calmar, profit
+                      factor, payoff ratio, max drawdown and its duration
+    drawdown_series() drawdown after every trade (used by the visualizer)
+    rolling_metrics() trailing-window mean PnL, win rate, Sharpe, drawdown
+    breakdown()       per entry hour / weekday / side / market regime
+
+Sharpe and Sortino use daily returns of the equity curve (days without a
+closed trade return 0), annualized with 365 periods since crypto trades
+every day. The sweeps merge metrics() into their rows, so they can be
+ranked by any of them (sweep_candles(..., rank_by="sortino")).
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from backtesting.session_state import SessionState
+
+PERIODS_PER_YEAR = 365
+DAY_NS = 86_400 * 10 ** 9
+BREAKDOWNS = ("hour", "weekday", "side", "regime")
+
+
+@dataclass
+class TradeArrays:
+    pnl: np.ndarray          # per trade, decimal
+    exit_ns: np.ndarray      # int64 UTC nanoseconds
+    entry_ns: np.ndarray     # int64; the exit time where the entry is unknown
+    sides: np.ndarray        # object
+    equity: np.ndarray       # initial equity, then after each trade (len(pnl) + 1)
+
+
+def _ns(values) -> np.ndarray:
+    if len(values) == 0:
+        return np.empty(0, dtype=np.int64)
+    return pd.DatetimeIndex(pd.to_datetime(list(values), utc=True)).asi8
+
+
+def trade_arrays(session: SessionState) -> TradeArrays:
+    trades = session.trades
+    pnl = np.fromiter((t.pnl_pct for t in trades), dtype=np.float64, count=len(trades))
+    exit_ns = _ns([t.timestamp for t in trades])
+    entry_ns = _ns([t.entry_timestamp if t.entry_timestamp is not None else t.timestamp for t in trades])
+    sides = np.array([t.side for t in trades], dtype=object)
+    equity = np.asarray(session.equity_curve, dtype=np.float64)
+    return TradeArrays(pnl, exit_ns, entry_ns, sides, equity)
+
+
+def _arrays(source) -> TradeArrays:
+    return source if isinstance(source, TradeArrays) else trade_arrays(source)
+
+
+# ---- Equity curve ----
+
+def drawdown_series(equity) -> np.ndarray:
+    """(equity - running peak) / running peak, per point of the equity curve."""
+    equity = np.asarray(equity, dtype=np.float64)
+    if equity.size == 0:
+        return equity
+    return equity / np.maximum.accumulate(equity) - 1.0
+
+
+def daily_returns(source, start=None, end=None) -> pd.Series:
+    """
+    Daily returns of the equity curve from start (default: first entry) to
+    end (default: last exit), indexed by UTC day.
+    """
+    arrays = _arrays(source)
+    if arrays.pnl.size == 0:
+        return pd.Series(dtype=np.float64)
+    first_day = (_ns([start])[0] if start is not None else arrays.entry_ns.min()) // DAY_NS
+    last_day = (_ns([end])[0] if end is not None else arrays.exit_ns.max()) // DAY_NS
+    days = arrays.exit_ns // DAY_NS - first_day
+    n_days = int(last_day - first_day) + 1
+
+    # equity at each day's close: the last trade of the day, carried forward
+    # (trades are chronological, so a day's last trade is where the day changes)
+    keep = (days >= 0) & (days < n_days)
+    trade_pos = np.flatnonzero(keep)
+    day_of_trade = days[keep]
+    last = np.concatenate((day_of_trade[1:] != day_of_trade[:-1], [True]))
+    close = np.zeros(n_days, dtype=np.int64)
+    close[day_of_trade[last]] = trade_pos[last] + 1
+    close = np.maximum.accumulate(close)
+    day_equity = arrays.equity[close]
+    previous = np.concatenate(([arrays.equity[0]], day_equity[:-1]))
+    index = pd.to_datetime((np.arange(n_days) + first_day) * DAY_NS, utc=True)
+    return pd.Series(day_equity / previous - 1.0, index=index)
+
+
+# ---- Metrics ----
+
+def _sharpe(returns: np.ndarray, periods: int) -> float:
+    if returns.size < 2:
+        return 0.0
+    std = returns.std(ddof=1)
+    return float(returns.mean() / std * np.sqrt(periods)) if std > 0 else 0.0
+
+
+def _sortino(returns: np.ndarray, periods: int) -> float:
+    if returns.size < 2:
+        return 0.0
+    downside = np.sqrt(np.mean(np.minimum(returns, 0.0) ** 2))
+    return float(returns.mean() / downside * np.sqrt(periods)) if downside > 0 else 0.0
+
+
+def metrics(source, start=None, end=None, periods_per_year: int = PERIODS_PER_YEAR) -> Dict[str, float]:
+    """Flat dict of risk/performance metrics for a session (or its TradeArrays)."""
+    arrays = _arrays(source)
+    pnl, equity = arrays.pnl, arrays.equity
+    total = pnl.size
+    result = {
+        "trades": total,
+        "total_return": float(equity[-1] / equity[0] - 1.0) if equity.size else 0.0,
+        "cagr": 0.0,
+        "sharpe": 0.0,
+        "sortino": 0.0,
+        "calmar": 0.0,
+        "max_drawdown": 0.0,
+        "max_drawdown_duration_days": 0.0,
+        "max_drawdown_duration_trades": 0,
+        "profit_factor": 0.0,
+        "payoff_ratio": 0.0,
+        "win_rate": 0.0,
+        "expectancy": 0.0,
+    }
+    if total == 0:
+        return result
+
+    wins, losses = pnl[pnl > 0], pnl[pnl < 0]
+    gross_profit, gross_loss = wins.sum(), -losses.sum()
+    result["win_rate"] = wins.size / total
+    result["expectancy"] = float(pnl.mean())
+    result["profit_factor"] = float(gross_profit / gross_loss) if gross_loss > 0 else (np.inf if gross_profit > 0 else 0.0)
+    if wins.size and losses.size:
+        result["payoff_ratio"] = float(wins.mean() / -losses.mean())
+
+    drawdown = drawdown_series(equity)
+    result["max_drawdown"] = float(drawdown.min())
+    # duration: time (and trades) since the last equity peak, at its longest
+    positions = np.arange(equity.size)
+    peak_pos = np.maximum.accumulate(np.where(drawdown >= 0, positions, 0))
+    start_ns = _ns([start])[0] if start is not None else arrays.entry_ns.min()
+    times = np.concatenate(([start_ns], arrays.exit_ns))
+    if drawdown.min() < 0:
+        result["max_drawdown_duration_days"] = float((times - times[peak_pos]).max() / DAY_NS)
+        result["max_drawdown_duration_trades"] = int((positions - peak_pos).max())
+
+    daily = daily_returns(arrays, start=start, end=end).to_numpy()
+    years = daily.size / periods_per_year
+    growth = equity[-1] / equity[0]
+    if years > 0 and growth > 0:
+        result["cagr"] = float(growth ** (1.0 / years) - 1.0)
+    result["sharpe"] = _sharpe(daily, periods_per_year)
+    result["sortino"] = _sortino(daily, periods_per_year)
+    if result["max_drawdown"] < 0:
+        result["calmar"] = result["cagr"] / -result["max_drawdown"]
+    return result
+
+
+def rolling_metrics(source, window: int = 50) -> pd.DataFrame:
+    """Trailing `window`-trade mean PnL, win rate, per-trade Sharpe and drawdown, indexed by exit time."""
+    arrays = _arrays(source)
+    pnl = arrays.pnl
+    columns = ["mean_pnl", "win_rate", "sharpe", "drawdown"]
+    if pnl.size < window:
+        return pd.DataFrame(columns=columns, dtype=np.float64)
+
+    def trailing_sum(values):
+        csum = np.concatenate(([0.0], np.cumsum(values)))
+        return csum[window:] - csum[:-window]
+
+    mean = trailing_sum(pnl) / window
+    var = np.maximum(trailing_sum(pnl * pnl) / window - mean * mean, 0.0) * window / max(window - 1, 1)
+    std = np.sqrt(var)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(std > 0, mean / std, 0.0)
+    # drawdown from the highest equity within the trailing window
+    equity = arrays.equity[1:]
+    peaks = pd.Series(equity).rolling(window).max().to_numpy()[window - 1:]
+    return pd.DataFrame(
+        {
+            "mean_pnl": mean,
+            "win_rate": trailing_sum((pnl > 0).astype(np.float64)) / window,
+            "sharpe": sharpe,
+            "drawdown": equity[window - 1:] / peaks - 1.0,
+        },
+        index=pd.to_datetime(arrays.exit_ns[window - 1:], utc=True),
+    )
+
+
+def _entry_regimes(arrays: TradeArrays, candles: pd.DataFrame) -> np.ndarray:
+    if "regime" not in candles.columns:
+        from strategy.regime import add_regime
+        candles = add_regime(candles.copy())
+    bar_ns = _ns(candles["timestamp"])
+    pos = np.searchsorted(bar_ns, arrays.entry_ns, side="right") - 1
+    labels = candles["regime"].to_numpy().astype(object)
+    return np.where(pos >= 0, labels[np.clip(pos, 0, None)], "UNKNOWN")
+
+
+def breakdown(source, by: str = "hour", candles: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    Per-group trades, win rate, mean PnL, compounded return and profit
+    factor. by: hour / weekday (of entry, UTC), side, or regime (market
+    regime at entry, looked up in candles with indicators).
+    """
+    arrays = _arrays(source)
+    if by == "hour":
+        keys = (arrays.entry_ns // (3600 * 10 ** 9)) % 24
+    elif by == "weekday":
+        keys = (arrays.entry_ns // DAY_NS + 3) % 7       # 1970-01-01 was a Thursday; Monday = 0
+    elif by == "side":
+        keys = arrays.sides
+    elif by == "regime":
+        if candles is None:
+            raise ValueError("breakdown(by='regime') needs the candles the session ran on")
+        keys = _entry_regimes(arrays, candles)
+    else:
+        raise ValueError(f"Unknown breakdown: {by} (expected one of {BREAKDOWNS})")
+
+    columns = ["trades", "win_rate", "mean_pnl", "total_return", "profit_factor"]
+    if arrays.pnl.size == 0:
+        return pd.DataFrame(columns=columns).rename_axis(by)
+    groups, inverse = np.unique(keys, return_inverse=True)
+    pnl = arrays.pnl
+    count = np.bincount(inverse, minlength=groups.size)
+    gross_profit = np.bincount(inverse, weights=np.maximum(pnl, 0.0), minlength=groups.size)
+    gross_loss = -np.bincount(inverse, weights=np.minimum(pnl, 0.0), minlength=groups.size)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        profit_factor = np.where(gross_loss > 0, gross_profit / gross_loss, np.where(gross_profit > 0, np.inf, 0.0))
+    return pd.DataFrame(
+        {
+            "trades": count,
+            "win_rate": np.bincount(inverse, weights=(pnl > 0).astype(np.float64), minlength=groups.size) / count,
+            "mean_pnl": np.bincount(inverse, weights=pnl, minlength=groups.size) / count,
+            "total_return": np.expm1(np.bincount(inverse, weights=np.log1p(pnl), minlength=groups.size)),
+            "profit_factor": profit_factor,
+        },
+        index=pd.Index(groups, name=by),
+    )
@@ -1,94 +1,89 @@
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Callable, List
+import os
+from time import perf_counter
+from typing import Iterable, List, Optional
 
-from loguru import logger
+import pandas as pd
 
-from backtesting.session_state import SessionState, TradeRecord
+from backtesting.engine import BacktestEngine, WARMUP_BARS
+from backtesting.session_state import SessionState
 from data.historical_data import load_historical_ohlcv
-from indicators.indicator_engine import add_indicators
-from execution.paper_broker import PaperBroker
+from indicators.indicator_engine import add_indicators, add_range, range_columns
 from filters.trade_limiter import TradeLimiter
+from filters.trading_calendar import TradingDayCalendar
 from strategy.btc_trend_pullback import BTCTrendPullbackStrategy
+from strategy.regime import add_regime
 from strategy.variants import (
     TrendBreakoutStrategy,
     MeanReversionStrategy,
     MomentumCrossoverStrategy,
 )
+from utils.logger import setup_logging
 
 
 @dataclass
 class StrategyResult:
     name: str
     session: SessionState
+    seconds: float = 0.0
+    bars: int = 0                 # bars stepped through (after warmup)
+
+    @property
+    def bars_per_sec(self) -> float:
+        return self.bars / self.seconds if self.seconds > 0 else 0.0
+
+
+def build_shared_features(candles: pd.DataFrame, range_lookbacks: Iterable[int] = (50,)) -> pd.DataFrame:
+    """
+    Everything the strategies would otherwise recompute per bar, as columns:
+    indicators, the detect_regime() label and rolling range highs/lows
+    (range_high_<n> / range_low_<n>, current bar included like tail(n)).
+    """
+    df = add_indicators(candles.reset_index(drop=True))
+    df = add_regime(df)
+    for n in range_lookbacks:
+        high_col, _ = range_columns(n)
+        if high_col not in df.columns:
+            add_range(df, n)
+    return df
 
 
 def _run_strategy_loop(strategy, candles, symbol: str) -> SessionState:
-    broker = PaperBroker(fee_rate=0.0005)
-    limiter = TradeLimiter(log_resets=False, log_blocks=False)
-    session = SessionState()
-    active_signal = None
-
-    for i in range(300, len(candles)):
-        window = candles.iloc[:i]
-        last = window.iloc[-1]
-        signal = strategy.generate_signal(window)
-
-        if not broker.has_open_position() and limiter.can_trade(now_utc=last["timestamp"]) and signal.is_actionable():
-            if broker.open_position(
-                symbol=symbol,
-                side=signal.side,
-                entry=signal.entry_price,
-                stop_loss=signal.stop_loss,
-                take_profit=signal.take_profit
-            ):
-                limiter.record_trade_opened()
-                active_signal = signal
-
-        pnl_pct = broker.check_and_close(
-            high=last["high"],
-            low=last["low"],
-            close=last["close"],
-            trade_limiter=limiter
-        )
+    limiter = TradeLimiter(
+        log_resets=False, log_blocks=False,
+        calendar=TradingDayCalendar.for_timestamps(candles["timestamp"]),
+    )
+    return BacktestEngine(strategy, symbol, limiter=limiter).run(candles)
 
-        if pnl_pct is not None:
-            if active_signal:
-                exit_price = (
-                    active_signal.take_profit if pnl_pct > 0 else active_signal.stop_loss
-                )
-                session.record_trade(
-                    TradeRecord(
-                        symbol=symbol,
-                        side=active_signal.side,
-                        entry_price=active_signal.entry_price,
-                        exit_price=exit_price,
-                        pnl_pct=pnl_pct,
-                        reason=active_signal.reason,
-                        timestamp=last["timestamp"]
-                    )
-                )
-            active_signal = None
-
-    return session
 
+# Set once per worker process by the pool initializer, so the feature frame
+# is sent to each worker once rather than with every strategy.
+_worker_features: Optional[pd.DataFrame] = None
 
-def run_batch_backtest(
-    symbol: str = "BTC/USDC",
-    timeframe: str = "1h",
-    start: str = "2023-01-01",
-    end: str = "2025-01-01",
-) -> List[StrategyResult]:
-    logger.remove()
-    logger.add(lambda msg: print(msg, end=""), level="INFO")
 
-    candles = load_historical_ohlcv(symbol, timeframe, start, end)
-    if candles.empty:
-        print("No data retrieved — batch backtest aborted.")
-        return []
+def _init_worker(features: pd.DataFrame, configure_logging: bool = True) -> None:
+    global _worker_features
+    _worker_features = features
+    if configure_logging:
+        setup_logging("quiet")
+
+
+def _run_named(job: tuple) -> StrategyResult:
+    name, strategy, symbol = job
+    candles = _worker_features
+    started = perf_counter()
+    session = _run_strategy_loop(strategy, candles, symbol)
+    return StrategyResult(
+        name=name,
+        session=session,
+        seconds=perf_counter() - started,
+        bars=max(len(candles) - WARMUP_BARS, 0),
+    )
 
-    candles = add_indicators(candles)
 
-    strategies = [
+def default_strategies(symbol: str) -> list:
+    return [
         ("TrendPullback", BTCTrendPullbackStrategy(symbol)),
         ("TrendBreakout", TrendBreakoutStrategy(symbol)),
         ("MomentumCrossover", MomentumCrossoverStrategy(symbol)),
@@ -97,11 +92,42 @@ def run_batch_backtest(
         ("MeanRev_wide", MeanReversionStrategy(symbol, atr_mult=1.2, rsi_low=25, rsi_high=75, min_stretch=0.007)),
     ]
 
-    results: List[StrategyResult] = []
-    for name, strat in strategies:
-        session = _run_strategy_loop(strat, candles, symbol)
-        results.append(StrategyResult(name=name, session=session))
 
+def run_strategies(
+    candles: pd.DataFrame,
+    strategies: list,
+    symbol: str,
+    max_workers: Optional[int] = None,
+) -> List[StrategyResult]:
+    """Run (name, strategy) pairs over shared features, one strategy per worker task."""
+    features = build_shared_features(
+        candles,
+        range_lookbacks={s.lookback for _, s in strategies if isinstance(s, TrendBreakoutStrategy)} or (50,),
+    )
+    jobs = [(name, strategy, symbol) for name, strategy in strategies]
+    workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        _init_worker(features, configure_logging=False)
+        return [_run_named(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(features,)) as pool:
+        return list(pool.map(_run_named, jobs))
+
+
+def run_batch_backtest(
+    symbol: str = "BTC/USDC",
+    timeframe: str = "1h",
+    start: str = "2023-01-01",
+    end: str = "2025-01-01",
+    max_workers: Optional[int] = None,
+) -> List[StrategyResult]:
+    setup_logging("quiet", level="INFO")
+
+    candles = load_historical_ohlcv(symbol, timeframe, start, end)
+    if candles.empty:
+        print("No data retrieved — batch backtest aborted.")
+        return []
+
+    results = run_strategies(candles, default_strategies(symbol), symbol, max_workers=max_workers)
     results.sort(key=lambda r: r.session.summary()["return_pct"], reverse=True)
     return results
 
@@ -114,5 +140,6 @@ if __name__ == "__main__":
         print(
             f"{r.name:>16} | Return {s['return_pct']:.2%} | "
             f"Trades {s['total_trades']} | Win {s['win_rate']:.2%} | "
-            f"MaxDD {s['max_drawdown_pct']:.2%}"
+            f"MaxDD {s['max_drawdown_pct']:.2%} | "
+            f"{r.bars_per_sec:,.0f} bars/s ({r.seconds:.1f}s)"
         )
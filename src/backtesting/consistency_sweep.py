@@ -2,19 +2,23 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from statistics import median
+from time import perf_counter
 from typing import Iterable, Optional
 
 import pandas as pd
 
-from backtesting.session_state import SessionState, TradeRecord
+from backtesting.analytics import metrics
+from backtesting.engine import default_limiter, run_strategy_loop
+from backtesting.profiling import StageProfiler
+from backtesting.progress import SweepProgress, default_progress_path
+from backtesting.run_window_backtests import year_windows
+from backtesting.session_state import SessionState
 from data.historical_data import load_historical_ohlcv
-from execution.paper_broker import PaperBroker
-from filters.trade_limiter import TradeLimiter
 from indicators.indicator_engine import add_indicators
 from strategy.regime import MarketRegime
 from strategy.variants import MeanReversionStrategy
 from utils.config import Config
-from utils.logger import log
+from utils.logger import setup_logging
 
 
 @dataclass(frozen=True)
@@ -32,6 +36,7 @@ def _run_window(
     candles: pd.DataFrame,
     config: SweepConfig,
     trade_start: pd.Timestamp,
+    profiler: Optional[StageProfiler] = None,
 ) -> SessionState:
     strategy = MeanReversionStrategy(
         symbol=Config.LIVE_SYMBOL,
@@ -43,71 +48,10 @@ def _run_window(
         allowed_regimes=config.allowed_regimes,
         allowed_utc_hours=config.allowed_utc_hours,
     )
-    broker = PaperBroker(fee_rate=0.0005)
-    limiter = TradeLimiter(
-        max_trades_per_day=Config.MAX_TRADES_PER_DAY,
-        max_daily_loss_pct=Config.MAX_DAILY_LOSS_PCT,
-        max_daily_profit_pct=Config.MAX_DAILY_PROFIT_PCT,
-        log_resets=False,
-        log_blocks=False,
+    return run_strategy_loop(
+        strategy, candles, Config.LIVE_SYMBOL, limiter=default_limiter(candles), trade_start=trade_start,
+        profiler=profiler,
     )
-    session = SessionState()
-    active_signal = None
-
-    for i in range(300, len(candles)):
-        window = candles.iloc[:i]
-        last = window.iloc[-1]
-        last_ts = last["timestamp"]
-        if last_ts < trade_start:
-            continue
-
-        signal = strategy.generate_signal(window)
-
-        if not broker.has_open_position() and limiter.can_trade(now_utc=last_ts) and signal.is_actionable():
-            if broker.open_position(
-                symbol=Config.LIVE_SYMBOL,
-                side=signal.side,
-                entry=signal.entry_price,
-                stop_loss=signal.stop_loss,
-                take_profit=signal.take_profit,
-            ):
-                limiter.record_trade_opened()
-                active_signal = signal
-
-        pnl_pct = broker.check_and_close(
-            high=last["high"],
-            low=last["low"],
-            close=last["close"],
-            trade_limiter=limiter,
-        )
-
-        if pnl_pct is not None and active_signal:
-            exit_price = active_signal.take_profit if pnl_pct > 0 else active_signal.stop_loss
-            session.record_trade(
-                TradeRecord(
-                    symbol=Config.LIVE_SYMBOL,
-                    side=active_signal.side,
-                    entry_price=active_signal.entry_price,
-                    exit_price=exit_price,
-                    pnl_pct=pnl_pct,
-                    reason=active_signal.reason,
-                    timestamp=last_ts,
-                )
-            )
-            active_signal = None
-
-    return session
-
-
-def _year_windows(start_year: int, end_year: int, end: str) -> list[tuple[int, pd.Timestamp, pd.Timestamp]]:
-    windows = []
-    for year in range(start_year, end_year + 1):
-        year_start = pd.Timestamp(f"{year}-01-01", tz="UTC")
-        year_end = pd.Timestamp(f"{year}-12-31", tz="UTC")
-        if year == end_year:
-            year_end = pd.Timestamp(end, tz="UTC")
-        windows.append((year, year_start, year_end))
-    return windows
 
 
 def _build_configs() -> Iterable[SweepConfig]:
@@ -139,29 +83,64 @@ def _build_configs() -> Iterable[SweepConfig]:
 
 
 def run_consistency_sweep(start: str, end: str) -> pd.DataFrame:
-    log.remove()
-    log.add(lambda msg: print(msg, end=""), level="WARNING")
+    setup_logging("quiet")
 
     candles = load_historical_ohlcv("BTC/USD", "1h", start, end)
     if candles.empty:
         raise RuntimeError("Local BTC/USD data not found for sweep.")
 
     candles = add_indicators(candles)
-    results = []
-
     start_year = pd.Timestamp(start, tz="UTC").year
     end_year = pd.Timestamp(end, tz="UTC").year
-    windows = _year_windows(start_year, end_year, end)
+    windows = year_windows(start_year, end_year, end)
+    configs = list(_build_configs())
+    with SweepProgress(
+        len(configs), len(windows), path=default_progress_path("consistency_sweep"), label="consistency_sweep",
+    ) as progress:
+        return sweep_windows(candles, windows, configs, progress=progress)
+
 
-    for config in _build_configs():
+def sweep_windows(
+    candles: pd.DataFrame,
+    windows,
+    configs: Optional[Iterable[SweepConfig]] = None,
+    profiler: Optional[StageProfiler] = None,
+    progress: Optional[SweepProgress] = None,
+    rank_by: str = "median_yearly_return",
+) -> pd.DataFrame:
+    """
+    Run every config (default: the sweep grid) on each (year, start, end)
+    window of candles with indicators and rank by rank_by (default: median
+    yearly return). Per-window analytics.metrics are aggregated into
+    median_sharpe / median_sortino / median_calmar / median_profit_factor
+    and worst_max_drawdown. A shared profiler aggregates stage timings
+    over all runs; a progress reporter gets one record per (config, window).
+    """
+    results = []
+    configs = _build_configs() if configs is None else configs
+
+    for config in configs:
         yearly_returns = []
+        yearly_metrics = []
         for year, year_start, year_end in windows:
             warmup_start = year_start - pd.Timedelta(hours=300)
             year_slice = candles[(candles["timestamp"] >= warmup_start) & (candles["timestamp"] <= year_end)]
             if year_slice.empty:
+                if progress is not None:
+                    progress.skip(config, window=year)
                 continue
-            session = _run_window(year_slice, config, year_start)
+            started = perf_counter()
+            session = _run_window(year_slice, config, year_start, profiler=profiler)
             yearly_returns.append(session.summary()["return_pct"])
+            yearly_metrics.append(metrics(session, start=year_start, end=year_end))
+            if progress is not None:
+                progress.record(
+                    config, window=year, bars=len(year_slice), seconds=perf_counter() - started,
+                    trades=len(session.trades),
+                )
+
+        if progress is not None:
+            progress.config_done()
 
         if not yearly_returns:
             continue
@@ -171,6 +150,11 @@ def run_consistency_sweep(start: str, end: str) -> pd.DataFrame:
             "worst_year_return": min(yearly_returns),
             "best_year_return": max(yearly_returns),
             "avg_yearly_return": sum(yearly_returns) / len(yearly_returns),
+            "median_sharpe": median(m["sharpe"] for m in yearly_metrics),
+            "median_sortino": median(m["sortino"] for m in yearly_metrics),
+            "median_calmar": median(m["calmar"] for m in yearly_metrics),
+            "median_profit_factor": median(m["profit_factor"] for m in yearly_metrics),
+            "worst_max_drawdown": min(m["max_drawdown"] for m in yearly_metrics),
             "rsi_low": config.rsi_low,
             "rsi_high": config.rsi_high,
             "atr_mult": config.atr_mult,
@@ -180,7 +164,7 @@ def run_consistency_sweep(start: str, end: str) -> pd.DataFrame:
             "allowed_utc_hours": "all" if config.allowed_utc_hours is None else "US",
         })
 
-    df = pd.DataFrame(results).sort_values("median_yearly_return", ascending=False).reset_index(drop=True)
+    df = pd.DataFrame(results).sort_values(rank_by, ascending=False).reset_index(drop=True)
     return df
 
 
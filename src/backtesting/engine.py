@@ -0,0 +1,205 @@
+"""
+Shared bar-by-bar backtest loop.
+
+At bar i the strategy sees candles[:i] and decides on the last of them;
+entries fill at that bar's close and exits are checked on the same bar.
+Every backtest script runs this loop so they stay in lockstep.
+
+Strategies are stateless, so signals are only generated while flat (an
+open position ignores them). Fast-forward: when the broker is flat and the
+TradeLimiter is blocked for the day, nothing can happen until the next
+reset, so the cursor jumps straight to the first bar at or after it
+instead of generating signals that would be thrown away. While a position
+is open the cursor jumps to the bar that touches its stop or target
+(PaperBroker.find_exit, a compiled scan when numba is available).
+"""
+
+from __future__ import annotations
+
+from time import perf_counter
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from backtesting import profiling
+from backtesting.profiling import StageProfiler
+from backtesting.session_state import SessionState, TradeRecord
+from execution.paper_broker import PaperBroker
+from filters.trade_limiter import TradeLimiter
+from filters.trading_calendar import TradingDayCalendar, _to_ns, _to_ns_array
+from indicators.registry import ensure_indicators
+from utils.config import Config
+
+WARMUP_BARS = 300
+FEE_RATE = 0.0005                  # PaperBroker fee per side when no broker is given
+
+
+def default_limiter(candles: pd.DataFrame, log_blocks: bool = False) -> TradeLimiter:
+    """TradeLimiter with the configured daily caps and a calendar for candles."""
+    return TradeLimiter(
+        max_trades_per_day=Config.MAX_TRADES_PER_DAY,
+        max_daily_loss_pct=Config.MAX_DAILY_LOSS_PCT,
+        max_daily_profit_pct=Config.MAX_DAILY_PROFIT_PCT,
+        log_resets=False,
+        log_blocks=log_blocks,
+        calendar=TradingDayCalendar.for_timestamps(candles["timestamp"]),
+    )
+
+
+class BacktestEngine:
+    """
+    Runs one strategy over one candle frame with a PaperBroker and a
+    TradeLimiter. bars_evaluated / bars_skipped count generate_signal calls
+    and bars jumped over by fast-forward. With a StageProfiler every loop
+    stage is timed (see backtesting.profiling).
+    """
+
+    def __init__(
+        self,
+        strategy,
+        symbol: str,
+        broker: Optional[PaperBroker] = None,
+        limiter: Optional[TradeLimiter] = None,
+        warmup: int = WARMUP_BARS,
+        fast_forward: bool = True,
+        profiler: Optional[StageProfiler] = None,
+    ):
+        self.strategy = strategy
+        self.symbol = symbol
+        self.broker = broker
+        self.limiter = limiter
+        self.warmup = warmup
+        self.fast_forward = fast_forward
+        self.profiler = profiler
+        self.bars_evaluated = 0
+        self.bars_skipped = 0
+
+    def run(
+        self,
+        candles: pd.DataFrame,
+        trade_start: Optional[pd.Timestamp] = None,
+        session: Optional[SessionState] = None,
+    ) -> SessionState:
+        """
+        Run the loop over candles and return the session. Indicators the
+        strategy declares (required_indicators) are added once up front if
+        missing. Bars before trade_start only serve as indicator warmup.
+        """
+        prof = self.profiler
+        run_start = perf_counter()
+        if hasattr(self.strategy, "required_indicators"):
+            start = perf_counter()
+            candles = ensure_indicators(candles, self.strategy.required_indicators())
+            if prof is not None:
+                prof.add(profiling.INDICATORS, perf_counter() - start)
+        broker = self.broker or PaperBroker(fee_rate=FEE_RATE)
+        limiter = self.limiter or default_limiter(candles)
+        session = session or SessionState()
+        strategy = self.strategy
+        symbol = self.symbol
+        recorder = session
+        history = None                 # candles.iloc[:i], inline unless profiled
+
+        if prof is not None:
+            # timing proxies: the loop below stays the same with or without a profiler
+            broker = prof.wrap(broker, {
+                "find_exit": profiling.EXIT_SCAN,
+                "open_position": profiling.OPEN,
+                "check_and_close": profiling.CLOSE,
+            })
+            limiter = prof.wrap(limiter, {"blocked_until": profiling.LIMITER})
+            strategy = prof.wrap_strategy(strategy)
+            recorder = prof.wrap(session, {"record_trade": profiling.RECORD})
+            history = prof.timed(lambda i: candles.iloc[:i], profiling.HISTORY)
+
+        timestamps = candles["timestamp"]
+        ts_ns = _to_ns_array(timestamps)
+        high = candles["high"].to_numpy()
+        low = candles["low"].to_numpy()
+        close = candles["close"].to_numpy()
+
+        i = self.warmup
+        if trade_start is not None:
+            # bar i decides on candle i - 1
+            i = max(i, int(np.searchsorted(ts_ns, _to_ns(trade_start), side="left")) + 1)
+        active_signal = None
+        entry_ts = None
+        n = len(candles)
+
+        while i < n:
+            last = i - 1
+            ts = timestamps.iloc[last]
+
+            if broker.has_open_position():
+                if self.fast_forward and hasattr(broker, "find_exit"):
+                    # in a position: the bars until its SL/TP is touched change nothing
+                    exit_bar = broker.find_exit(high, low, last)
+                    if exit_bar != last:
+                        nxt = n if exit_bar < 0 else exit_bar + 1
+                        self.bars_skipped += nxt - i
+                        i = nxt
+                        continue
+            else:
+                blocked_until = limiter.blocked_until(now_utc=ts)
+                if blocked_until is not None and self.fast_forward:
+                    # flat and blocked: nothing can happen before the reset
+                    nxt = int(np.searchsorted(ts_ns, _to_ns(blocked_until), side="left")) + 1
+                    self.bars_skipped += min(nxt, n) - i
+                    i = nxt
+                    continue
+                signal = strategy.generate_signal(candles.iloc[:i] if history is None else history(i))
+                self.bars_evaluated += 1
+                if blocked_until is None and signal.is_actionable():
+                    if broker.open_position(
+                        symbol=symbol,
+                        side=signal.side,
+                        entry=signal.entry_price,
+                        stop_loss=signal.stop_loss,
+                        take_profit=signal.take_profit,
+                    ):
+                        limiter.record_trade_opened()
+                        active_signal = signal
+                        entry_ts = ts
+
+            pnl_pct = broker.check_and_close(
+                high=high[last],
+                low=low[last],
+                close=close[last],
+                trade_limiter=limiter,
+            )
+
+            if pnl_pct is not None and active_signal:
+                exit_price = active_signal.take_profit if pnl_pct > 0 else active_signal.stop_loss
+                recorder.record_trade(
+                    TradeRecord(
+                        symbol=symbol,
+                        side=active_signal.side,
+                        entry_price=active_signal.entry_price,
+                        exit_price=exit_price,
+                        pnl_pct=pnl_pct,
+                        reason=active_signal.reason,
+                        timestamp=ts,
+                        entry_timestamp=entry_ts,
+                    )
+                )
+                active_signal = None
+            i += 1
+
+        if prof is not None:
+            prof.add_run(perf_counter() - run_start)
+        return session
+
+
+def run_strategy_loop(
+    strategy,
+    candles: pd.DataFrame,
+    symbol: str,
+    limiter: Optional[TradeLimiter] = None,
+    trade_start: Optional[pd.Timestamp] = None,
+    fast_forward: bool = True,
+    profiler: Optional[StageProfiler] = None,
+) -> SessionState:
+    """Convenience wrapper: one BacktestEngine run with a fresh broker."""
+    engine = BacktestEngine(strategy, symbol, limiter=limiter, fast_forward=fast_forward, profiler=profiler)
+    return engine.run(candles, trade_start=trade_start)
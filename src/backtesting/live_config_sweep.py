@@ -2,18 +2,20 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable
+from time import perf_counter
+from typing import Iterable, Optional
 
-import ccxt
 import pandas as pd
 
-from backtesting.session_state import SessionState, TradeRecord
-from execution.paper_broker import PaperBroker
-from filters.trade_limiter import TradeLimiter
+from backtesting.engine import default_limiter, run_strategy_loop
+from backtesting.analytics import metrics
+from backtesting.monte_carlo import monte_carlo_summary
+from backtesting.profiling import StageProfiler
+from backtesting.progress import SweepProgress, default_progress_path
 from indicators.indicator_engine import add_indicators
 from strategy.variants import MeanReversionStrategy
 from utils.config import Config
-from utils.logger import log
+from utils.logger import log, setup_logging
 
 
 CACHE_PATH = Path("data/binance_BTCUSDC_1h.csv")
@@ -28,6 +30,8 @@ class SweepConfig:
 
 
 def _fetch_futures_ohlcv(symbol: str, timeframe: str, start: str, end: str) -> pd.DataFrame:
+    import ccxt
+
     exchange = ccxt.binanceusdm({
         "enableRateLimit": True,
         "options": {"defaultType": "future"},
@@ -81,7 +85,12 @@ def _ensure_cache(symbol: str, timeframe: str, start: str, end: str) -> pd.DataF
     return df.reset_index(drop=True)
 
 
-def _run_backtest(candles: pd.DataFrame, config: SweepConfig) -> dict:
+def _run_backtest(
+    candles: pd.DataFrame,
+    config: SweepConfig,
+    profiler: Optional[StageProfiler] = None,
+    monte_carlo_paths: int = 0,
+) -> dict:
     strategy = MeanReversionStrategy(
         symbol=Config.LIVE_SYMBOL,
         atr_mult=config.atr_mult,
@@ -89,56 +98,15 @@ def _run_backtest(candles: pd.DataFrame, config: SweepConfig) -> dict:
         rsi_high=config.rsi_high,
         min_stretch=config.min_stretch,
     )
-    broker = PaperBroker(fee_rate=0.0005)
-    limiter = TradeLimiter(
-        max_trades_per_day=Config.MAX_TRADES_PER_DAY,
-        max_daily_loss_pct=Config.MAX_DAILY_LOSS_PCT,
-        max_daily_profit_pct=Config.MAX_DAILY_PROFIT_PCT,
-        log_resets=False,
-        log_blocks=False,
+    session = run_strategy_loop(
+        strategy, candles, Config.LIVE_SYMBOL, limiter=default_limiter(candles), profiler=profiler,
     )
-    session = SessionState()
-    active_signal = None
-
-    for i in range(300, len(candles)):
-        window = candles.iloc[:i]
-        last = window.iloc[-1]
-        signal = strategy.generate_signal(window)
-
-        if not broker.has_open_position() and limiter.can_trade(now_utc=last["timestamp"]) and signal.is_actionable():
-            if broker.open_position(
-                symbol=Config.LIVE_SYMBOL,
-                side=signal.side,
-                entry=signal.entry_price,
-                stop_loss=signal.stop_loss,
-                take_profit=signal.take_profit,
-            ):
-                limiter.record_trade_opened()
-                active_signal = signal
-
-        pnl_pct = broker.check_and_close(
-            high=last["high"],
-            low=last["low"],
-            close=last["close"],
-            trade_limiter=limiter,
-        )
-
-        if pnl_pct is not None and active_signal:
-            exit_price = active_signal.take_profit if pnl_pct > 0 else active_signal.stop_loss
-            session.record_trade(
-                TradeRecord(
-                    symbol=Config.LIVE_SYMBOL,
-                    side=active_signal.side,
-                    entry_price=active_signal.entry_price,
-                    exit_price=exit_price,
-                    pnl_pct=pnl_pct,
-                    reason=active_signal.reason,
-                    timestamp=last["timestamp"],
-                )
-            )
-            active_signal = None
 
     summary = session.summary()
+    for key, value in metrics(session).items():
+        summary.setdefault(key, value)
+    if monte_carlo_paths:
+        summary.update(monte_carlo_summary(session, paths=monte_carlo_paths))
     summary["rsi_low"] = config.rsi_low
     summary["rsi_high"] = config.rsi_high
     summary["atr_mult"] = config.atr_mult
@@ -163,20 +131,45 @@ def _build_sweep_configs() -> Iterable[SweepConfig]:
 
 
 def run_sweep(start: str, end: str) -> pd.DataFrame:
-    log.remove()
-    log.add(lambda msg: print(msg, end=""), level="WARNING")
+    setup_logging("quiet")
 
     candles = _ensure_cache(Config.LIVE_SYMBOL, Config.LIVE_TIMEFRAME, start, end)
     if candles.empty:
         raise RuntimeError("No candle data available for sweep.")
 
-    candles = add_indicators(candles)
+    configs = list(_build_sweep_configs())
+    with SweepProgress(len(configs), path=default_progress_path("live_config_sweep"), label="live_config_sweep") as progress:
+        return sweep_candles(add_indicators(candles), configs, progress=progress, monte_carlo_paths=10_000)
+
+
+def sweep_candles(
+    candles: pd.DataFrame,
+    configs: Optional[Iterable[SweepConfig]] = None,
+    profiler: Optional[StageProfiler] = None,
+    progress: Optional[SweepProgress] = None,
+    monte_carlo_paths: int = 0,
+    rank_by: str = "return_pct",
+) -> pd.DataFrame:
+    """
+    Backtest every config (default: the sweep grid) on candles with
+    indicators. A shared profiler aggregates stage timings over all runs;
+    a progress reporter gets one record per config. Each row carries the
+    session summary plus analytics.metrics (sharpe, sortino, calmar,
+    profit_factor, ...), and rows are ranked by rank_by, best first. With
+    monte_carlo_paths, each row also gets bootstrap return/drawdown
+    percentiles (mc_* columns, see backtesting.monte_carlo).
+    """
+    configs = _build_sweep_configs() if configs is None else configs
     results = []
-    for config in _build_sweep_configs():
-        summary = _run_backtest(candles, config)
-        results.append(summary)
-
-    df = pd.DataFrame(results).sort_values("return_pct", ascending=False).reset_index(drop=True)
+    for config in configs:
+        started = perf_counter()
+        results.append(_run_backtest(candles, config, profiler=profiler, monte_carlo_paths=monte_carlo_paths))
+        if progress is not None:
+            progress.record(
+                config, bars=len(candles), seconds=perf_counter() - started, trades=results[-1]["total_trades"],
+            )
+            progress.config_done()
+    df = pd.DataFrame(results).sort_values(rank_by, ascending=False).reset_index(drop=True)
     return df
 
 
@@ -190,6 +183,7 @@ if __name__ == "__main__":
             [
                 "return_pct",
                 "max_drawdown_pct",
+                "mc_drawdown_p5",
                 "total_trades",
                 "win_rate",
                 "rsi_low",
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import Iterable, Optional
+
+import pandas as pd
+
+from indicators.indicator_engine import add_indicators
+from live.multi_runner import MultiSymbolRunner
+from live.scheduler import CandleCloseScheduler
+from live.trader import build_live_trader
+from utils.config import Config
+from utils.logger import setup_logging
+from utils.profiling import StageTimer
+
+
+CACHE_PATH = Path("data/binance_BTCUSDC_1h.csv")
+
+
+@dataclass
+class ReplayReport:
+    symbols: int
+    candles: int              # closed candles processed, summed over symbols
+    wall_seconds: float
+    stages: StageTimer
+    exchange_stats: dict
+    signals: pd.DataFrame
+    divergences: pd.DataFrame
+
+    @property
+    def candles_per_sec(self) -> float:
+        return self.candles / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+
+def _backtest_signals(candles: pd.DataFrame, strategy, timestamps: pd.Series) -> pd.DataFrame:
+    """Signals the backtest path produces (full-history indicators) at the given bars."""
+    df = candles.copy()
+    df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True).dt.tz_localize(None)
+    df = add_indicators(df.reset_index(drop=True))
+    positions = df["timestamp"].searchsorted(timestamps)
+    rows = []
+    for ts, pos in zip(timestamps, positions):
+        if pos >= len(df) or df["timestamp"].iloc[pos] != ts:
+            continue
+        signal = strategy.generate_signal(df.iloc[:pos + 1])
+        rows.append({"timestamp": ts, "backtest_side": signal.side, "backtest_reason": signal.reason})
+    return pd.DataFrame(rows, columns=["timestamp", "backtest_side", "backtest_reason"])
+
+
+def replay_live(
+    candles: pd.DataFrame,
+    symbols: Iterable[str] = (Config.LIVE_SYMBOL,),
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    sync_seconds: float = Config.LIVE_POLL_SECONDS,
+    compare_backtest: bool = True,
+) -> ReplayReport:
+    """
+    Replay stored candles through the real live stack (scheduler ->
+    LiveTrader -> MeanReversionStrategy -> TradeLimiter -> LiveBroker) against
+    a SimulatedExchange on a virtual clock, as fast as the CPU allows.
+
+    Every symbol replays the same candles. With compare_backtest=True the
+    live decisions are compared bar-by-bar with what the backtest path
+    decides on the same candles.
+    """
+    from execution.sim_exchange import SimulatedExchange
+
+    setup_logging("quiet")
+
+    symbols = list(symbols)
+    if end is not None:
+        candles = candles[pd.to_datetime(candles["timestamp"], utc=True) <= pd.Timestamp(end, tz="UTC")]
+
+    exchange = SimulatedExchange(
+        {symbol: candles for symbol in symbols},
+        timeframe=Config.LIVE_TIMEFRAME,
+        start=start,
+        warmup_candles=Config.LIVE_CANDLE_LOOKBACK,
+    )
+    traders = [
+        build_live_trader(symbol, exchange, record_signals=compare_backtest, clock=exchange.time)
+        for symbol in symbols
+    ]
+    runner = MultiSymbolRunner(traders, max_workers=1)
+    scheduler = CandleCloseScheduler(
+        Config.LIVE_TIMEFRAME,
+        on_close=runner.on_candle_close,
+        on_sync=runner.sync,
+        close_delay=Config.LIVE_CLOSE_DELAY_SECONDS,
+        retry_seconds=Config.LIVE_CLOSE_RETRY_SECONDS,
+        max_wait_seconds=Config.LIVE_CLOSE_MAX_WAIT_SECONDS,
+        sync_seconds=sync_seconds,
+        clock=exchange.time,
+        sleep=exchange.sleep,
+    )
+
+    started = perf_counter()
+    try:
+        scheduler.run(max_closes=exchange.remaining_closes())
+    finally:
+        runner.shutdown()
+    wall = perf_counter() - started
+
+    stages = StageTimer()
+    for trader in traders:
+        stages.merge(trader.timer)
+    stages.add("other (scheduler, exchange)", max(wall - sum(stages.seconds.values()), 0.0), 0)
+    processed = sum(len(trader.signals) if compare_backtest else trader.timer.calls.get("generate_signal", 0)
+                    for trader in traders)
+
+    signals = pd.DataFrame(traders[0].signals, columns=["timestamp", "live_side", "live_reason"])
+    divergences = pd.DataFrame()
+    if compare_backtest and not signals.empty:
+        expected = _backtest_signals(candles, traders[0].strategy, signals["timestamp"])
+        signals = signals.merge(expected, on="timestamp", how="left")
+        divergences = signals[signals["live_side"] != signals["backtest_side"]].reset_index(drop=True)
+
+    return ReplayReport(
+        symbols=len(symbols),
+        candles=processed,
+        wall_seconds=wall,
+        stages=stages,
+        exchange_stats=exchange.stats(),
+        signals=signals,
+        divergences=divergences,
+    )
+
+
+def print_report(report: ReplayReport) -> None:
+    print("\n=== Live Path Replay ===")
+    print(f"Symbols            : {report.symbols}")
+    print(f"Candles processed  : {report.candles}")
+    print(f"Wall time          : {report.wall_seconds:.2f}s")
+    print(f"Candles / sec      : {report.candles_per_sec:.1f}")
+    print(f"Fills              : {report.exchange_stats['fills']}")
+    print(f"API calls          : {report.exchange_stats['calls']}")
+    print(f"Signal divergences : {len(report.divergences)} / {len(report.signals)}")
+    print()
+    print(report.stages.format_table())
+    if not report.divergences.empty:
+        print("\nFirst divergences (live vs backtest):")
+        print(report.divergences.head(10).to_string(index=False))
+    print("========================\n")
+
+
+if __name__ == "__main__":
+    report = replay_live(pd.read_csv(CACHE_PATH), start="2025-06-01")
+    print_report(report)
@@ -0,0 +1,140 @@
+"""
+Monte Carlo resampling of a session's trade sequence.
+
+SessionState.summary() describes one path: the order the trades happened
+to come in. Here the trade PnLs are resampled into many equity paths, as
+one (paths x trades) NumPy computation per chunk, to show how return and
+drawdown could have turned out:
+
+    bootstrap - trades drawn with replacement (return and drawdown vary)
+    shuffle   - the same trades in random order (final return is fixed,
+                drawdown varies: sequence risk only)
+
+Paths are built in log space: cumsum(log1p(pnl)) is the log equity, and
+the drawdown at each trade is expm1(log equity - running peak). The peak
+starts at 0, the initial equity. Both methods draw a (paths x trades)
+index array, so the NumPy path (take, cumsum, running max) and the numba
+kernel (one fused pass, utils.jit) give the same numbers. Chunks are
+sized to about max_chunk_mb of working arrays, so 100k paths over
+thousands of trades run in bounded memory. 10k bootstrap paths over 1k
+trades take ~0.3s with NumPy and ~0.1s with numba, cheap enough to
+score every config of a sweep
+(live_config_sweep.sweep_candles(..., monte_carlo_paths=10_000)).
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Sequence
+
+import numpy as np
+
+from backtesting.session_state import SessionState
+from utils.jit import JIT_ENABLED, njit
+
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+METHODS = ("bootstrap", "shuffle")
+
+
+@dataclass
+class MonteCarloResult:
+    returns: np.ndarray          # final return per path (decimal)
+    max_drawdowns: np.ndarray    # max drawdown per path (negative decimal)
+    method: str
+
+    @property
+    def paths(self) -> int:
+        return len(self.returns)
+
+    def percentiles(self, q: Sequence[float] = DEFAULT_PERCENTILES) -> Dict[str, Dict[float, float]]:
+        return {
+            "return": dict(zip(q, np.percentile(self.returns, q).tolist())),
+            "max_drawdown": dict(zip(q, np.percentile(self.max_drawdowns, q).tolist())),
+        }
+
+    def summary(self, q: Sequence[float] = DEFAULT_PERCENTILES, prefix: str = "mc_") -> Dict[str, float]:
+        """Flat dict for sweep result rows: return / drawdown percentiles and probability of a loss."""
+        pct = self.percentiles(q)
+        row = {f"{prefix}return_p{p:g}": value for p, value in pct["return"].items()}
+        row.update({f"{prefix}drawdown_p{p:g}": value for p, value in pct["max_drawdown"].items()})
+        row[f"{prefix}prob_loss"] = float(np.mean(self.returns < 0)) if self.paths else 0.0
+        return row
+
+
+def trade_returns(session: SessionState) -> np.ndarray:
+    return np.fromiter((t.pnl_pct for t in session.trades), dtype=np.float64, count=len(session.trades))
+
+
+def _chunk_rows(trades: int, max_chunk_mb: float) -> int:
+    # three 8-byte (rows x trades) working arrays: indices, log equity, running peak
+    return max(int(max_chunk_mb * 2 ** 20 // (24 * max(trades, 1))), 1)
+
+
+@njit
+def _path_stats_loop(log_pnl, idx, returns, drawdowns):
+    """Final log return and max log drawdown of each row of log_pnl[idx]."""
+    for i in range(idx.shape[0]):
+        cum = 0.0
+        peak = 0.0
+        worst = 0.0
+        for j in range(idx.shape[1]):
+            cum += log_pnl[idx[i, j]]
+            if cum > peak:
+                peak = cum
+            elif cum - peak < worst:
+                worst = cum - peak
+        returns[i] = cum
+        drawdowns[i] = worst
+
+
+def _path_stats_numpy(log_pnl, idx, returns, drawdowns, log_equity, peak):
+    np.take(log_pnl, idx, out=log_equity)
+    np.cumsum(log_equity, axis=1, out=log_equity)
+    np.maximum.accumulate(log_equity, axis=1, out=peak)
+    np.maximum(peak, 0.0, out=peak)                 # the initial equity is a peak too
+    np.subtract(log_equity, peak, out=peak)         # log drawdown, <= 0
+    peak.min(axis=1, out=drawdowns)
+    returns[:] = log_equity[:, -1]
+
+
+def simulate(
+    pnl,
+    paths: int = 10_000,
+    method: str = "bootstrap",
+    seed: int = 0,
+    max_chunk_mb: float = 64.0,
+) -> MonteCarloResult:
+    """Resample trade PnLs (decimals, or a SessionState) into `paths` equity paths."""
+    if method not in METHODS:
+        raise ValueError(f"Unknown method: {method} (expected one of {METHODS})")
+    if isinstance(pnl, SessionState):
+        pnl = trade_returns(pnl)
+    log_pnl = np.log1p(np.asarray(pnl, dtype=np.float64))
+    n = len(log_pnl)
+    returns = np.zeros(paths)
+    drawdowns = np.zeros(paths)
+    if n == 0 or paths == 0:
+        return MonteCarloResult(returns, drawdowns, method)
+
+    rng = np.random.default_rng(seed)
+    rows = min(_chunk_rows(n, max_chunk_mb), paths)
+    if not JIT_ENABLED:
+        log_equity = np.empty((rows, n))
+        peak = np.empty_like(log_equity)
+    for lo in range(0, paths, rows):
+        m = min(rows, paths - lo)
+        if method == "bootstrap":
+            idx = rng.integers(0, n, size=(m, n))
+        else:
+            idx = np.tile(np.arange(n), (m, 1))
+            rng.permuted(idx, axis=1, out=idx)
+        if JIT_ENABLED:
+            _path_stats_loop(log_pnl, idx, returns[lo:lo + m], drawdowns[lo:lo + m])
+        else:
+            _path_stats_numpy(log_pnl, idx, returns[lo:lo + m], drawdowns[lo:lo + m], log_equity[:m], peak[:m])
+    np.expm1(returns, out=returns)
+    np.expm1(drawdowns, out=drawdowns)
+    return MonteCarloResult(returns, drawdowns, method)
+
+
+def monte_carlo_summary(pnl, paths: int = 10_000, method: str = "bootstrap", seed: int = 0) -> Dict[str, float]:
+    """simulate(...).summary(): one flat row of percentiles for a sweep."""
+    return simulate(pnl, paths=paths, method=method, seed=seed).summary()
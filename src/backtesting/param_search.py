@@ -0,0 +1,530 @@
+"""
+Budgeted hyperparameter search over strategy parameters.
+
+The sweeps in live_config_sweep / consistency_sweep walk fixed Cartesian
+grids, so every added dimension multiplies the runtime. Here a SearchSpace
+describes each parameter as a range or a set of choices, and a sampler
+proposes points in the unit cube under a fixed evaluation budget:
+
+    random - independent uniform draws
+    lhs    - Latin hypercube: every parameter's range is covered evenly
+    tpe    - Tree-structured Parzen estimator style sequential model: after
+             a random start, candidates are drawn from a kernel density of
+             the best trials and ranked by good/bad density ratio
+
+    python src/backtesting/param_search.py --sampler tpe --budget 200 --workers 4
+
+Evaluations run in batches on a process pool (candles are sent to each
+worker once, as in batch_backtest). Results are cached in a JSON-lines
+file keyed by everything that changes a backtest: strategy space,
+parameters, symbol, year windows, the daily limiter caps, the broker fee,
+a fingerprint of the candles and RESULT_VERSION (bump it when engine or
+strategy changes alter results). Objectives are scored from the cached
+metrics, so they are not part of the key. Re-runs and overlapping
+searches only pay for new points: a cached trial counts toward the
+budget but costs no backtest, so a repeated search returns the same
+result almost instantly. Indicators for every period a space can pick
+are added once up front (prepare_candles), so workers never recompute
+them, and each backtest runs on just the columns its strategy reads (a
+narrow frame makes the per-bar slices several times cheaper).
+"""
+
+import argparse
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backtesting.engine import FEE_RATE, default_limiter, run_strategy_loop
+from backtesting.progress import SweepProgress, default_progress_path, json_default
+from backtesting.run_window_backtests import year_windows
+from data.historical_data import load_historical_ohlcv
+from indicators.indicator_engine import add_indicators
+from indicators.registry import ensure_indicators, fingerprint, spec
+from strategy.regime import MarketRegime, add_regime
+from strategy.variants import MeanReversionStrategy, MomentumCrossoverStrategy, TrendBreakoutStrategy
+from utils.config import Config
+from utils.logger import setup_logging
+
+# proposals per budgeted trial before a search over a small discrete space gives up
+MAX_PROPOSAL_FACTOR = 20
+WINDOW_WARMUP = pd.Timedelta(hours=300)
+BASE_COLUMNS = ("timestamp", "open", "high", "low", "close", "volume", "regime")
+# part of every cache key: bump when engine or strategy changes alter results
+RESULT_VERSION = 1
+
+
+# ---- Parameter space ----
+
+@dataclass(frozen=True)
+class Uniform:
+    low: float
+    high: float
+    log: bool = False
+
+    def decode(self, u: float) -> float:
+        if self.log:
+            return float(math.exp(math.log(self.low) + u * (math.log(self.high) - math.log(self.low))))
+        return float(self.low + u * (self.high - self.low))
+
+
+@dataclass(frozen=True)
+class IntRange:
+    low: int
+    high: int     # inclusive
+    step: int = 1
+
+    @property
+    def values(self) -> range:
+        return range(self.low, self.high + 1, self.step)
+
+    def decode(self, u: float) -> int:
+        values = self.values
+        return values[min(int(u * len(values)), len(values) - 1)]
+
+
+@dataclass(frozen=True)
+class Choice:
+    options: Tuple[Any, ...]
+
+    def decode(self, u: float):
+        return self.options[min(int(u * len(self.options)), len(self.options) - 1)]
+
+
+@dataclass(frozen=True)
+class SearchSpace:
+    """
+    Parameters of one strategy class. `fixed` is passed to every instance;
+    `indicator_params` maps period parameters to their indicator name so
+    prepare_candles can add every period the space can pick.
+    """
+
+    name: str
+    strategy: type
+    params: Tuple[Tuple[str, Any], ...]
+    fixed: Tuple[Tuple[str, Any], ...] = ()
+    indicator_params: Tuple[Tuple[str, str], ...] = ()
+
+    @property
+    def names(self) -> List[str]:
+        return [name for name, _ in self.params]
+
+    @property
+    def dims(self) -> int:
+        return len(self.params)
+
+    def decode(self, u: Sequence[float]) -> Dict[str, Any]:
+        return {name: dim.decode(float(x)) for (name, dim), x in zip(self.params, u)}
+
+    def build(self, params: Dict[str, Any], symbol: str):
+        return self.strategy(symbol=symbol, **dict(self.fixed), **params)
+
+    def indicator_specs(self) -> list:
+        dims = dict(self.params)
+        specs = []
+        for param, indicator in self.indicator_params:
+            dim = dims.get(param)
+            periods = dim.values if isinstance(dim, IntRange) else dim.options if isinstance(dim, Choice) else ()
+            specs += [spec(indicator, period=period) for period in periods]
+        return specs
+
+
+SEARCH_SPACES: Dict[str, SearchSpace] = {
+    space.name: space
+    for space in (
+        SearchSpace(
+            "mean_reversion",
+            MeanReversionStrategy,
+            params=(
+                ("rsi_low", Uniform(20.0, 40.0)),
+                ("rsi_high", Uniform(60.0, 80.0)),
+                ("atr_mult", Uniform(0.6, 1.6)),
+                ("min_stretch", Uniform(0.002, 0.012, log=True)),
+                ("min_stretch_atr_mult", Choice((None, 0.5, 0.75, 1.0))),
+                ("allowed_regimes", Choice((None, (MarketRegime.SIDEWAYS,)))),
+                ("rsi_period", IntRange(7, 21)),
+                ("ema_period", IntRange(10, 50, 2)),
+            ),
+            indicator_params=(("rsi_period", "rsi"), ("ema_period", "ema")),
+        ),
+        SearchSpace(
+            "trend_breakout",
+            TrendBreakoutStrategy,
+            params=(("lookback", IntRange(20, 120, 10)), ("atr_mult", Uniform(0.6, 2.0))),
+            indicator_params=(("lookback", "range"),),
+        ),
+        SearchSpace("momentum", MomentumCrossoverStrategy, params=(("atr_mult", Uniform(0.6, 2.0)),)),
+    )
+}
+
+
+def prepare_candles(candles: pd.DataFrame, space: SearchSpace) -> pd.DataFrame:
+    """
+    Candles with the default indicators, the precomputed regime label and
+    every period the space can pick.
+    """
+    candles = add_regime(add_indicators(candles.reset_index(drop=True)))
+    return ensure_indicators(candles, space.indicator_specs(), backend="numpy")
+
+
+def strategy_frame(candles: pd.DataFrame, strategy) -> pd.DataFrame:
+    """The columns strategy reads (OHLCV, regime, its indicators), or candles if some are missing."""
+    needed = [col for item in strategy.required_indicators() for col in item.columns]
+    if any(col not in candles.columns for col in needed):
+        return candles
+    columns = [col for col in BASE_COLUMNS if col in candles.columns]
+    return candles[columns + [col for col in dict.fromkeys(needed) if col not in columns]]
+
+
+# ---- Samplers ----
+
+class RandomSampler:
+    def __init__(self, dims: int, seed: int = 0):
+        self.dims = dims
+        self.rng = np.random.default_rng(seed)
+
+    def ask(self, n: int) -> np.ndarray:
+        return self.rng.random((n, self.dims))
+
+    def tell(self, points: np.ndarray, scores: Sequence[float]) -> None:
+        pass
+
+
+class LatinHypercubeSampler(RandomSampler):
+    """Draws from Latin hypercube designs of `size` points, starting a new design when one runs out."""
+
+    def __init__(self, dims: int, size: int, seed: int = 0):
+        super().__init__(dims, seed)
+        self.size = max(size, 1)
+        self._design = np.empty((0, dims))
+
+    def _new_design(self) -> np.ndarray:
+        strata = np.argsort(self.rng.random((self.size, self.dims)), axis=0)
+        return (strata + self.rng.random((self.size, self.dims))) / self.size
+
+    def ask(self, n: int) -> np.ndarray:
+        while len(self._design) < n:
+            self._design = np.vstack([self._design, self._new_design()])
+        points, self._design = self._design[:n], self._design[n:]
+        return points
+
+
+class TPESampler(RandomSampler):
+    """
+    Parzen-estimator sampler (maximizing). The top `gamma` share of trials
+    forms the "good" density l(x), the rest g(x); both are Gaussian kernel
+    densities in the unit cube with a per-dimension bandwidth. Each ask
+    draws `candidates` points per requested point from l(x) and returns
+    those with the highest log l(x) - log g(x).
+    """
+
+    def __init__(self, dims: int, seed: int = 0, startup: int = 16, gamma: float = 0.25, candidates: int = 48):
+        super().__init__(dims, seed)
+        self.startup = startup
+        self.gamma = gamma
+        self.candidates = candidates
+        self.points = np.empty((0, dims))
+        self.scores = np.empty(0)
+
+    def tell(self, points: np.ndarray, scores: Sequence[float]) -> None:
+        self.points = np.vstack([self.points, points])
+        self.scores = np.concatenate([self.scores, np.asarray(scores, dtype=np.float64)])
+
+    def _bandwidth(self, points: np.ndarray) -> np.ndarray:
+        n = len(points)
+        spread = points.std(axis=0) if n > 1 else np.full(self.dims, 0.5)
+        return np.clip(spread * n ** (-1.0 / (self.dims + 4)), 0.05, 0.5)
+
+    @staticmethod
+    def _log_density(x: np.ndarray, centers: np.ndarray, bandwidth: np.ndarray) -> np.ndarray:
+        z = (x[:, None, :] - centers[None, :, :]) / bandwidth
+        log_k = -0.5 * (z * z).sum(axis=2) - np.log(bandwidth).sum()
+        top = log_k.max(axis=1, keepdims=True)
+        return (top + np.log(np.exp(log_k - top).mean(axis=1, keepdims=True)))[:, 0]
+
+    def ask(self, n: int) -> np.ndarray:
+        if len(self.scores) < self.startup:
+            return super().ask(n)
+        order = np.argsort(-np.nan_to_num(self.scores, nan=-np.inf, neginf=-1e300))
+        n_good = max(int(math.ceil(self.gamma * len(order))), 1)
+        good, bad = self.points[order[:n_good]], self.points[order[n_good:]]
+        good_bw = self._bandwidth(good)
+        bad_bw = self._bandwidth(bad) if len(bad) else np.full(self.dims, 0.5)
+
+        pool = n * self.candidates
+        centers = good[self.rng.integers(len(good), size=pool)]
+        draws = np.clip(centers + self.rng.standard_normal((pool, self.dims)) * good_bw, 0.0, 1.0 - 1e-12)
+        ratio = self._log_density(draws, good, good_bw)
+        if len(bad):
+            ratio -= self._log_density(draws, bad, bad_bw)
+        return draws[np.argsort(-ratio)[:n]]
+
+
+SAMPLERS = ("random", "lhs", "tpe")
+
+
+def make_sampler(name: str, dims: int, budget: int, seed: int = 0):
+    if name == "random":
+        return RandomSampler(dims, seed)
+    if name == "lhs":
+        return LatinHypercubeSampler(dims, budget, seed)
+    if name == "tpe":
+        return TPESampler(dims, seed, startup=max(min(budget // 5, 32), 8))
+    raise ValueError(f"Unknown sampler: {name} (expected one of {SAMPLERS})")
+
+
+# ---- Evaluation ----
+
+def evaluate(
+    space: SearchSpace,
+    params: Dict[str, Any],
+    candles: pd.DataFrame,
+    symbol: str,
+    windows: Optional[Sequence[tuple]] = None,
+) -> Dict[str, Any]:
+    """
+    Backtest one parameter set. Without windows: the session summary over
+    all candles. With (year, start, end) windows: one run per window, as in
+    consistency_sweep, and the yearly return statistics.
+    """
+    candles = strategy_frame(candles, space.build(params, symbol))
+    if windows is None:
+        session = run_strategy_loop(space.build(params, symbol), candles, symbol, limiter=default_limiter(candles))
+        return session.summary()
+
+    yearly_returns, trades = [], 0
+    for _, start, end in windows:
+        window = candles[(candles["timestamp"] >= start - WINDOW_WARMUP) & (candles["timestamp"] <= end)]
+        if window.empty:
+            continue
+        session = run_strategy_loop(
+            space.build(params, symbol), window, symbol, limiter=default_limiter(window), trade_start=start,
+        )
+        yearly_returns.append(session.summary()["return_pct"])
+        trades += len(session.trades)
+    if not yearly_returns:
+        return {"total_trades": 0}
+    return {
+        "median_yearly_return": median(yearly_returns),
+        "worst_year_return": min(yearly_returns),
+        "best_year_return": max(yearly_returns),
+        "avg_yearly_return": sum(yearly_returns) / len(yearly_returns),
+        "total_trades": trades,
+    }
+
+
+# Set once per worker process by the pool initializer (see batch_backtest).
+_worker_state: Optional[dict] = None
+
+
+def _init_worker(state: dict, configure_logging: bool = True) -> None:
+    global _worker_state
+    _worker_state = state
+    if configure_logging:
+        setup_logging("quiet")
+
+
+def _evaluate_job(params: Dict[str, Any]) -> Tuple[Dict[str, Any], float]:
+    state = _worker_state
+    started = perf_counter()
+    result = evaluate(state["space"], params, state["candles"], state["symbol"], state["windows"])
+    return result, perf_counter() - started
+
+
+class ResultCache:
+    """Evaluated results keyed by a canonical JSON key; persisted as JSON lines when a path is given."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path is not None else None
+        self.results: Dict[str, Dict[str, Any]] = {}
+        if self.path is not None and self.path.exists():
+            with self.path.open() as handle:
+                for line in handle:
+                    entry = json.loads(line)
+                    self.results[entry["key"]] = entry["result"]
+
+    @staticmethod
+    def key(**parts) -> str:
+        return json.dumps(parts, sort_keys=True, default=json_default)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.results.get(key)
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        self.results[key] = result
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a") as handle:
+                handle.write(json.dumps({"key": key, "result": result}, default=json_default) + "\n")
+
+
+# ---- Search ----
+
+@dataclass
+class SearchResult:
+    trials: pd.DataFrame            # one row per distinct parameter set, best first
+    evaluations: int                # backtests actually run (cache hits excluded)
+    cache_hits: int
+    seconds: float
+    best: Dict[str, Any] = field(default_factory=dict)
+
+
+def _score(result: Dict[str, Any], objective: str, min_trades: int) -> float:
+    value = result.get(objective)
+    if value is None or result.get("total_trades", 0) < min_trades:
+        return -math.inf
+    return float(value)
+
+
+def search(
+    candles: pd.DataFrame,
+    space: SearchSpace,
+    sampler: str = "tpe",
+    budget: int = 200,
+    objective: Optional[str] = None,
+    min_trades: int = 30,
+    windows: Optional[Sequence[tuple]] = None,
+    symbol: str = Config.LIVE_SYMBOL,
+    workers: Optional[int] = 1,
+    batch_size: Optional[int] = None,
+    cache: Optional[ResultCache] = None,
+    seed: int = 0,
+    progress: Optional[SweepProgress] = None,
+    prepared: bool = False,
+) -> SearchResult:
+    """
+    Maximize `objective` (default return_pct, or median_yearly_return with
+    windows) over the space with `budget` distinct parameter sets (trials);
+    only those missing from the cache are backtested. Parameter
+    sets with fewer than min_trades trades score -inf. Pass prepared=True
+    when candles already went through prepare_candles.
+    """
+    objective = objective or ("return_pct" if windows is None else "median_yearly_return")
+    if not prepared:
+        candles = prepare_candles(candles, space)
+    cache = cache if cache is not None else ResultCache()
+    workers = max(workers or os.cpu_count() or 1, 1)
+    batch_size = batch_size or max(workers, 1)
+    proposer = make_sampler(sampler, space.dims, budget, seed)
+    key_parts = {
+        "space": space.name,
+        "data": fingerprint(candles),
+        "windows": [(start, end) for _, start, end in windows] if windows is not None else None,
+        "symbol": symbol,
+        "limits": [Config.MAX_TRADES_PER_DAY, Config.MAX_DAILY_LOSS_PCT, Config.MAX_DAILY_PROFIT_PCT],
+        "fee": FEE_RATE,
+        "version": RESULT_VERSION,
+    }
+
+    state = {"space": space, "candles": candles, "symbol": symbol, "windows": windows}
+    pool = None
+    if workers > 1:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(state,))
+    else:
+        _init_worker(state, configure_logging=False)
+
+    trials: Dict[str, Dict[str, Any]] = {}
+    evaluations = cache_hits = proposals = 0
+    started = perf_counter()
+    try:
+        while len(trials) < budget and proposals < budget * MAX_PROPOSAL_FACTOR:
+            points = proposer.ask(min(batch_size, budget - len(trials)))
+            proposals += len(points)
+            batch = [(point, space.decode(point)) for point in points]
+            keys = [cache.key(params=params, **key_parts) for _, params in batch]
+
+            pending = {}
+            for key, (_, params) in zip(keys, batch):
+                if cache.get(key) is None and key not in pending:
+                    pending[key] = params
+            jobs = list(pending.values())
+            outputs = pool.map(_evaluate_job, jobs) if pool is not None else map(_evaluate_job, jobs)
+            for (key, params), (result, seconds) in zip(pending.items(), outputs):
+                cache.put(key, result)
+                evaluations += 1
+                if progress is not None:
+                    progress.record(params, bars=len(candles), seconds=seconds, trades=result.get("total_trades"))
+                    progress.config_done()
+
+            scores = []
+            for key, (_, params) in zip(keys, batch):
+                result = cache.get(key)
+                score = _score(result, objective, min_trades)
+                scores.append(score)
+                if key not in trials:
+                    if key not in pending:
+                        cache_hits += 1
+                        if progress is not None:
+                            progress.skip(params, reason="cached")
+                            progress.config_done()
+                    trials[key] = {**params, "score": score, "cached": key not in pending, **result}
+            proposer.tell(np.array([point for point, _ in batch]), scores)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    rows = sorted(trials.values(), key=lambda row: -row["score"])
+    best = {name: rows[0][name] for name in space.names} if rows else {}
+    frame = pd.DataFrame(rows)
+    return SearchResult(frame, evaluations, cache_hits, perf_counter() - started, best)
+
+
+def run_search(
+    start: str,
+    end: str,
+    space_name: str = "mean_reversion",
+    sampler: str = "tpe",
+    budget: int = 200,
+    workers: Optional[int] = None,
+    cache_path: Optional[Path] = Path("logs/param_search_cache.jsonl"),
+    seed: int = 0,
+) -> SearchResult:
+    """Search on local BTC/USD history, scored by median yearly return like consistency_sweep."""
+    setup_logging("quiet")
+
+    candles = load_historical_ohlcv("BTC/USD", "1h", start, end)
+    if candles.empty:
+        raise RuntimeError("Local BTC/USD data not found for search.")
+
+    space = SEARCH_SPACES[space_name]
+    windows = year_windows(pd.Timestamp(start, tz="UTC").year, pd.Timestamp(end, tz="UTC").year, end)
+    label = f"param_search_{space_name}_{sampler}"
+    with SweepProgress(budget, path=default_progress_path(label), label=label) as progress:
+        return search(
+            candles, space, sampler=sampler, budget=budget, windows=windows, workers=workers,
+            cache=ResultCache(cache_path), seed=seed, progress=progress,
+        )
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Budgeted parameter search (random / LHS / TPE).")
+    parser.add_argument("--space", default="mean_reversion", choices=sorted(SEARCH_SPACES))
+    parser.add_argument("--sampler", default="tpe", choices=SAMPLERS)
+    parser.add_argument("--budget", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all CPUs)")
+    parser.add_argument("--start", default="2018-05-15")
+    parser.add_argument("--end", default="2025-12-01")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    result = run_search(
+        args.start, args.end, space_name=args.space, sampler=args.sampler, budget=args.budget,
+        workers=args.workers, seed=args.seed,
+    )
+    space = SEARCH_SPACES[args.space]
+    print(f"\n=== {args.sampler} search: {result.evaluations} backtests, "
+          f"{result.cache_hits} cached, {result.seconds:.0f}s (top 10) ===")
+    columns = ["score", "worst_year_return", "total_trades"] + space.names
+    print(result.trials[columns].head(10).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
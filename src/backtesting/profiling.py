@@ -0,0 +1,169 @@
+"""
+Per-stage profiling for the backtest loop.
+
+Pass a StageProfiler to BacktestEngine (or run_strategy_loop / the sweep
+helpers) and every stage of the bar loop is timed with perf_counter:
+limiter check, the candle-history slice, generate_signal (split by the
+returned signal's reason, i.e. the strategy branch that exited: "Time
+filter", "Regime filter", "Mean reversion long", ...), exit scan,
+open_position, check_and_close and record_trade. One profiler can be
+shared across runs to aggregate a sweep.
+
+StageProfiler is a utils.profiling.StageTimer keyed by stacks (tuples of
+frames) instead of flat stage names, plus run totals. Overhead is the
+same: two perf_counter calls and two dict updates per stage call, small
+next to generate_signal, so it can stay on for whole sweeps.
+
+table() prints cumulative time and call counts; write_collapsed() writes
+the collapsed-stack format read by flamegraph.pl / speedscope / inferno
+(one "frame;frame;frame <microseconds>" line per stack).
+"""
+
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, List, Tuple
+
+from utils.profiling import StageTimer
+
+ROOT_FRAME = "backtest"
+
+# stage keys (tuples: the stack below ROOT_FRAME)
+INDICATORS = ("ensure_indicators",)
+LIMITER = ("limiter.blocked_until",)
+HISTORY = ("candles.iloc[:i]",)
+SIGNAL = "generate_signal"
+EXIT_SCAN = ("broker.find_exit",)
+OPEN = ("broker.open_position",)
+CLOSE = ("broker.check_and_close",)
+RECORD = ("session.record_trade",)
+
+
+class StageProfiler(StageTimer):
+    """StageTimer whose stages are stacks, with the wall time of whole runs."""
+
+    def __init__(self):
+        super().__init__()
+        self.runs = 0
+        self.run_seconds = 0.0
+
+    def timed(self, fn, stack: Tuple[str, ...]):
+        """Wrap fn so every call is recorded under stack."""
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.add(stack, perf_counter() - start)
+        return wrapper
+
+    def timed_signal(self, generate_signal):
+        """Wrap generate_signal, recording each call under the returned signal's reason."""
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            signal = generate_signal(*args, **kwargs)
+            self.add((SIGNAL, str(getattr(signal, "reason", "") or "no reason")), perf_counter() - start)
+            return signal
+        return wrapper
+
+    def wrap(self, obj, stages: Dict[str, Tuple[str, ...]]):
+        """Proxy for obj whose methods named in stages are timed; other attributes pass through."""
+        return _Timed(obj, {name: self.timed(getattr(obj, name), stack) for name, stack in stages.items()
+                            if hasattr(obj, name)})
+
+    def wrap_strategy(self, strategy):
+        """Proxy for strategy whose generate_signal is timed per reason."""
+        return _Timed(strategy, {"generate_signal": self.timed_signal(strategy.generate_signal)})
+
+    def add_run(self, seconds: float) -> None:
+        self.runs += 1
+        self.run_seconds += seconds
+
+    def merge(self, other: "StageProfiler") -> None:
+        """Fold another profiler in (e.g. one returned by a worker process)."""
+        super().merge(other)
+        self.runs += other.runs
+        self.run_seconds += other.run_seconds
+
+    def reset(self) -> None:
+        super().reset()
+        self.runs = 0
+        self.run_seconds = 0.0
+
+    # ---- Reports ----
+
+    def rows(self) -> List[dict]:
+        """
+        One row per stage, plus a parent row for stages split by branch
+        (generate_signal), ordered by total time.
+        """
+        parents: Dict[str, List[float]] = {}
+        for stack, seconds in self.seconds.items():
+            calls = self.calls.get(stack, 0)
+            if len(stack) > 1:
+                entry = parents.setdefault(stack[0], [0, 0.0])
+                entry[0] += calls
+                entry[1] += seconds
+
+        def row(name, calls, seconds, depth):
+            return {
+                "stage": name,
+                "depth": depth,
+                "calls": int(calls),
+                "seconds": seconds,
+                "share": seconds / self.run_seconds if self.run_seconds else 0.0,
+                "us_per_call": seconds / calls * 1e6 if calls else 0.0,
+            }
+
+        top = [(stack[0], self.calls.get(stack, 0), seconds)
+               for stack, seconds in self.seconds.items() if len(stack) == 1]
+        top += [(name, calls, seconds) for name, (calls, seconds) in parents.items()]
+        rows = []
+        for name, calls, seconds in sorted(top, key=lambda item: -item[2]):
+            rows.append(row(name, calls, seconds, 0))
+            children = [(stack[1], self.calls.get(stack, 0), s)
+                        for stack, s in self.seconds.items() if len(stack) > 1 and stack[0] == name]
+            for child, c, s in sorted(children, key=lambda item: -item[2]):
+                rows.append(row(child, c, s, 1))
+        return rows
+
+    def table(self) -> str:
+        lines = [
+            f"{self.runs} run(s), {self.run_seconds:.3f}s total",
+            f"{'stage':<40}{'calls':>10}{'total s':>10}{'% run':>8}{'us/call':>10}",
+        ]
+        for r in self.rows():
+            name = ("  " * r["depth"] + r["stage"])[:39]
+            lines.append(f"{name:<40}{r['calls']:>10,}{r['seconds']:>10.3f}{r['share']:>8.1%}{r['us_per_call']:>10.1f}")
+        return "\n".join(lines)
+
+    def collapsed(self) -> List[str]:
+        """Collapsed stacks in integer microseconds; the root keeps the untimed loop remainder."""
+        lines = []
+        staged = 0.0
+        for stack, seconds in sorted(self.seconds.items()):
+            staged += seconds
+            frames = [ROOT_FRAME] + [frame.replace(";", ":") for frame in stack]
+            lines.append(f"{';'.join(frames)} {round(seconds * 1e6)}")
+        remainder = max(self.run_seconds - staged, 0.0)
+        lines.append(f"{ROOT_FRAME} {round(remainder * 1e6)}")
+        return lines
+
+    def write_collapsed(self, path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("\n".join(self.collapsed()) + "\n")
+        return path
+
+
+class _Timed:
+    """Attribute reads and writes go to the target, except the timed methods."""
+
+    def __init__(self, target, methods):
+        object.__setattr__(self, "_target", target)
+        self.__dict__.update(methods)
+
+    def __getattr__(self, name):
+        return getattr(self._target, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._target, name, value)
@@ -0,0 +1,207 @@
+"""
+Progress and timing telemetry for parameter sweeps.
+
+The sweeps run with logging quiet, so SweepProgress reports on its own:
+every (config, window) backtest is appended to a JSON-lines file with its
+wall time, bars, trades and the sweep's running totals (runs done/total,
+configs done/total, bars/sec, ETA). A one-line status goes to stderr at
+most every `status_every` seconds.
+
+    {"event": "start", "label": "consistency_sweep", "total_configs": 32, ...}
+    {"event": "run", "config": {...}, "window": 2021, "seconds": 1.8, "eta_seconds": 412.0, ...}
+    {"event": "done", "elapsed": 530.2, "bars_per_sec": 95411.0, "slowest": [...]}
+
+load_progress() reads the run events back into a DataFrame, e.g. to
+find the configs that are pathologically slow.
+"""
+
+import json
+import sys
+import time
+from dataclasses import asdict, is_dataclass
+from datetime import datetime, timezone
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TextIO
+
+import pandas as pd
+
+SLOWEST_CONFIGS = 5
+
+
+def default_progress_path(label: str, log_dir: str = "logs") -> Path:
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return Path(log_dir) / "sweeps" / f"{label}_{stamp}.jsonl"
+
+
+def json_default(value):
+    """json.dumps default for sweep configs: enums by name, timestamps as ISO, ranges/sets as lists."""
+    if isinstance(value, Enum):
+        return value.name
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return value.isoformat()
+    if isinstance(value, (range, set, frozenset)):
+        return list(value)
+    if hasattr(value, "item"):   # numpy scalars
+        return value.item()
+    return str(value)
+
+
+def _config_dict(config) -> Dict[str, Any]:
+    if is_dataclass(config):
+        return asdict(config)
+    if isinstance(config, dict):
+        return dict(config)
+    return {"config": config}
+
+
+class SweepProgress:
+    """
+    Reporter for one sweep of total_configs configs, each run on
+    windows_per_config windows. Call record() (or skip()) after every
+    backtest and config_done() after every config.
+    """
+
+    def __init__(
+        self,
+        total_configs: int,
+        windows_per_config: int = 1,
+        path: Optional[Path] = None,
+        label: str = "sweep",
+        status_every: float = 10.0,
+        stream: Optional[TextIO] = sys.stderr,
+    ):
+        self.label = label
+        self.total_configs = total_configs
+        self.total_runs = total_configs * windows_per_config
+        self.path = Path(path) if path is not None else None
+        self.status_every = status_every
+        self.stream = stream
+
+        self.runs_done = 0
+        self.configs_done = 0
+        self.bars_done = 0
+        self.run_seconds = 0.0
+        self._config_seconds: Dict[str, float] = {}
+        self._started = time.perf_counter()
+        self._last_status = self._started
+        self._file = None
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open("a")
+        self._write({
+            "event": "start",
+            "label": label,
+            "total_configs": total_configs,
+            "windows_per_config": windows_per_config,
+            "total_runs": self.total_runs,
+            "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        })
+
+    # ---- Recording ----
+
+    def record(self, config, window=None, bars: int = 0, seconds: float = 0.0, trades: Optional[int] = None) -> Dict:
+        """Log one finished (config, window) backtest and return its event."""
+        self.runs_done += 1
+        self.bars_done += bars
+        self.run_seconds += seconds
+        params = _config_dict(config)
+        key = json.dumps(params, sort_keys=True, default=json_default)
+        self._config_seconds[key] = self._config_seconds.get(key, 0.0) + seconds
+
+        event = {
+            "event": "run",
+            "config": params,
+            "window": window,
+            "bars": bars,
+            "trades": trades,
+            "seconds": seconds,
+            "run_bars_per_sec": bars / seconds if seconds > 0 else None,
+            **self.totals(),
+        }
+        self._write(event)
+        self._maybe_status()
+        return event
+
+    def skip(self, config, window=None, reason: str = "no data") -> None:
+        """Count a (config, window) pair that was not run, so the ETA stays honest."""
+        self.runs_done += 1
+        self._write({"event": "skip", "config": _config_dict(config), "window": window, "reason": reason})
+
+    def config_done(self) -> None:
+        self.configs_done += 1
+
+    def close(self) -> Dict:
+        """Write the summary event (with the slowest configs) and close the file."""
+        slowest = sorted(self._config_seconds.items(), key=lambda item: -item[1])[:SLOWEST_CONFIGS]
+        event = {
+            "event": "done",
+            **self.totals(),
+            "run_seconds": self.run_seconds,
+            "slowest": [{"config": json.loads(key), "seconds": seconds} for key, seconds in slowest],
+        }
+        self._write(event)
+        if self.stream is not None:
+            print(self.status_line(), file=self.stream, flush=True)
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        return event
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---- Totals ----
+
+    def totals(self) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - self._started
+        remaining = max(self.total_runs - self.runs_done, 0)
+        eta = elapsed / self.runs_done * remaining if self.runs_done else None
+        return {
+            "runs_done": self.runs_done,
+            "total_runs": self.total_runs,
+            "configs_done": self.configs_done,
+            "total_configs": self.total_configs,
+            "elapsed": elapsed,
+            "bars_per_sec": self.bars_done / elapsed if elapsed > 0 else None,
+            "eta_seconds": eta,
+        }
+
+    def status_line(self) -> str:
+        t = self.totals()
+        eta = "-" if t["eta_seconds"] is None else f"{t['eta_seconds']:.0f}s"
+        rate = "-" if t["bars_per_sec"] is None else f"{t['bars_per_sec']:,.0f}"
+        return (
+            f"[{self.label}] configs {t['configs_done']}/{t['total_configs']}, "
+            f"runs {t['runs_done']}/{t['total_runs']}, {rate} bars/s, "
+            f"elapsed {t['elapsed']:.0f}s, ETA {eta}"
+        )
+
+    def _maybe_status(self) -> None:
+        if self.stream is None:
+            return
+        now = time.perf_counter()
+        if now - self._last_status >= self.status_every:
+            self._last_status = now
+            print(self.status_line(), file=self.stream, flush=True)
+
+    def _write(self, event: Dict) -> None:
+        if self._file is not None:
+            self._file.write(json.dumps(event, default=json_default) + "\n")
+            self._file.flush()
+
+
+def load_progress(path) -> pd.DataFrame:
+    """Run events of a progress file, one row per (config, window), config fields as columns."""
+    rows: List[Dict] = []
+    with Path(path).open() as handle:
+        for line in handle:
+            event = json.loads(line)
+            if event.get("event") != "run":
+                continue
+            config = event.pop("config")
+            rows.append({**config, **event})
+    return pd.DataFrame(rows)
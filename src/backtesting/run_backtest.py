@@ -1,12 +1,9 @@
-from utils.logger import log
+from utils.logger import log, setup_logging
 from utils.config import Config
 from data.historical_data import load_historical_ohlcv
 from indicators.indicator_engine import add_indicators
 from strategy.variants import MeanReversionStrategy
-from strategy.regime import detect_regime
-from execution.paper_broker import PaperBroker
-from filters.trade_limiter import TradeLimiter
-from backtesting.session_state import SessionState, TradeRecord
+from backtesting.engine import default_limiter, run_strategy_loop
 from backtesting.visualizer import plot_equity_curve, plot_drawdowns
 
 
@@ -46,58 +43,10 @@ def run_backtest(
         min_stretch=Config.MIN_STRETCH,
         min_stretch_atr_mult=Config.MIN_STRETCH_ATR_MULT
     )
-    broker = PaperBroker(fee_rate=0.0005)
-    limiter = TradeLimiter(
-        max_trades_per_day=Config.MAX_TRADES_PER_DAY,
-        max_daily_loss_pct=Config.MAX_DAILY_LOSS_PCT,
-        max_daily_profit_pct=Config.MAX_DAILY_PROFIT_PCT,
-        log_resets=False,
-        log_blocks=True
-    )
-    session = SessionState()
+    limiter = default_limiter(candles, log_blocks=True)
 
     # ---- Backtest Loop ----
-    for i in range(300, len(candles)):  # warmup for indicators
-        window = candles.iloc[:i]
-        last = window.iloc[-1]
-
-        # Strategy + Regime
-        signal = strategy.generate_signal(window)
-        regime = detect_regime(window)
-
-        # --- Open new trade if allowed ---
-        if not broker.has_open_position() and limiter.can_trade(now_utc=last["timestamp"]) and signal.is_actionable():
-            if broker.open_position(
-                symbol=symbol,
-                side=signal.side,
-                entry=signal.entry_price,
-                stop_loss=signal.stop_loss,
-                take_profit=signal.take_profit
-            ):
-                limiter.record_trade_opened()
-
-        # --- Check exit conditions on open trade ---
-        pnl_pct = broker.check_and_close(
-            high=last["high"],
-            low=last["low"],
-            close=last["close"],
-            trade_limiter=limiter
-        )
-
-        # --- Record closed trades ---
-        if pnl_pct is not None:
-            exit_price = signal.take_profit if pnl_pct > 0 else signal.stop_loss
-
-            trade = TradeRecord(
-                symbol=symbol,
-                side=signal.side,
-                entry_price=signal.entry_price,
-                exit_price=exit_price,
-                pnl_pct=pnl_pct,
-                reason=signal.reason,
-                timestamp=last["timestamp"]
-            )
-            session.record_trade(trade)
+    session = run_strategy_loop(strategy, candles, symbol, limiter=limiter)
 
     # ---- Summary ----
     log.info("=== Backtest Complete ===")
@@ -108,4 +57,5 @@ def run_backtest(
 
 # ---- Entry Point ----
 if __name__ == "__main__":
+    setup_logging()
     run_backtest()
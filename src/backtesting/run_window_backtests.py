@@ -1,33 +1,65 @@
+"""
+Full-range plus per-year backtests from one load of the data.
+
+The candles are loaded, parsed and indexed once. The full range is
+backtested here while the yearly windows run as slices on a process pool.
+
+What is reused for the years depends on carry_warmup:
+
+    False (default) - each year is an isolated slice of the loaded candles,
+                      and its worker computes indicators for that slice
+                      (EMAs depend on where the series starts). The first
+                      WARMUP_BARS bars only warm them up, so the summaries
+                      equal loading that year on its own (the previous
+                      behaviour). Only the CSV load and parse are shared.
+    True            - indicators are computed once for the full history.
+                      Each year slices that frame and trades from the first
+                      bar of the year, with the WARMUP_BARS bars before it as
+                      warmup (as consistency_sweep does). Yearly numbers then
+                      differ slightly from standalone runs.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import os
+from time import perf_counter
+from typing import Iterator, Optional
 
-from backtesting.session_state import SessionState, TradeRecord
+import numpy as np
+import pandas as pd
+
+from backtesting.engine import WARMUP_BARS, run_strategy_loop
+from backtesting.session_state import SessionState
 from backtesting.visualizer import plot_equity_curve
 from data.historical_data import load_historical_ohlcv
 from indicators.indicator_engine import add_indicators
-from execution.paper_broker import PaperBroker
 from filters.trade_limiter import TradeLimiter
+from filters.trading_calendar import TradingDayCalendar, _to_ns, _to_ns_array
 from strategy.variants import MeanReversionStrategy
 from utils.config import Config
-from utils.logger import log
+from utils.logger import log, setup_logging
+
+
+def year_windows(start_year: int, end_year: int, end: str) -> list[tuple[int, pd.Timestamp, pd.Timestamp]]:
+    """(year, start, end) per calendar year; the last one ends at `end`."""
+    windows = []
+    for year in range(start_year, end_year + 1):
+        year_start = pd.Timestamp(f"{year}-01-01", tz="UTC")
+        year_end = pd.Timestamp(f"{year}-12-31", tz="UTC")
+        if year == end_year:
+            year_end = pd.Timestamp(end, tz="UTC")
+        windows.append((year, year_start, year_end))
+    return windows
 
 
 def _run_window(
+    candles: pd.DataFrame,
     symbol: str,
-    timeframe: str,
-    start: str,
-    end: str,
-) -> SessionState | None:
-    candles = load_historical_ohlcv(symbol, timeframe, start, end)
-    if candles.empty:
-        log.warning(f"No data for window {start} → {end}.")
-        return None
-
-    print(
-        f"Data range: {candles['timestamp'].iloc[0].date()} → "
-        f"{candles['timestamp'].iloc[-1].date()} | Rows: {len(candles)}"
-    )
-    candles = add_indicators(candles)
+    trade_start: Optional[pd.Timestamp] = None,
+) -> SessionState:
+    """Backtest one window of candles that already carry indicators."""
     strategy = MeanReversionStrategy(
         symbol,
         atr_mult=Config.ATR_MULT,
@@ -36,52 +68,46 @@ def _run_window(
         min_stretch=Config.MIN_STRETCH,
         min_stretch_atr_mult=Config.MIN_STRETCH_ATR_MULT
     )
-    broker = PaperBroker(fee_rate=0.0005)
-    limiter = TradeLimiter(log_resets=False, log_blocks=False)
-    session = SessionState()
-    active_signal = None
-
-    for i in range(300, len(candles)):
-        window = candles.iloc[:i]
-        last = window.iloc[-1]
-        signal = strategy.generate_signal(window)
-
-        if not broker.has_open_position() and limiter.can_trade(now_utc=last["timestamp"]) and signal.is_actionable():
-            if broker.open_position(
-                symbol=symbol,
-                side=signal.side,
-                entry=signal.entry_price,
-                stop_loss=signal.stop_loss,
-                take_profit=signal.take_profit
-            ):
-                limiter.record_trade_opened()
-                active_signal = signal
-
-        pnl_pct = broker.check_and_close(
-            high=last["high"],
-            low=last["low"],
-            close=last["close"],
-            trade_limiter=limiter
-        )
-
-        if pnl_pct is not None and active_signal:
-            exit_price = (
-                active_signal.take_profit if pnl_pct > 0 else active_signal.stop_loss
-            )
-            session.record_trade(
-                TradeRecord(
-                    symbol=symbol,
-                    side=active_signal.side,
-                    entry_price=active_signal.entry_price,
-                    exit_price=exit_price,
-                    pnl_pct=pnl_pct,
-                    reason=active_signal.reason,
-                    timestamp=last["timestamp"]
-                )
-            )
-            active_signal = None
-
-    return session
+    limiter = TradeLimiter(
+        log_resets=False, log_blocks=False,
+        calendar=TradingDayCalendar.for_timestamps(candles["timestamp"]),
+    )
+    return run_strategy_loop(strategy, candles, symbol, limiter=limiter, trade_start=trade_start)
+
+
+def _run_year_job(job: tuple) -> tuple[int, Optional[SessionState]]:
+    """Process-pool entry point: (year, candles, symbol, trade_start) -> session."""
+    year, candles, symbol, trade_start = job
+    if candles.empty:
+        return year, None
+    if trade_start is None:
+        candles = add_indicators(candles.reset_index(drop=True))
+    return year, _run_window(candles, symbol, trade_start)
+
+
+def _year_jobs(
+    raw: pd.DataFrame,
+    with_indicators: pd.DataFrame,
+    symbol: str,
+    windows: list[tuple[int, pd.Timestamp, pd.Timestamp]],
+    carry_warmup: bool,
+) -> Iterator[tuple]:
+    # UTC ns on both sides: Binance candles are tz-naive, the window bounds tz-aware
+    ts_ns = _to_ns_array(raw["timestamp"])
+    for year, year_start, year_end in windows:
+        first = int(np.searchsorted(ts_ns, _to_ns(year_start), side="left"))
+        last = int(np.searchsorted(ts_ns, _to_ns(year_end), side="right"))
+        if carry_warmup and last > first:
+            yield year, with_indicators.iloc[max(0, first - WARMUP_BARS):last], symbol, year_start
+        else:
+            yield year, raw.iloc[first:last].copy(), symbol, None
+
+
+def _print_data_range(candles: pd.DataFrame) -> None:
+    print(
+        f"Data range: {candles['timestamp'].iloc[0].date()} → "
+        f"{candles['timestamp'].iloc[-1].date()} | Rows: {len(candles)}"
+    )
 
 
 def run_multi_window_backtests(
@@ -89,34 +115,55 @@ def run_multi_window_backtests(
     timeframe: str = "1h",
     start: str = "2016-01-01",
     end: str = "2025-12-01",
-) -> None:
+    carry_warmup: bool = False,
+    max_workers: Optional[int] = None,
+) -> dict[int, SessionState]:
     # Reduce noisy per-trade logs for long multi-window runs.
-    log.remove()
-    log.add(lambda msg: print(msg, end=""), level="WARNING")
+    setup_logging("quiet")
+    started = perf_counter()
+
+    raw = load_historical_ohlcv(symbol, timeframe, start, end)
+    if raw.empty:
+        log.warning(f"No data for window {start} → {end}.")
+        return {}
+    raw = raw.sort_values("timestamp").reset_index(drop=True)
+    candles = add_indicators(raw.copy())
+
+    start_year = datetime.fromisoformat(start).year
+    end_year = datetime.fromisoformat(end).year
+    jobs = list(_year_jobs(raw, candles, symbol, year_windows(start_year, end_year, end), carry_warmup))
+
+    # Years run in worker processes while the full range runs here.
+    workers = max_workers or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        yearly = pool.map(_run_year_job, jobs) if pool else map(_run_year_job, jobs)
 
-    print(f"=== Backtest Window: {start} → {end} ===")
-    full_session = _run_window(symbol, timeframe, start, end)
-    if full_session:
+        print(f"=== Backtest Window: {start} → {end} ===")
+        _print_data_range(candles)
+        full_session = _run_window(candles, symbol)
         full_session.print_summary()
         os.makedirs("logs", exist_ok=True)
         output_path = os.path.join("logs", "equity_curve_full.png")
         plot_equity_curve(full_session, save_path=output_path, show=False)
         print(f"Saved equity curve to {output_path}")
 
-    start_year = datetime.fromisoformat(start).year
-    end_year = datetime.fromisoformat(end).year
-
-    for year in range(start_year, end_year + 1):
-        year_start = f"{year}-01-01"
-        year_end = f"{year}-12-31"
-        if year == end_year:
-            year_end = end
-
-        print(f"=== Yearly Backtest: {year_start} → {year_end} ===")
-        session = _run_window(symbol, timeframe, year_start, year_end)
-        if session:
+        sessions = {}
+        for (year, window, _, _), (_, session) in zip(jobs, yearly):
+            print(f"=== Yearly Backtest: {year} ===")
+            if session is None:
+                log.warning(f"No data for {year}.")
+                continue
+            _print_data_range(window)
             print(f"--- Summary for {year} ---")
             session.print_summary()
+            sessions[year] = session
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    print(f"Multi-window run finished in {perf_counter() - started:.1f}s")
+    return sessions
 
 
 if __name__ == "__main__":
@@ -10,6 +10,8 @@ class TradeRecord:
     pnl_pct is expressed as decimal:
         +0.01 = +1%
         -0.005 = -0.5%
+    timestamp is the exit bar, entry_timestamp the bar the entry was
+    decided on (used by analytics breakdowns).
     """
     symbol: str
     side: str
@@ -18,6 +20,7 @@ class TradeRecord:
     pnl_pct: float
     reason: str
     timestamp: pd.Timestamp
+    entry_timestamp: Optional[pd.Timestamp] = None
 
 
 class SessionState:
@@ -63,9 +66,13 @@ class SessionState:
         """
         Max drawdown in session.
         """
-        dd = [ (e - max(self.equity_curve[:i+1])) / max(self.equity_curve[:i+1])
-               for i, e in enumerate(self.equity_curve) ]
-        return min(dd) if dd else 0.0
+        # running peak: O(n) instead of re-scanning the curve prefix per point
+        worst = 0.0
+        peak = self.equity_curve[0]
+        for e in self.equity_curve:
+            peak = max(peak, e)
+            worst = min(worst, (e - peak) / peak)
+        return worst
 
     # ---------------------------
     # Stats & Results
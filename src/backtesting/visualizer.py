@@ -1,6 +1,10 @@
 from typing import Iterable, Optional
 
-import matplotlib.pyplot as plt
+
+def _pyplot():
+    """matplotlib is only imported when a plot is drawn (it dominates import time)."""
+    import matplotlib.pyplot as plt
+    return plt
 
 
 def _series_or_index(values: Iterable[float], timestamps: Optional[Iterable] = None):
@@ -23,6 +27,7 @@ def plot_equity_curve(session, save_path: Optional[str] = None, show: bool = Tru
         return
 
     x, y = _series_or_index(equity, timestamps if timestamps else None)
+    plt = _pyplot()
     plt.figure(figsize=(10, 4))
     plt.plot(x, y, label="Equity")
     plt.title("Equity Curve")
@@ -45,13 +50,12 @@ def plot_drawdowns(session) -> None:
     if not session.equity_curve:
         return
 
-    drawdowns = []
-    peak = session.equity_curve[0]
-    for equity in session.equity_curve:
-        peak = max(peak, equity)
-        drawdowns.append((equity - peak) / peak)
+    from backtesting.analytics import drawdown_series
+
+    drawdowns = drawdown_series(session.equity_curve)
 
     x, y = _series_or_index(drawdowns, session.timestamps if session.timestamps else None)
+    plt = _pyplot()
     plt.figure(figsize=(10, 3))
     plt.plot(x, y, color="red", label="Drawdown")
     plt.title("Drawdowns")
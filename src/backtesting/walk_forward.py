@@ -0,0 +1,286 @@
+"""
+Walk-forward optimization.
+
+The history is cut into folds. Each fold has an in-sample (train) window
+and the out-of-sample (test) window right after it:
+
+    rolling:  [train ][test]
+                    [train ][test]
+                          [train ][test]
+    anchored: [train ][test]
+              [train      ][test]
+              [train            ][test]
+
+For each fold, the parameters are searched on the train window
+(param_search.search, with the same budget, sampler and objective per
+fold). The best set is then run once on the test window. Only test-window
+trades count toward the walk-forward result. They are chained into a
+single session, whose summary is the estimate we trust.
+
+Indicators are computed once on the full history (prepare_candles) and
+every fold slices that frame. They are causal: a bar's value depends
+only on earlier bars, so slicing leaks nothing from the future and no
+slice needs its own indicator warm-up. Folds run in parallel on a process
+pool whose initializer ships the prepared frame to each worker once.
+Inside a fold the search runs serially.
+
+    python src/backtesting/walk_forward.py --train-months 24 --test-months 6 --budget 60
+
+Per-fold result caches are opt-in (--cache-dir). Their keys cover the
+train candles, parameters, limiter caps, fee and param_search's
+RESULT_VERSION; delete the directory to force fresh backtests.
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from backtesting.engine import default_limiter, run_strategy_loop
+from backtesting.param_search import (
+    SEARCH_SPACES,
+    WINDOW_WARMUP,
+    ResultCache,
+    SearchSpace,
+    prepare_candles,
+    search,
+    strategy_frame,
+)
+from backtesting.session_state import SessionState
+from data.historical_data import load_historical_ohlcv
+from utils.config import Config
+from utils.logger import setup_logging
+
+
+@dataclass(frozen=True)
+class Fold:
+    index: int
+    train_start: pd.Timestamp
+    train_end: pd.Timestamp      # exclusive
+    test_start: pd.Timestamp
+    test_end: pd.Timestamp       # exclusive
+
+
+@dataclass
+class FoldResult:
+    fold: Fold
+    params: dict
+    train_score: float
+    test_session: SessionState
+    evaluations: int
+    seconds: float
+
+
+def _utc(value) -> pd.Timestamp:
+    ts = pd.Timestamp(value)
+    return ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+
+
+def make_folds(
+    start,
+    end,
+    train_months: int = 24,
+    test_months: int = 6,
+    step_months: Optional[int] = None,
+    anchored: bool = False,
+) -> List[Fold]:
+    """
+    Folds whose test windows tile [start + train, end) in steps of
+    step_months (default test_months); the last test window is cut at end.
+    Anchored folds all train from start; rolling ones keep train_months.
+    """
+    start, end = _utc(start), _utc(end)
+    step = pd.DateOffset(months=step_months or test_months)
+    train = pd.DateOffset(months=train_months)
+    test = pd.DateOffset(months=test_months)
+
+    folds = []
+    test_start = start + train
+    while test_start < end:
+        folds.append(Fold(
+            index=len(folds),
+            train_start=start if anchored else test_start - train,
+            train_end=test_start,
+            test_start=test_start,
+            test_end=min(test_start + test, end),
+        ))
+        test_start = test_start + step
+    return folds
+
+
+def _slice(candles: pd.DataFrame, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+    timestamps = candles["timestamp"]
+    lo, hi = timestamps.searchsorted(start, side="left"), timestamps.searchsorted(end, side="left")
+    return candles.iloc[lo:hi]
+
+
+def run_fold(
+    fold: Fold,
+    candles: pd.DataFrame,
+    space: SearchSpace,
+    symbol: str = Config.LIVE_SYMBOL,
+    cache: Optional[ResultCache] = None,
+    **search_kwargs,
+) -> FoldResult:
+    """Search on the fold's train window (of prepared candles), then test the winner out of sample."""
+    started = perf_counter()
+    train = _slice(candles, fold.train_start, fold.train_end)
+    result = search(train, space, symbol=symbol, workers=1, cache=cache, prepared=True, **search_kwargs)
+
+    # bars before test_start only warm up the engine; indicators are already there
+    test = _slice(candles, fold.test_start - WINDOW_WARMUP, fold.test_end)
+    strategy = space.build(result.best, symbol)
+    test = strategy_frame(test, strategy)
+    session = run_strategy_loop(strategy, test, symbol, limiter=default_limiter(test), trade_start=fold.test_start)
+    train_score = float(result.trials["score"].iloc[0]) if not result.trials.empty else float("-inf")
+    return FoldResult(fold, result.best, train_score, session, result.evaluations, perf_counter() - started)
+
+
+# Set once per worker process by the pool initializer (see batch_backtest).
+_worker_state: Optional[dict] = None
+
+
+def _init_worker(state: dict, configure_logging: bool = True) -> None:
+    global _worker_state
+    _worker_state = state
+    if configure_logging:
+        setup_logging("quiet")
+
+
+def _run_fold_job(fold: Fold) -> FoldResult:
+    state = _worker_state
+    cache = None
+    if state["cache_dir"] is not None:
+        cache = ResultCache(Path(state["cache_dir"]) / f"{state['space'].name}_fold{fold.index}.jsonl")
+    return run_fold(fold, state["candles"], state["space"], state["symbol"], cache=cache, **state["search"])
+
+
+@dataclass
+class WalkForwardResult:
+    folds: List[FoldResult]
+    session: SessionState           # all out-of-sample trades, in order
+    seconds: float
+
+    def table(self) -> pd.DataFrame:
+        rows = []
+        for item in self.folds:
+            summary = item.test_session.summary()
+            rows.append({
+                "fold": item.fold.index,
+                "train_start": item.fold.train_start,
+                "test_start": item.fold.test_start,
+                "test_end": item.fold.test_end,
+                "train_score": item.train_score,
+                "test_return": summary["return_pct"],
+                "test_trades": summary["total_trades"],
+                "test_max_drawdown": summary["max_drawdown_pct"],
+                "evaluations": item.evaluations,
+                "seconds": item.seconds,
+                **item.params,
+            })
+        return pd.DataFrame(rows)
+
+    def summary(self) -> Dict:
+        return self.session.summary()
+
+
+def walk_forward(
+    candles: pd.DataFrame,
+    space: SearchSpace,
+    folds: Iterable[Fold],
+    symbol: str = Config.LIVE_SYMBOL,
+    workers: Optional[int] = None,
+    cache_dir: Optional[Path] = None,
+    prepared: bool = False,
+    **search_kwargs,
+) -> WalkForwardResult:
+    """
+    Run every fold (in parallel across `workers` processes) and chain the
+    out-of-sample trades. search_kwargs go to param_search.search per fold
+    (sampler, budget, objective, min_trades, seed). With cache_dir each
+    fold keeps its own result cache there, so a re-run is nearly free.
+    """
+    folds = list(folds)
+    started = perf_counter()
+    if not prepared:
+        candles = prepare_candles(candles, space)
+    state = {
+        "candles": candles, "space": space, "symbol": symbol,
+        "cache_dir": str(cache_dir) if cache_dir is not None else None, "search": search_kwargs,
+    }
+    workers = min(workers or os.cpu_count() or 1, len(folds)) if folds else 1
+    if workers <= 1:
+        _init_worker(state, configure_logging=False)
+        results = [_run_fold_job(fold) for fold in folds]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(state,)) as pool:
+            results = list(pool.map(_run_fold_job, folds))
+
+    session = SessionState()
+    for item in results:
+        for trade in item.test_session.trades:
+            session.record_trade(trade)
+    return WalkForwardResult(results, session, perf_counter() - started)
+
+
+def run_walk_forward(
+    start: str = "2016-01-01",
+    end: str = "2025-12-01",
+    space_name: str = "mean_reversion",
+    train_months: int = 24,
+    test_months: int = 6,
+    anchored: bool = False,
+    workers: Optional[int] = None,
+    cache_dir: Optional[Path] = None,
+    **search_kwargs,
+) -> WalkForwardResult:
+    """Walk-forward on local BTC/USD 1h history (folds start where the data does)."""
+    setup_logging("quiet")
+
+    candles = load_historical_ohlcv("BTC/USD", "1h", start, end)
+    if candles.empty:
+        raise RuntimeError("Local BTC/USD data not found for walk-forward.")
+
+    first = candles["timestamp"].iloc[0].normalize()
+    folds = make_folds(first, end, train_months, test_months, anchored=anchored)
+    return walk_forward(
+        candles, SEARCH_SPACES[space_name], folds, workers=workers, cache_dir=cache_dir, **search_kwargs,
+    )
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Walk-forward optimization with anchored or rolling folds.")
+    parser.add_argument("--space", default="mean_reversion", choices=sorted(SEARCH_SPACES))
+    parser.add_argument("--start", default="2016-01-01")
+    parser.add_argument("--end", default="2025-12-01")
+    parser.add_argument("--train-months", type=int, default=24)
+    parser.add_argument("--test-months", type=int, default=6)
+    parser.add_argument("--anchored", action="store_true")
+    parser.add_argument("--sampler", default="tpe")
+    parser.add_argument("--budget", type=int, default=60, help="backtests per fold")
+    parser.add_argument("--min-trades", type=int, default=30)
+    parser.add_argument("--workers", type=int, default=None, help="parallel folds (default: all CPUs)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache-dir", type=Path, default=None,
+                        help="reuse per-fold search results from this directory (delete it to invalidate)")
+    args = parser.parse_args(argv)
+
+    result = run_walk_forward(
+        args.start, args.end, space_name=args.space, train_months=args.train_months,
+        test_months=args.test_months, anchored=args.anchored, workers=args.workers, cache_dir=args.cache_dir,
+        sampler=args.sampler, budget=args.budget, min_trades=args.min_trades, seed=args.seed,
+    )
+    columns = ["fold", "test_start", "train_score", "test_return", "test_trades", "test_max_drawdown"]
+    print("\n=== Walk-forward folds ===")
+    print(result.table()[columns].to_string(index=False))
+    print(f"\nFolds finished in {result.seconds:.0f}s")
+    result.session.print_summary()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,3 @@
-import ccxt
 import pandas as pd
 from pathlib import Path
 from utils.logger import log
@@ -63,6 +62,8 @@ def load_historical_ohlcv(
             log.info(f"Loaded {len(local_df)} local Bitstamp BTC/USD candles.")
         return local_df
 
+    import ccxt
+
     exchange = ccxt.binanceusdm({
         "enableRateLimit": True,
         "options": {"defaultType": "future"}  # USDⓈ-M futures
@@ -1,11 +1,16 @@
-import ccxt
+from typing import Optional
+
 import pandas as pd
+
 from utils.logger import log
 from utils.config import Config
+from utils.metrics import ERRORS, EXCHANGE_SECONDS, record_exchange_weight
 
 
-def _init_client():
+def create_client():
     """Initialize the CCXT Binance USDⓈ-M futures client (USDC perpetual)."""
+    import ccxt
+
     if not Config.BINANCE_API_KEY or not Config.BINANCE_API_SECRET:
         log.warning("Binance API keys not set — reading public market data only.")
 
@@ -17,22 +22,35 @@ def _init_client():
     })
 
 
-client = _init_client()
+_client = None
+
+
+def get_client():
+    """Shared module-level client, created on first use."""
+    global _client
+    if _client is None:
+        _client = create_client()
+    return _client
 
 
-def fetch_ohlcv(symbol: str, timeframe: str = "1h", limit: int = 200) -> pd.DataFrame:
+def fetch_ohlcv(symbol: str, timeframe: str = "1h", limit: int = 200, exchange=None) -> pd.DataFrame:
     """
     Fetch USDⓈ-M futures OHLCV candles and return as pandas DataFrame.
 
     Columns: timestamp, open, high, low, close, volume
+    exchange defaults to the shared client from get_client().
     """
     log.info(f"Fetching {limit} {timeframe} futures candles for {symbol}...")
 
+    exchange = exchange or get_client()
     try:
-        data = client.fetch_ohlcv(symbol, timeframe=timeframe, limit=limit)
+        with EXCHANGE_SECONDS.time(call="fetch_ohlcv"):
+            data = exchange.fetch_ohlcv(symbol, timeframe=timeframe, limit=limit)
     except Exception as e:
+        ERRORS.inc(call="fetch_ohlcv")
         log.error(f"Error fetching candles: {e}")
         return pd.DataFrame()
+    record_exchange_weight(exchange)
 
     df = pd.DataFrame(data, columns=["timestamp", "open", "high", "low", "close", "volume"])
     df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
@@ -41,18 +59,38 @@ def fetch_ohlcv(symbol: str, timeframe: str = "1h", limit: int = 200) -> pd.Data
     return df
 
 
+def fetch_mark_price(symbol: str, exchange=None) -> Optional[float]:
+    """Last traded price from the ticker, or None if the call fails."""
+    exchange = exchange or get_client()
+    try:
+        with EXCHANGE_SECONDS.time(call="fetch_ticker"):
+            ticker = exchange.fetch_ticker(symbol)
+    except Exception as e:
+        ERRORS.inc(call="fetch_ticker")
+        log.error(f"Error fetching ticker: {e}")
+        return None
+    record_exchange_weight(exchange)
+    price = ticker.get("last") or ticker.get("close")
+    return float(price) if price else None
+
+
 class MarketData:
     """
     Simple wrapper for live futures market data.
+    Pass a shared ccxt client to reuse one connection across symbols.
     """
 
-    def __init__(self, symbol: str, timeframe: str = "1h", limit: int = 200):
+    def __init__(self, symbol: str, timeframe: str = "1h", limit: int = 200, client=None):
         self.symbol = symbol
         self.timeframe = timeframe
         self.limit = limit
+        self.client = client
 
     def fetch_ohlcv(self) -> pd.DataFrame:
-        return fetch_ohlcv(self.symbol, self.timeframe, self.limit)
+        return fetch_ohlcv(self.symbol, self.timeframe, self.limit, exchange=self.client)
+
+    def fetch_mark_price(self) -> Optional[float]:
+        return fetch_mark_price(self.symbol, exchange=self.client)
 
 
 if __name__ == "__main__":
@@ -4,10 +4,9 @@ from dataclasses import dataclass
 from typing import Optional
 import math
 
-import ccxt
-
 from utils.config import Config
 from utils.logger import log
+from utils.metrics import ERRORS, EXCHANGE_SECONDS, ORDERS, STAGE_SECONDS, record_exchange_weight
 
 
 @dataclass
@@ -23,22 +22,30 @@ class LiveBroker:
     """
     Live execution for Binance USDⓈ-M futures (USDC perpetuals).
     Places market entries and protective stop/take-profit orders.
+
+    Pass a shared ccxt client to run several symbols over one connection;
+    markets are loaded once per client and reused. An injected client is
+    trusted as-is (e.g. execution.sim_exchange for paper live mode).
     """
 
-    def __init__(self, symbol: str, leverage: int, risk_per_trade: float):
-        if not Config.BINANCE_API_KEY or not Config.BINANCE_API_SECRET:
+    def __init__(self, symbol: str, leverage: int, risk_per_trade: float, client=None):
+        if client is None and (not Config.BINANCE_API_KEY or not Config.BINANCE_API_SECRET):
             raise ValueError("Binance API keys are required for live trading.")
 
         self.symbol = symbol
         self.leverage = leverage
         self.risk_per_trade = risk_per_trade
-        self.client = ccxt.binanceusdm({
-            "apiKey": Config.BINANCE_API_KEY,
-            "secret": Config.BINANCE_API_SECRET,
-            "enableRateLimit": True,
-            "options": {"defaultType": "future"},
-        })
-        self.client.load_markets()
+        if client is None:
+            import ccxt
+
+            client = ccxt.binanceusdm({
+                "apiKey": Config.BINANCE_API_KEY,
+                "secret": Config.BINANCE_API_SECRET,
+                "enableRateLimit": True,
+                "options": {"defaultType": "future"},
+            })
+        self.client = client
+        self.client.load_markets()  # cached on the client after the first call
         self._position: Optional[LivePosition] = None
         self._min_amount = max(self._load_min_amount(), Config.MIN_ORDER_QTY)
         self._amount_step = self._load_amount_step()
@@ -53,10 +60,13 @@ class LiveBroker:
 
     def _fetch_position(self) -> Optional[dict]:
         try:
-            positions = self.client.fetch_positions([self.symbol])
+            with EXCHANGE_SECONDS.time(call="fetch_positions"):
+                positions = self.client.fetch_positions([self.symbol])
         except Exception as exc:
+            ERRORS.inc(call="fetch_positions")
             log.warning(f"Failed to fetch positions: {exc}")
             return None
+        record_exchange_weight(self.client)
 
         symbol_id = self.symbol.replace("/", "")
         for pos in positions:
@@ -82,8 +92,10 @@ class LiveBroker:
 
     def _get_equity(self) -> Optional[float]:
         try:
-            balance = self.client.fetch_balance()
+            with EXCHANGE_SECONDS.time(call="fetch_balance"):
+                balance = self.client.fetch_balance()
         except Exception as exc:
+            ERRORS.inc(call="fetch_balance")
             log.warning(f"Failed to fetch balance: {exc}")
             return None
 
@@ -212,15 +224,30 @@ class LiveBroker:
     def _side_to_order(side: str) -> str:
         return "buy" if side == "LONG" else "sell"
 
+    def _create_order(self, order_type: str, side: str, amount: float, params: Optional[dict] = None):
+        try:
+            with EXCHANGE_SECONDS.time(call="create_order"):
+                if params is None:
+                    order = self.client.create_order(self.symbol, order_type, side, amount)
+                else:
+                    order = self.client.create_order(self.symbol, order_type, side, amount, None, params)
+        except Exception:
+            ERRORS.inc(call="create_order")
+            raise
+        ORDERS.inc(symbol=self.symbol, type=order_type)
+        record_exchange_weight(self.client)
+        return order
+
     def open_position(self, side: str, entry_price: float, stop_loss: float, take_profit: float) -> bool:
-        amount = self._compute_order_size(entry_price, stop_loss)
+        with STAGE_SECONDS.time(stage="compute_order_size", symbol=self.symbol):
+            amount = self._compute_order_size(entry_price, stop_loss)
         if amount is None:
             log.warning("Position size could not be calculated — skipping trade.")
             return False
 
         order_side = self._side_to_order(side)
         try:
-            self.client.create_order(self.symbol, "market", order_side, amount)
+            self._create_order("market", order_side, amount)
             log.info(
                 f"Opened {side} {self.symbol} size={amount} entry={entry_price:.2f}"
             )
@@ -230,20 +257,16 @@ class LiveBroker:
 
         try:
             exit_side = "sell" if order_side == "buy" else "buy"
-            self.client.create_order(
-                self.symbol,
+            self._create_order(
                 "STOP_MARKET",
                 exit_side,
                 amount,
-                None,
                 {"stopPrice": stop_loss, "reduceOnly": True},
             )
-            self.client.create_order(
-                self.symbol,
+            self._create_order(
                 "TAKE_PROFIT_MARKET",
                 exit_side,
                 amount,
-                None,
                 {"stopPrice": take_profit, "reduceOnly": True},
             )
         except Exception as exc:
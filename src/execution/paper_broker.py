@@ -1,6 +1,10 @@
 from dataclasses import dataclass
 from typing import Optional
-from utils.logger import log
+
+import numpy as np
+
+from utils.jit import JIT_ENABLED, njit
+from utils.logger import enabled, log, trace_event
 
 
 @dataclass
@@ -12,6 +16,46 @@ class Position:
     take_profit: float
 
 
+@njit
+def _first_exit_loop(is_long, stop_loss, take_profit, high, low, start):
+    for i in range(start, len(high)):
+        if is_long:
+            if low[i] <= stop_loss or high[i] >= take_profit:
+                return i
+        elif high[i] >= stop_loss or low[i] <= take_profit:
+            return i
+    return -1
+
+
+def _first_exit_numpy(is_long, stop_loss, take_profit, high, low, start, chunk=64):
+    # positions usually close within a few dozen bars: scan growing chunks
+    n = len(high)
+    i = start
+    while i < n:
+        end = min(n, i + chunk)
+        h = high[i:end]
+        lo = low[i:end]
+        if is_long:
+            hit = (lo <= stop_loss) | (h >= take_profit)
+        else:
+            hit = (h >= stop_loss) | (lo <= take_profit)
+        k = int(hit.argmax())
+        if hit[k]:
+            return i + k
+        i = end
+        chunk *= 2
+    return -1
+
+
+def first_exit_bar(position: Position, high: np.ndarray, low: np.ndarray, start: int) -> int:
+    """
+    Index of the first bar >= start on which check_and_close() would close
+    `position` (stop or take-profit touched), or -1 if none.
+    """
+    scan = _first_exit_loop if JIT_ENABLED else _first_exit_numpy
+    return scan(position.side == "LONG", position.stop_loss, position.take_profit, high, low, start)
+
+
 class PaperBroker:
     """
     Simulates trade execution without live orders.
@@ -37,6 +81,10 @@ class PaperBroker:
     def has_open_position(self) -> bool:
         return self.position is not None
 
+    def find_exit(self, high: np.ndarray, low: np.ndarray, start: int) -> int:
+        """First bar index >= start that closes the open position, or -1."""
+        return first_exit_bar(self.position, high, low, start)
+
     def open_position(self, symbol: str, side: str, entry: float,
                       stop_loss: float, take_profit: float) -> bool:
         if self.position:
@@ -50,10 +98,12 @@ class PaperBroker:
             stop_loss=stop_loss,
             take_profit=take_profit
         )
-        log.info(
-            f"Opened {side} position on {symbol} @ {entry} | "
-            f"SL={stop_loss}, TP={take_profit}"
-        )
+        if enabled("INFO"):
+            log.info(
+                f"Opened {side} position on {symbol} @ {entry} | "
+                f"SL={stop_loss}, TP={take_profit}"
+            )
+        trace_event("open", symbol=symbol, side=side, price=entry, stop_loss=stop_loss, take_profit=take_profit)
         return True
 
     # --------------------
@@ -77,6 +127,8 @@ class PaperBroker:
 
         pos = self.position
         pnl_pct = None
+        exit_kind = None
+        exit_price = None
 
         fee_total = self.fee_rate * 2
 
@@ -86,13 +138,13 @@ class PaperBroker:
             if low <= pos.stop_loss:
                 pnl_pct = (pos.stop_loss - pos.entry_price) / pos.entry_price
                 pnl_pct -= fee_total
-                log.info(f"LONG stopped out @ {pos.stop_loss} | PnL={pnl_pct:.2%}")
+                exit_kind, exit_price = "stop", pos.stop_loss
 
             # TP triggered if high touches it
             elif high >= pos.take_profit:
                 pnl_pct = (pos.take_profit - pos.entry_price) / pos.entry_price
                 pnl_pct -= fee_total
-                log.info(f"LONG take-profit hit @ {pos.take_profit} | PnL={pnl_pct:.2%}")
+                exit_kind, exit_price = "take_profit", pos.take_profit
 
         # ---- SHORT exit ----
         elif pos.side == "SHORT":
@@ -100,13 +152,13 @@ class PaperBroker:
             if high >= pos.stop_loss:
                 pnl_pct = (pos.entry_price - pos.stop_loss) / pos.entry_price
                 pnl_pct -= fee_total
-                log.info(f"SHORT stopped out @ {pos.stop_loss} | PnL={pnl_pct:.2%}")
+                exit_kind, exit_price = "stop", pos.stop_loss
 
             # TP triggered if low touches it
             elif low <= pos.take_profit:
                 pnl_pct = (pos.entry_price - pos.take_profit) / pos.entry_price
                 pnl_pct -= fee_total
-                log.info(f"SHORT take-profit hit @ {pos.take_profit} | PnL={pnl_pct:.2%}")
+                exit_kind, exit_price = "take_profit", pos.take_profit
 
         # ---- If no exit condition met ----
         if pnl_pct is None:
@@ -114,6 +166,10 @@ class PaperBroker:
 
         # ---- Record closure ----
         self.position = None
+        if enabled("INFO"):
+            label = "stopped out" if exit_kind == "stop" else "take-profit hit"
+            log.info(f"{pos.side} {label} @ {exit_price} | PnL={pnl_pct:.2%}")
+        trace_event("close", symbol=pos.symbol, side=pos.side, price=exit_price, exit=exit_kind, pnl_pct=pnl_pct)
 
         # report to trade limiter if available
         if trade_limiter:
@@ -0,0 +1,453 @@
+from __future__ import annotations
+
+import functools
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from live.scheduler import timeframe_to_seconds
+from utils.logger import log
+
+
+def _ccxt():
+    """ccxt is only imported to raise its error types (it dominates import time)."""
+    import ccxt
+    return ccxt
+
+
+def _exchange_call(method):
+    """
+    Apply injected latency/failures, then run the call under the book lock
+    (the multi-symbol runner calls from several threads).
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._call(method.__name__)
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+@dataclass
+class SimOrder:
+    id: str
+    symbol: str
+    type: str
+    side: str
+    amount: float
+    stop_price: Optional[float]
+    placed_at: float
+    active_from: int          # open time (s) of the first candle that can trigger it
+    status: str = "open"
+
+
+@dataclass
+class SimPosition:
+    amount: float = 0.0       # signed: > 0 long, < 0 short
+    entry_price: float = 0.0
+
+
+@dataclass
+class _SymbolBook:
+    ts: np.ndarray            # candle open times, epoch seconds
+    ohlcv: np.ndarray         # (n, 5) open, high, low, close, volume
+    position: SimPosition = field(default_factory=SimPosition)
+    orders: List[SimOrder] = field(default_factory=list)
+    next_candle: int = 0      # first candle not yet checked for SL/TP
+
+
+class SimulatedExchange:
+    """
+    In-process stand-in for the ccxt binanceusdm client (paper live mode).
+
+    Speaks the subset used by MarketData and LiveBroker:
+        load_markets, market, set_leverage, amount_to_precision,
+        fetch_ohlcv, fetch_ticker, fetch_positions, fetch_balance,
+        create_order (market, STOP_MARKET, TAKE_PROFIT_MARKET)
+
+    Stored candles are replayed on a simulated clock:
+        speed=None  -> virtual clock: sleep() returns immediately and
+                       advances the clock, compute time still counts
+        speed=N     -> N simulated seconds per wall second
+
+    Use exchange.time / exchange.sleep as the scheduler clock so the
+    live loop follows the replay.
+    Every call can be delayed (latency_seconds +/- latency_jitter) and can
+    fail with ccxt.NetworkError at failure_rate.
+    """
+
+    def __init__(
+        self,
+        candles: Dict[str, pd.DataFrame],
+        timeframe: str = "1h",
+        start: Optional[pd.Timestamp] = None,
+        warmup_candles: int = 200,
+        speed: Optional[float] = None,
+        latency_seconds: float = 0.0,
+        latency_jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        fee_rate: float = 0.0005,
+        initial_balance: float = 10_000.0,
+        quote: str = "USDC",
+        min_amount: float = 0.001,
+        amount_precision: int = 3,
+        seed: Optional[int] = None,
+    ):
+        self.timeframe = timeframe
+        self.timeframe_seconds = timeframe_to_seconds(timeframe)
+        self.speed = speed
+        self.latency_seconds = latency_seconds
+        self.latency_jitter = latency_jitter
+        self.failure_rate = failure_rate
+        self.fee_rate = fee_rate
+        self.quote = quote
+        self.balance = initial_balance
+        self.min_amount = min_amount
+        self.amount_precision = amount_precision
+        self._rng = random.Random(seed)
+        self._lock = threading.RLock()
+
+        self._books: Dict[str, _SymbolBook] = {}
+        for symbol, df in candles.items():
+            ts = pd.to_datetime(df["timestamp"], utc=True).astype("int64") // 1_000_000_000
+            self._books[symbol] = _SymbolBook(
+                ts=ts.to_numpy(dtype=np.int64),
+                ohlcv=df[["open", "high", "low", "close", "volume"]].to_numpy(dtype=float),
+            )
+        if not self._books:
+            raise ValueError("SimulatedExchange needs candles for at least one symbol.")
+
+        first_ts = max(int(book.ts[min(warmup_candles, len(book.ts) - 1)]) for book in self._books.values())
+        self.end_ts = min(int(book.ts[-1]) for book in self._books.values()) + self.timeframe_seconds
+        if start is not None:
+            start = pd.Timestamp(start)
+            if start.tzinfo is None:
+                start = start.tz_localize("UTC")
+            first_ts = int(start.timestamp())
+        # Start just after a close so the first scheduled decision is one candle away.
+        self.start_ts = float(first_ts) + 1.0
+
+        self._wall_start = time.perf_counter()
+        self._skipped = 0.0
+        self._order_seq = 0
+        self.markets: Optional[dict] = None
+        self.last_response_headers: dict = {}
+        self.call_counts: Dict[str, int] = {}
+        self.failures = 0
+        self.fills: List[dict] = []
+        self.decision_latencies: List[float] = []
+
+    @classmethod
+    def from_csv(cls, path: Path, symbols: Iterable[str] = ("BTC/USDC",), **kwargs) -> "SimulatedExchange":
+        """
+        Load a cached candle CSV (timestamp, open, high, low, close, volume).
+        Every symbol replays the same candles, which is enough for
+        latency and throughput runs over many symbols.
+        """
+        df = pd.read_csv(path)
+        return cls({symbol: df for symbol in symbols}, **kwargs)
+
+    # --------------------
+    # Clock
+    # --------------------
+
+    def time(self) -> float:
+        """Current simulated epoch time in seconds."""
+        elapsed = time.perf_counter() - self._wall_start
+        if self.speed is None:
+            return self.start_ts + elapsed + self._skipped
+        return self.start_ts + elapsed * self.speed
+
+    def sleep(self, seconds: float) -> None:
+        if seconds <= 0:
+            return
+        if self.speed is None:
+            with self._lock:
+                self._skipped += seconds
+        else:
+            time.sleep(seconds / self.speed)
+
+    def finished(self) -> bool:
+        return self.time() >= self.end_ts
+
+    def remaining_closes(self) -> int:
+        """Candle closes left in the replay, i.e. closes in (now, end]."""
+        tf = self.timeframe_seconds
+        return max(int(self.end_ts // tf - self.time() // tf), 0)
+
+    def _to_wall_seconds(self, sim_seconds: float) -> float:
+        return sim_seconds if self.speed is None else sim_seconds / self.speed
+
+    # --------------------
+    # Latency / failures
+    # --------------------
+
+    def _call(self, name: str) -> None:
+        with self._lock:
+            self.call_counts[name] = self.call_counts.get(name, 0) + 1
+        delay = self.latency_seconds
+        if self.latency_jitter:
+            delay += self._rng.uniform(-self.latency_jitter, self.latency_jitter)
+        if delay > 0:
+            self.sleep(delay)
+        if self.failure_rate and self._rng.random() < self.failure_rate:
+            with self._lock:
+                self.failures += 1
+            raise _ccxt().NetworkError(f"Simulated {name} failure")
+
+    def _book(self, symbol: str) -> _SymbolBook:
+        try:
+            return self._books[symbol]
+        except KeyError:
+            raise _ccxt().BadSymbol(f"Unknown symbol {symbol}")
+
+    # --------------------
+    # Market metadata
+    # --------------------
+
+    def load_markets(self, reload: bool = False, params: dict = None) -> dict:
+        if self.markets is None or reload:
+            self._call("load_markets")
+            markets = {
+                symbol: {
+                    "symbol": symbol,
+                    "id": symbol.replace("/", ""),
+                    "precision": {"amount": self.amount_precision},
+                    "limits": {"amount": {"min": self.min_amount}},
+                }
+                for symbol in self._books
+            }
+            with self._lock:
+                self.markets = markets
+        return self.markets
+
+    def market(self, symbol: str) -> dict:
+        return self.load_markets()[symbol]
+
+    @_exchange_call
+    def set_leverage(self, leverage: int, symbol: str = None, params: dict = None) -> dict:
+        return {"symbol": symbol, "leverage": leverage}
+
+    def amount_to_precision(self, symbol: str, amount: float) -> str:
+        step = 10 ** -self.amount_precision
+        return f"{int(amount / step) * step:.{self.amount_precision}f}"
+
+    # --------------------
+    # Market data
+    # --------------------
+
+    def _visible(self, book: _SymbolBook, now: float) -> int:
+        """Number of candles whose open time is <= now (last one may be forming)."""
+        return int(np.searchsorted(book.ts, now, side="right"))
+
+    @_exchange_call
+    def fetch_ohlcv(self, symbol: str, timeframe: str = None, since: int = None,
+                    limit: int = None, params: dict = None) -> list:
+        book = self._book(symbol)
+        now = self.time()
+        end = self._visible(book, now)
+        start = 0 if limit is None else max(end - limit, 0)
+        rows = book.ohlcv[start:end].tolist()
+        ts = book.ts[start:end]
+        out = [[int(t) * 1000, *row] for t, row in zip(ts, rows)]
+        if out and ts[-1] + self.timeframe_seconds > now:
+            # Still-forming candle: only its open is known.
+            open_price = out[-1][1]
+            out[-1] = [out[-1][0], open_price, open_price, open_price, open_price, 0.0]
+        if since is not None:
+            out = [row for row in out if row[0] >= since]
+        return out
+
+    def _mark_price(self, book: _SymbolBook, now: float) -> float:
+        end = self._visible(book, now)
+        if end == 0:
+            return float(book.ohlcv[0, 0])
+        if book.ts[end - 1] + self.timeframe_seconds > now:
+            return float(book.ohlcv[end - 1, 0])
+        return float(book.ohlcv[end - 1, 3])
+
+    @_exchange_call
+    def fetch_ticker(self, symbol: str, params: dict = None) -> dict:
+        book = self._book(symbol)
+        now = self.time()
+        price = self._mark_price(book, now)
+        return {"symbol": symbol, "timestamp": int(now * 1000), "last": price, "close": price}
+
+    # --------------------
+    # Account
+    # --------------------
+
+    @_exchange_call
+    def fetch_balance(self, params: dict = None) -> dict:
+        self._process_all()
+        return {
+            "total": {self.quote: self.balance},
+            "free": {self.quote: self.balance},
+            self.quote: {"total": self.balance, "free": self.balance},
+        }
+
+    @_exchange_call
+    def fetch_positions(self, symbols: List[str] = None, params: dict = None) -> list:
+        self._process_all()
+        out = []
+        for symbol in symbols or list(self._books):
+            pos = self._book(symbol).position
+            out.append({
+                "symbol": symbol,
+                "contracts": abs(pos.amount),
+                "side": "long" if pos.amount > 0 else "short" if pos.amount < 0 else None,
+                "entryPrice": pos.entry_price,
+                "info": {"symbol": symbol.replace("/", ""), "positionAmt": str(pos.amount)},
+            })
+        return out
+
+    # --------------------
+    # Orders
+    # --------------------
+
+    @_exchange_call
+    def create_order(self, symbol: str, type: str, side: str, amount: float,
+                     price: float = None, params: dict = None) -> dict:
+        params = params or {}
+        book = self._book(symbol)
+        now = self.time()
+        self._process(book, now)
+        self._order_seq += 1
+        order_type = type.upper()
+        current = self._visible(book, now) - 1
+        order = SimOrder(
+            id=str(self._order_seq),
+            symbol=symbol,
+            type=order_type,
+            side=side,
+            amount=float(amount),
+            stop_price=params.get("stopPrice"),
+            placed_at=now,
+            active_from=int(book.ts[max(current, 0)]),
+        )
+
+        if order_type == "MARKET":
+            fill_price = self._mark_price(book, now)
+            self._fill(book, order, fill_price, now)
+            last_close = (now // self.timeframe_seconds) * self.timeframe_seconds
+            self.decision_latencies.append(self._to_wall_seconds(now - last_close))
+        elif order_type in ("STOP_MARKET", "TAKE_PROFIT_MARKET"):
+            if order.stop_price is None:
+                raise _ccxt().InvalidOrder(f"{order_type} requires params['stopPrice']")
+            book.orders.append(order)
+        else:
+            raise _ccxt().InvalidOrder(f"Unsupported order type {type}")
+
+        return {
+            "id": order.id,
+            "symbol": symbol,
+            "type": type,
+            "side": side,
+            "amount": order.amount,
+            "status": order.status,
+            "timestamp": int(now * 1000),
+        }
+
+    def _fill(self, book: _SymbolBook, order: SimOrder, price: float, now: float) -> None:
+        pos = book.position
+        signed = order.amount if order.side == "buy" else -order.amount
+        realized = 0.0
+        if pos.amount and np.sign(signed) != np.sign(pos.amount):
+            closed = min(abs(signed), abs(pos.amount))
+            realized = closed * (price - pos.entry_price) * np.sign(pos.amount)
+        new_amount = round(pos.amount + signed, 12)
+        if pos.amount == 0 or np.sign(new_amount) != np.sign(pos.amount):
+            pos.entry_price = price if new_amount else 0.0
+        elif np.sign(signed) == np.sign(pos.amount):
+            pos.entry_price = (pos.entry_price * abs(pos.amount) + price * abs(signed)) / abs(new_amount)
+        pos.amount = new_amount
+
+        fee = abs(order.amount) * price * self.fee_rate
+        self.balance += realized - fee
+        order.status = "closed"
+        self.fills.append({
+            "symbol": order.symbol,
+            "type": order.type,
+            "side": order.side,
+            "amount": order.amount,
+            "price": price,
+            "time": now,
+            "realized_pnl": realized,
+            "fee": fee,
+        })
+
+        if pos.amount == 0:
+            # Protective orders are one-cancels-other once the position is flat.
+            for other in book.orders:
+                if other.status == "open":
+                    other.status = "canceled"
+            book.orders = []
+
+    def _process_all(self) -> None:
+        now = self.time()
+        for book in self._books.values():
+            self._process(book, now)
+
+    def _process(self, book: _SymbolBook, now: float) -> None:
+        """Trigger resting SL/TP orders against candles closed since the last check."""
+        closed = int(np.searchsorted(book.ts, now - self.timeframe_seconds, side="right"))
+        if not book.orders:
+            book.next_candle = max(book.next_candle, closed)
+            return
+
+        for i in range(book.next_candle, closed):
+            _, high, low, _, _ = book.ohlcv[i]
+            candle_ts = int(book.ts[i])
+            # Stops first, as PaperBroker does.
+            for order_type in ("STOP_MARKET", "TAKE_PROFIT_MARKET"):
+                for order in list(book.orders):
+                    if order.type != order_type or order.status != "open":
+                        continue
+                    if candle_ts < order.active_from:
+                        continue
+                    if self._triggered(order, high, low):
+                        self._fill(book, order, float(order.stop_price), candle_ts + self.timeframe_seconds)
+            if not book.orders:
+                break
+        book.next_candle = max(book.next_candle, closed)
+
+    @staticmethod
+    def _triggered(order: SimOrder, high: float, low: float) -> bool:
+        if order.side == "sell":   # closes a long
+            if order.type == "STOP_MARKET":
+                return low <= order.stop_price
+            return high >= order.stop_price
+        if order.type == "STOP_MARKET":  # closes a short
+            return high >= order.stop_price
+        return low <= order.stop_price
+
+    # --------------------
+    # Reporting
+    # --------------------
+
+    def stats(self) -> dict:
+        latencies = np.array(self.decision_latencies) if self.decision_latencies else np.array([0.0])
+        return {
+            "calls": dict(self.call_counts),
+            "failures": self.failures,
+            "fills": len(self.fills),
+            "balance": self.balance,
+            "decision_latency_mean_s": float(latencies.mean()),
+            "decision_latency_p95_s": float(np.percentile(latencies, 95)),
+            "decision_latency_max_s": float(latencies.max()),
+        }
+
+    def log_stats(self) -> None:
+        s = self.stats()
+        log.info(
+            f"Simulated exchange — fills={s['fills']}, balance={s['balance']:.2f}, "
+            f"failures={s['failures']}, calls={s['calls']}, "
+            f"decision latency mean={s['decision_latency_mean_s'] * 1000:.1f}ms "
+            f"p95={s['decision_latency_p95_s'] * 1000:.1f}ms"
+        )
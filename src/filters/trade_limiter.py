@@ -1,6 +1,13 @@
 from datetime import datetime, timedelta, time
+from typing import Optional
+
+import numpy as np
+import pandas as pd
 import pytz
-from utils.logger import log
+
+from filters.trading_calendar import TradingDayCalendar, _to_ns
+from utils.jit import JIT_ENABLED, njit
+from utils.logger import enabled, log, trace_event
 
 """
 TradeLimiter with US Market Open Reset
@@ -12,8 +19,85 @@ Behavior:
 - Tracks trades & daily PnL
 - Blocks new trades after limits hit
 - Resets counters at next US market open
+
+Backtests pass a precomputed TradingDayCalendar: resets then become an
+integer comparison against the cached end of the current trading day
+instead of a timezone conversion on every call.
+
+daily_limit_mask() applies the same daily caps to a whole array of
+candidate trades at once, for vectorized backtests and grid sweeps.
 """
 
+
+@njit
+def _daily_limit_loop(day_ids, pnls, max_trades_per_day, max_daily_loss_pct, max_daily_profit_pct, out):
+    day = day_ids[0] - 1
+    trades = 0
+    pnl = 0.0
+    blocked = False
+    for k in range(len(day_ids)):
+        if day_ids[k] != day:
+            day = day_ids[k]
+            trades = 0
+            pnl = 0.0
+            blocked = False
+        blocked = blocked or not (
+            trades < max_trades_per_day
+            and pnl > -max_daily_loss_pct
+            and pnl < max_daily_profit_pct
+        )
+        out[k] = not blocked
+        trades += 1
+        pnl += pnls[k]
+    return out
+
+
+def daily_limit_mask(
+    day_ids: np.ndarray,
+    pnls: np.ndarray,
+    max_trades_per_day: int,
+    max_daily_loss_pct: float,
+    max_daily_profit_pct: float,
+) -> np.ndarray:
+    """
+    Batch version of the TradeLimiter daily caps.
+
+    Trades must be in entry order; day_ids are their entry trading days.
+    A trade is allowed when, within its day, fewer than max_trades_per_day
+    trades came before it and the PnL of those trades is strictly inside
+    (-max_daily_loss_pct, +max_daily_profit_pct). Once a trade is blocked
+    the rest of its day is blocked, so the allowed trades form a per-day
+    prefix and the running sums of all candidates equal those of the allowed
+    ones. PnL counts towards the entry day, which matches the stateful
+    limiter: it only resets on can_trade() while flat, so a result recorded
+    after the reset time is discarded by the next reset.
+    """
+    day_ids = np.asarray(day_ids)
+    pnls = np.asarray(pnls, dtype=float)
+    if len(day_ids) == 0:
+        return np.zeros(0, dtype=bool)
+    if np.any(np.diff(day_ids) < 0):
+        raise ValueError("Trades must be sorted by entry time.")
+
+    if JIT_ENABLED:
+        return _daily_limit_loop(
+            day_ids.astype(np.int64), pnls, max_trades_per_day, max_daily_loss_pct,
+            max_daily_profit_pct, np.empty(len(day_ids), dtype=np.bool_),
+        )
+
+    by_day = pd.Series(pnls).groupby(day_ids)
+    rank = by_day.cumcount().to_numpy()
+    # groupby cumsum adds in order from 0.0, so it matches the limiter's += bit for bit
+    pnl_before = by_day.cumsum().groupby(day_ids).shift(fill_value=0.0).to_numpy()
+
+    ok = (
+        (rank < max_trades_per_day)
+        & (pnl_before > -max_daily_loss_pct)
+        & (pnl_before < max_daily_profit_pct)
+    )
+    return pd.Series(ok.astype(np.int8)).groupby(day_ids).cummin().to_numpy().astype(bool)
+
+
 class TradeLimiter:
     def __init__(
         self,
@@ -21,7 +105,8 @@ class TradeLimiter:
         max_daily_loss_pct: float = 0.02,    # -2% daily max loss
         max_daily_profit_pct: float = 0.015,  # +1.5% daily profit target
         log_resets: bool = True,
-        log_blocks: bool = True
+        log_blocks: bool = True,
+        calendar: Optional[TradingDayCalendar] = None,
     ):
         self.max_trades_per_day = max_trades_per_day
         self.max_daily_loss_pct = max_daily_loss_pct
@@ -32,10 +117,18 @@ class TradeLimiter:
         self._last_block_reason = None
         self.log_resets = log_resets
         self.log_blocks = log_blocks
+        # start of the trading day the counters belong to (UTC ns), set on reset
+        self._counting_since_ns = None
         
         # next reset timestamp (first initialization)
         self.next_reset_ts = self._calculate_next_us_open()
 
+        # calendar fast path: current trading day and its [start, end) in UTC ns
+        self.calendar = calendar
+        self._day_id = None
+        self._day_start_ns = 0
+        self._day_end_ns = 0
+
     # -------------------------------------------------------
     # Time / Reset Management
     # -------------------------------------------------------
@@ -75,19 +168,42 @@ class TradeLimiter:
 
         return now_utc.astimezone(pytz.UTC)
 
+    def _reset_daily(self):
+        if self.log_resets:
+            log.info("US Market Open — resetting daily trade limits.")
+        self.trades_today = 0
+        self.daily_pnl_pct = 0.0
+        self._last_block_reason = None
+
+    def _reset_from_calendar(self, now_ns: int) -> bool:
+        """Calendar-based reset; returns False when now is outside the calendar."""
+        if self._day_start_ns <= now_ns < self._day_end_ns:
+            return True
+        if not self.calendar.covers(now_ns):
+            return False
+        day_id = self.calendar.day_id(now_ns)
+        # Moving back in time only realigns the schedule, like the clock path.
+        if self._day_id is not None and day_id > self._day_id:
+            self._reset_daily()
+            self._counting_since_ns = self.calendar.bounds(day_id)[0]
+        self._day_id = day_id
+        self._day_start_ns, self._day_end_ns = self.calendar.bounds(day_id)
+        self.next_reset_ts = datetime.fromtimestamp(self._day_end_ns / 1e9, tz=pytz.UTC)
+        return True
+
     def _reset_if_needed(self, now_utc: datetime = None):
         """Resets daily counters at next US market open."""
+        if self.calendar is not None and now_utc is not None:
+            if self._reset_from_calendar(_to_ns(now_utc)):
+                return
         now_utc = self._normalize_time(now_utc)
         # Align reset schedule when backtesting past data.
         if now_utc < self.next_reset_ts:
             self.next_reset_ts = self._calculate_next_us_open(now_utc)
         if now_utc >= self.next_reset_ts:
-            if self.log_resets:
-                log.info("US Market Open — resetting daily trade limits.")
-            self.trades_today = 0
-            self.daily_pnl_pct = 0.0
+            self._reset_daily()
+            self._counting_since_ns = _to_ns(self.next_reset_ts)
             self.next_reset_ts = self._calculate_next_us_open(now_utc)
-            self._last_block_reason = None
 
     def _log_block_once(self, reason_key: str, message: str, level: str = "info"):
         """Avoid spamming the log when a daily block is already active."""
@@ -135,12 +251,76 @@ class TradeLimiter:
         self._last_block_reason = None
         return True
 
+    def blocked_until(self, now_utc: datetime = None) -> Optional[datetime]:
+        """
+        None if a new trade is allowed at now_utc, else the next reset time.
+
+        Blocks only lift at a reset, so a flat backtest can skip every bar
+        before the returned time without changing results.
+        """
+        if self.can_trade(now_utc):
+            return None
+        return self.next_reset_ts
+
+    def allowed_mask(self, entry_times, pnls, exit_times=None) -> np.ndarray:
+        """
+        Which of a sequence of candidate trades this limiter's caps would allow.
+
+        Candidates must not overlap (each entry after the previous exit), as
+        produced by a single-position simulation; overlapping signals have to
+        be resolved first. Starts from a fresh day and leaves the limiter's
+        own counters untouched.
+        """
+        entry_times = pd.Series(pd.to_datetime(entry_times))
+        if exit_times is not None:
+            exit_times = pd.Series(pd.to_datetime(exit_times))
+            if (entry_times.iloc[1:].to_numpy() <= exit_times.iloc[:-1].to_numpy()).any():
+                raise ValueError("Candidate trades overlap; resolve positions before applying daily caps.")
+        if entry_times.empty:
+            return np.zeros(0, dtype=bool)
+        calendar = self.calendar
+        if calendar is None or not (
+            calendar.covers(_to_ns(entry_times.iloc[0])) and calendar.covers(_to_ns(entry_times.iloc[-1]))
+        ):
+            calendar = TradingDayCalendar.for_timestamps(entry_times)
+        return daily_limit_mask(
+            calendar.day_ids(entry_times),
+            pnls,
+            self.max_trades_per_day,
+            self.max_daily_loss_pct,
+            self.max_daily_profit_pct,
+        )
+
     def record_trade_opened(self):
         self.trades_today += 1
-        log.info(
-            f"Trade opened — {self.trades_today}/{self.max_trades_per_day}, "
-            f"PnL: {self.daily_pnl_pct:.2%}"
-        )
+        if enabled("INFO"):
+            log.info(
+                f"Trade opened — {self.trades_today}/{self.max_trades_per_day}, "
+                f"PnL: {self.daily_pnl_pct:.2%}"
+            )
+
+    def reserve_trade(self, now_utc: datetime = None) -> bool:
+        """can_trade + record_trade_opened in one step; undo with release_trade()."""
+        if not self.can_trade(now_utc):
+            return False
+        self.record_trade_opened()
+        return True
+
+    def release_trade(self, now_utc: datetime = None):
+        """
+        Give back a reserved trade whose order was not placed.
+
+        Pass the now_utc the slot was reserved with: a reservation from
+        before the last daily reset is ignored, since the counters it
+        was taken from have already started over.
+        """
+        if (
+            now_utc is not None
+            and self._counting_since_ns is not None
+            and _to_ns(now_utc) < self._counting_since_ns
+        ):
+            return
+        self.trades_today = max(self.trades_today - 1, 0)
 
     def record_trade_result(self, pnl_pct: float):
         """
@@ -150,7 +330,10 @@ class TradeLimiter:
             -0.005 = -0.5%
         """
         self.daily_pnl_pct += pnl_pct
-        log.info(
-            f"Trade result recorded: {pnl_pct:.2%}. "
-            f"Daily PnL now {self.daily_pnl_pct:.2%}"
-        )
+        if enabled("INFO"):
+            log.info(
+                f"Trade result recorded: {pnl_pct:.2%}. "
+                f"Daily PnL now {self.daily_pnl_pct:.2%}"
+            )
+        trace_event("limiter_result", pnl_pct=pnl_pct, daily_pnl_pct=self.daily_pnl_pct,
+                    trades_today=self.trades_today)
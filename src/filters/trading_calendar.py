@@ -0,0 +1,76 @@
+"""
+Precomputed trading-day boundaries for TradeLimiter resets.
+
+A trading day runs from one 9:30 AM ET (NYSE open) to the next. Boundaries
+are stored as a sorted int64 array of UTC nanoseconds (DST-aware), so mapping
+a bar to its trading day is a single searchsorted and limiter resets become
+integer comparisons.
+"""
+
+import numpy as np
+import pandas as pd
+
+US_OPEN_TZ = "America/New_York"
+US_OPEN_OFFSET = pd.Timedelta(hours=9, minutes=30)
+
+
+def _to_ns(ts) -> int:
+    """UTC nanoseconds for a Timestamp/datetime; naive values are treated as UTC."""
+    value = getattr(ts, "value", None)
+    if value is None:
+        value = pd.Timestamp(ts).value
+    return int(value)
+
+
+def _to_ns_array(timestamps) -> np.ndarray:
+    """UTC nanoseconds for a Series/array of timestamps; naive values are UTC."""
+    values = pd.to_datetime(pd.Series(timestamps))
+    if values.dt.tz is not None:
+        values = values.dt.tz_convert("UTC").dt.tz_localize(None)
+    return values.to_numpy(dtype="datetime64[ns]").astype(np.int64)
+
+
+class TradingDayCalendar:
+    """
+    Sorted 9:30 ET reset boundaries (UTC ns).
+
+    day_id(ts) = number of boundaries <= ts, so the reset that starts the
+    day is boundaries[day_id - 1] and the next reset is boundaries[day_id].
+    """
+
+    def __init__(self, boundaries_ns: np.ndarray):
+        self.boundaries = np.asarray(boundaries_ns, dtype=np.int64)
+        if len(self.boundaries) < 2:
+            raise ValueError("TradingDayCalendar needs at least two boundaries.")
+
+    @classmethod
+    def for_range(cls, start, end) -> "TradingDayCalendar":
+        """Boundaries covering every instant in [start, end]."""
+        start = pd.Timestamp(start)
+        end = pd.Timestamp(end)
+        if start.tzinfo is not None:
+            start = start.tz_convert("UTC").tz_localize(None)
+        if end.tzinfo is not None:
+            end = end.tz_convert("UTC").tz_localize(None)
+        days = pd.date_range(start.normalize() - pd.Timedelta(days=2),
+                             end.normalize() + pd.Timedelta(days=2), freq="D")
+        opens = (days + US_OPEN_OFFSET).tz_localize(US_OPEN_TZ).tz_convert("UTC")
+        return cls(opens.asi8)
+
+    @classmethod
+    def for_timestamps(cls, timestamps: pd.Series) -> "TradingDayCalendar":
+        return cls.for_range(timestamps.iloc[0], timestamps.iloc[-1])
+
+    def covers(self, ts_ns: int) -> bool:
+        return self.boundaries[0] <= ts_ns < self.boundaries[-1]
+
+    def day_id(self, ts) -> int:
+        return int(np.searchsorted(self.boundaries, _to_ns(ts), side="right"))
+
+    def day_ids(self, timestamps) -> np.ndarray:
+        """Vectorized day ids for a Series/array of timestamps."""
+        return np.searchsorted(self.boundaries, _to_ns_array(timestamps), side="right")
+
+    def bounds(self, day_id: int):
+        """(start_ns, end_ns) of a trading day; end_ns is the next reset."""
+        return int(self.boundaries[day_id - 1]), int(self.boundaries[day_id])
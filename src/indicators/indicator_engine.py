@@ -1,6 +1,10 @@
+from typing import Tuple
+
 import pandas as pd
 import numpy as np
 
+DEFAULT_RANGE_LOOKBACK = 50
+
 
 def ema(series: pd.Series, period: int) -> pd.Series:
     """Exponential Moving Average"""
@@ -58,22 +62,44 @@ def atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
     return true_range.rolling(window=period).mean()
 
 
-def add_indicators(df: pd.DataFrame) -> pd.DataFrame:
+def rolling_high(series: pd.Series, period: int) -> pd.Series:
+    """Highest value of the last `period` rows (current row included)."""
+    # pandas' rolling max is a monotonic-deque sliding window: O(n) overall
+    return series.rolling(window=period).max()
+
+
+def rolling_low(series: pd.Series, period: int) -> pd.Series:
+    """Lowest value of the last `period` rows (current row included)."""
+    return series.rolling(window=period).min()
+
+
+def range_columns(period: int) -> Tuple[str, str]:
+    """Column names (high, low) used for a rolling range of `period` bars."""
+    return f"range_high_{period}", f"range_low_{period}"
+
+
+def add_range(df: pd.DataFrame, period: int = DEFAULT_RANGE_LOOKBACK) -> pd.DataFrame:
+    """Add range_high_<period> / range_low_<period> over high/low."""
+    high_col, low_col = range_columns(period)
+    df[high_col] = rolling_high(df["high"], period)
+    df[low_col] = rolling_low(df["low"], period)
+    return df
+
+
+def add_indicators(df: pd.DataFrame, specs=None, backend: str = "pandas") -> pd.DataFrame:
     """
     Add a standardized set of indicators to a candle DataFrame.
     These will feed strategy & AI filtering later.
-    """
-    close = df["close"]
-
-    df["sma50"] = sma(close, 50)
-    df["sma200"] = sma(close, 200)
 
-    df["ema21"] = ema(close, 21)
-    df["ema50"] = ema(close, 50)
-
-    df["rsi14"] = rsi(close, 14)
+    specs (indicators.registry.IndicatorSpec) limits the columns to what a
+    strategy needs; the default is the full historical set. Results are
+    memoized per candle data, see indicators.registry. backend="numpy"
+    computes with indicators.numpy_backend instead of pandas.
+    """
+    from indicators.registry import DEFAULT_INDICATORS, compute_indicators
 
-    df["macd_line"], df["macd_signal"], df["macd_hist"] = macd(close)
-    df["atr14"] = atr(df, 14)
+    specs = DEFAULT_INDICATORS if specs is None else specs
+    for column, values in compute_indicators(df, specs, backend=backend).items():
+        df[column] = values
 
     return df
@@ -0,0 +1,72 @@
+"""
+Multi-period indicator kernels for parameter sweeps.
+
+Each function computes one indicator for a whole vector of periods in a
+single pass and returns a (len(periods), bars) float64 matrix; row k
+matches the indicator_engine function called with periods[k] (up to
+floating-point rounding).
+
+Rolling means (SMA, RSI averages, ATR) share one cumulative sum per input,
+so each extra period costs a subtraction instead of a pass over the data.
+EMA is a linear recursion, computed blockwise as scaled cumulative sums
+(or as a compiled loop when numba is available). The kernels live in
+indicators.numpy_backend.
+
+Inputs are expected to be NaN-free (OHLCV columns are).
+"""
+
+from typing import Dict, Sequence
+
+import numpy as np
+import pandas as pd
+
+from indicators.numpy_backend import EMA_MAX_BLOCK, ema_rows, rolling_means_rows, rsi_rows, true_range
+
+
+def sma_multi(close, periods: Sequence[int]) -> np.ndarray:
+    """SMA for every period: row k == sma(close, periods[k])."""
+    return rolling_means_rows(close, periods)
+
+
+def rsi_multi(close, periods: Sequence[int]) -> np.ndarray:
+    """RSI (rolling-mean variant, as indicator_engine.rsi) for every period."""
+    return rsi_rows(close, periods)
+
+
+def atr_multi(df: pd.DataFrame, periods: Sequence[int]) -> np.ndarray:
+    """ATR for every period: row k == atr(df, periods[k])."""
+    return rolling_means_rows(true_range(df["high"], df["low"], df["close"]), periods)
+
+
+def ema_multi(series, spans: Sequence[int], max_block: int = EMA_MAX_BLOCK) -> np.ndarray:
+    """
+    EMA (adjust=False, seeded with the first value) for every span:
+    row k == ema(series, spans[k]).
+    """
+    return ema_rows(series, spans, max_block=max_block)
+
+
+_KERNELS = {
+    "sma": lambda df, periods: sma_multi(df["close"], periods),
+    "ema": lambda df, periods: ema_multi(df["close"], periods),
+    "rsi": lambda df, periods: rsi_multi(df["close"], periods),
+    "atr": atr_multi,
+}
+
+
+def multi_period_columns(df: pd.DataFrame, name: str, periods: Sequence[int]) -> Dict[str, np.ndarray]:
+    """{column name: values} for name in sma/ema/rsi/atr, named as the registry does."""
+    from indicators.registry import spec
+
+    if name not in _KERNELS:
+        raise KeyError(f"No multi-period kernel for: {name}")
+    periods = list(periods)
+    matrix = _KERNELS[name](df, periods)
+    return {spec(name, period=p).columns[0]: matrix[k] for k, p in enumerate(periods)}
+
+
+def add_multi_period(df: pd.DataFrame, name: str, periods: Sequence[int]) -> pd.DataFrame:
+    """Add one column per period (e.g. rsi7..rsi28) so strategies find them precomputed."""
+    for column, values in multi_period_columns(df, name, periods).items():
+        df[column] = values
+    return df
@@ -0,0 +1,306 @@
+"""
+NumPy indicator kernels (no pandas intermediates).
+
+Same indicators as indicator_engine, computed on contiguous arrays with
+in-place ufuncs. Every function takes an optional preallocated `out`
+buffer (float64 or float32) and returns it; without one the result is a
+new array of `dtype`. Accumulations always run in float64, so float32
+only narrows the stored result.
+
+Results match the pandas implementations to floating-point rounding
+(rolling means come from a cumulative sum instead of pandas' running
+window sum). Inputs are expected to be NaN-free (OHLCV columns are).
+
+The *_rows kernels compute several periods at once and back
+indicators.multi_period. The EMA recursion runs as a compiled loop when
+numba is available (utils.jit) and blockwise otherwise.
+"""
+
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.jit import JIT_ENABLED, njit
+
+EMA_MAX_BLOCK = 1024
+# natural log of the largest weight 1 / decay^j used inside an EMA block (~1e100)
+_EMA_SCALE_LIMIT = 230.0
+
+
+def as_array(values) -> np.ndarray:
+    """Contiguous float64 view/copy of a Series, list or array."""
+    return np.ascontiguousarray(np.asarray(values, dtype=np.float64))
+
+
+def _buffer(out: Optional[np.ndarray], n: int, dtype) -> np.ndarray:
+    if out is None:
+        return np.empty(n, dtype=dtype)
+    if out.shape != (n,):
+        raise ValueError(f"out has shape {out.shape}, expected ({n},)")
+    return out
+
+
+# ---- Rolling means ----
+
+def _centred_cumsum(values: np.ndarray) -> Tuple[np.ndarray, float]:
+    # centring keeps the running sum small, so window differences stay precise
+    offset = float(values.mean()) if len(values) else 0.0
+    cumsum = np.empty(len(values) + 1)
+    cumsum[0] = 0.0
+    np.subtract(values, offset, out=cumsum[1:])
+    np.cumsum(cumsum[1:], out=cumsum[1:])
+    return cumsum, offset
+
+
+def _window_mean(cumsum: np.ndarray, offset: float, period: int, out: np.ndarray) -> np.ndarray:
+    n = len(out)
+    out[:min(period - 1, n)] = np.nan
+    if period <= n:
+        tail = out[period - 1:]
+        np.subtract(cumsum[period:], cumsum[:n - period + 1], out=tail, casting="unsafe")
+        tail /= period
+        tail += offset
+    return out
+
+
+def rolling_mean(values, period: int, out: Optional[np.ndarray] = None, dtype=np.float64) -> np.ndarray:
+    """Mean of the last `period` values; NaN until the window is full."""
+    values = as_array(values)
+    cumsum, offset = _centred_cumsum(values)
+    return _window_mean(cumsum, offset, period, _buffer(out, len(values), dtype))
+
+
+def rolling_means_rows(values, periods: Sequence[int]) -> np.ndarray:
+    """(len(periods), bars) matrix of rolling means sharing one cumulative sum."""
+    values = as_array(values)
+    cumsum, offset = _centred_cumsum(values)
+    out = np.empty((len(periods), len(values)))
+    for k, period in enumerate(periods):
+        _window_mean(cumsum, offset, period, out[k])
+    return out
+
+
+def _window_counts(flags: np.ndarray, period: int) -> np.ndarray:
+    counts = np.zeros(len(flags), dtype=np.int64)
+    cumsum = np.concatenate(([0], np.cumsum(flags, dtype=np.int64)))
+    if period <= len(flags):
+        counts[period - 1:] = cumsum[period:] - cumsum[:len(flags) - period + 1]
+    return counts
+
+
+def sma(close, period: int, out: Optional[np.ndarray] = None, dtype=np.float64) -> np.ndarray:
+    """Simple Moving Average"""
+    return rolling_mean(close, period, out=out, dtype=dtype)
+
+
+# ---- EMA ----
+
+@njit
+def _ema_loop(x, alpha, out):
+    """y[0] = x[0]; y[i] = (1 - alpha) * y[i-1] + alpha * x[i]"""
+    if len(x) == 0:
+        return out
+    y = x[0]
+    out[0] = y
+    for i in range(1, len(x)):
+        y = (1.0 - alpha) * y + alpha * x[i]
+        out[i] = y
+    return out
+
+
+def _ema_row(x: np.ndarray, span: int, out: np.ndarray, max_block: int) -> np.ndarray:
+    n = len(x)
+    alpha = 2.0 / (span + 1.0)
+    decay = 1.0 - alpha
+    if decay <= 0.0 or n == 0:
+        out[:] = x
+        return out
+    if JIT_ENABLED:
+        return _ema_loop(x, alpha, out)
+
+    # in a block of B bars, y[i] = decay^(i+1) * carry + alpha * decay^i * cumsum(x[j] / decay^j);
+    # B is capped so 1 / decay^B stays far from overflow
+    block = int(min(max_block, n, max(1.0, _EMA_SCALE_LIMIT / -np.log(decay))))
+    nblocks = -(-n // block)
+    padded = np.zeros(nblocks * block)
+    padded[:n] = x
+    blocks = padded.reshape(nblocks, block)
+
+    powers = np.arange(block)
+    rising = decay ** -powers.astype(np.float64)
+    falling = decay ** powers.astype(np.float64)
+    z = np.cumsum(blocks * rising, axis=1)
+    z *= alpha * falling
+
+    # chain the block carries: y at the end of block b-1 feeds block b
+    block_decay = decay ** block
+    carries = np.empty(nblocks)
+    carry = float(x[0])   # y[-1] = x[0] reproduces y[0] = x[0]
+    last = z[:, -1].tolist()
+    for b in range(nblocks):
+        carries[b] = carry
+        carry = block_decay * carry + last[b]
+
+    z += carries[:, None] * (falling * decay)
+    np.copyto(out, z.reshape(-1)[:n], casting="unsafe")
+    return out
+
+
+def ema_rows(values, spans: Sequence[int], max_block: int = EMA_MAX_BLOCK) -> np.ndarray:
+    """
+    EMA (adjust=False, seeded with the first value) for every span, as a
+    (len(spans), bars) matrix.
+
+    Without numba the recursion is cut into blocks: it is linear, so inside
+    a block it is a scaled cumulative sum, and only one carry per block is
+    chained in a Python loop (bars / block iterations).
+    """
+    x = as_array(values)
+    out = np.empty((len(spans), len(x)))
+    for k, span in enumerate(spans):
+        _ema_row(x, span, out[k], max_block)
+    return out
+
+
+def ema(values, period: int, out: Optional[np.ndarray] = None, dtype=np.float64) -> np.ndarray:
+    """Exponential Moving Average"""
+    x = as_array(values)
+    return _ema_row(x, period, _buffer(out, len(x), dtype), EMA_MAX_BLOCK)
+
+
+# ---- RSI ----
+
+def _gains_losses(close: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    gain = np.empty(len(close))
+    gain[:1] = 0.0
+    np.subtract(close[1:], close[:-1], out=gain[1:])
+    loss = np.negative(gain)
+    np.maximum(gain, 0.0, out=gain)
+    np.maximum(loss, 0.0, out=loss)
+    return gain, loss
+
+
+def _rsi_from_means(avg_gain, avg_loss, gain_count, loss_count, out) -> np.ndarray:
+    # windows without any gain/loss must be exactly 0 (RSI 0/100), not rounding noise
+    avg_gain[gain_count == 0] = 0.0
+    avg_loss[loss_count == 0] = 0.0
+    nan = np.isnan(avg_gain)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(avg_gain, avg_loss, out=avg_gain)   # rs
+    avg_gain += 1.0
+    np.divide(100.0, avg_gain, out=avg_gain)
+    np.subtract(100.0, avg_gain, out=out, casting="unsafe")
+    out[nan] = np.nan
+    return out
+
+
+def rsi(close, period: int = 14, out: Optional[np.ndarray] = None, dtype=np.float64) -> np.ndarray:
+    """Relative Strength Index (rolling-mean variant, as indicator_engine.rsi)"""
+    close = as_array(close)
+    gain, loss = _gains_losses(close)
+    avg_gain = rolling_mean(gain, period)
+    avg_loss = rolling_mean(loss, period)
+    return _rsi_from_means(
+        avg_gain, avg_loss,
+        _window_counts(gain > 0, period), _window_counts(loss > 0, period),
+        _buffer(out, len(close), dtype),
+    )
+
+
+def rsi_rows(close, periods: Sequence[int]) -> np.ndarray:
+    """RSI for every period, sharing the gain/loss cumulative sums."""
+    close = as_array(close)
+    gain, loss = _gains_losses(close)
+    avg_gain = rolling_means_rows(gain, periods)
+    avg_loss = rolling_means_rows(loss, periods)
+    out = np.empty((len(periods), len(close)))
+    for k, period in enumerate(periods):
+        _rsi_from_means(
+            avg_gain[k], avg_loss[k],
+            _window_counts(gain > 0, period), _window_counts(loss > 0, period),
+            out[k],
+        )
+    return out
+
+
+# ---- ATR / MACD / ranges ----
+
+def true_range(high, low, close, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Per-bar true range (float64); the first bar uses high - low."""
+    high, low, close = as_array(high), as_array(low), as_array(close)
+    tr = _buffer(out, len(high), np.float64)
+    np.subtract(high, low, out=tr)
+    np.abs(tr, out=tr)
+    scratch = np.empty(max(len(high) - 1, 0))
+    prev_close = close[:-1]
+    for side in (high, low):
+        np.subtract(side[1:], prev_close, out=scratch)
+        np.abs(scratch, out=scratch)
+        np.maximum(tr[1:], scratch, out=tr[1:])
+    return tr
+
+
+def atr(high, low, close, period: int = 14, out: Optional[np.ndarray] = None, dtype=np.float64) -> np.ndarray:
+    """Average True Range"""
+    return rolling_mean(true_range(high, low, close), period, out=out, dtype=dtype)
+
+
+def macd(
+    close,
+    fast: int = 12,
+    slow: int = 26,
+    signal: int = 9,
+    out: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None,
+    dtype=np.float64,
+):
+    """MACD line, signal line and histogram (into out = (line, signal, hist))."""
+    close = as_array(close)
+    n = len(close)
+    line_out, signal_out, hist_out = out if out is not None else (None, None, None)
+    fast_ema = ema(close, fast)
+    slow_ema = ema(close, slow)
+    np.subtract(fast_ema, slow_ema, out=fast_ema)                 # line, in float64
+    signal_line = ema(fast_ema, signal)
+
+    line_out = _buffer(line_out, n, dtype)
+    signal_out = _buffer(signal_out, n, dtype)
+    hist_out = _buffer(hist_out, n, dtype)
+    np.copyto(line_out, fast_ema, casting="unsafe")
+    np.copyto(signal_out, signal_line, casting="unsafe")
+    np.subtract(fast_ema, signal_line, out=hist_out, casting="unsafe")
+    return line_out, signal_out, hist_out
+
+
+def _rolling_extreme(values, period: int, ufunc, out, dtype) -> np.ndarray:
+    """
+    Sliding max/min in O(n) (van Herk / Gil-Werman): within blocks of
+    `period` bars take running extremes forwards and backwards; each window
+    spans at most two blocks, so its extreme is one of each.
+    """
+    values = as_array(values)
+    n = len(values)
+    out = _buffer(out, n, dtype)
+    out[:min(period - 1, n)] = np.nan
+    if period > n:
+        return out
+
+    nblocks = -(-n // period)
+    padded = np.empty(nblocks * period)
+    padded[:n] = values
+    padded[n:] = values[-1]
+    blocks = padded.reshape(nblocks, period)
+    forward = ufunc.accumulate(blocks, axis=1).reshape(-1)
+    backward = ufunc.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].reshape(-1)
+    # window ending at i covers [i - period + 1, i]
+    ufunc(backward[:n - period + 1], forward[period - 1:n], out=out[period - 1:], casting="unsafe")
+    return out
+
+
+def rolling_high(values, period: int, out: Optional[np.ndarray] = None, dtype=np.float64) -> np.ndarray:
+    """Highest value of the last `period` rows (current row included)."""
+    return _rolling_extreme(values, period, np.maximum, out, dtype)
+
+
+def rolling_low(values, period: int, out: Optional[np.ndarray] = None, dtype=np.float64) -> np.ndarray:
+    """Lowest value of the last `period` rows (current row included)."""
+    return _rolling_extreme(values, period, np.minimum, out, dtype)
@@ -0,0 +1,283 @@
+"""
+Indicator registry: declared (indicator, params) specs, computed on demand.
+
+Strategies list the specs they read (BaseStrategy.required_indicators());
+compute_indicators() resolves dependencies (MACD reuses the EMAs it is
+built from), computes each spec once per call and memoizes results by a
+fingerprint of the price data, so a sweep over RSI or EMA periods on the
+same candles computes every distinct series exactly once. The memo cache
+is an LRU bounded by the bytes it holds (Config.INDICATOR_CACHE_MB): at
+millions of bars every entry is tens of MB.
+
+Column names keep the historical scheme: sma50, ema21, rsi14, atr14,
+macd_line/macd_signal/macd_hist for MACD(12, 26, 9), range_high_50 /
+range_low_50.
+"""
+
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from indicators import numpy_backend as nb
+from indicators.indicator_engine import (
+    DEFAULT_RANGE_LOOKBACK,
+    atr,
+    ema,
+    range_columns,
+    rolling_high,
+    rolling_low,
+    rsi,
+    sma,
+)
+from utils.config import Config
+
+CACHE_MAX_BYTES = int(Config.INDICATOR_CACHE_MB * 2 ** 20)
+BACKENDS = ("pandas", "numpy")
+
+
+@dataclass(frozen=True)
+class IndicatorSpec:
+    name: str
+    params: Tuple[Tuple[str, int], ...] = ()
+
+    def param(self, key: str) -> int:
+        return dict(self.params)[key]
+
+    @property
+    def columns(self) -> List[str]:
+        return _REGISTRY[self.name].columns(dict(self.params))
+
+
+def spec(name: str, **params) -> IndicatorSpec:
+    """spec("ema", period=21) -> IndicatorSpec for the ema21 column."""
+    if name not in _REGISTRY:
+        raise KeyError(f"Unknown indicator: {name}")
+    merged = {**_REGISTRY[name].defaults, **params}
+    return IndicatorSpec(name, tuple(sorted(merged.items())))
+
+
+@dataclass
+class _Definition:
+    defaults: Dict[str, int]
+    columns: Callable[[dict], List[str]]
+    deps: Callable[[dict], List[IndicatorSpec]]
+    # (candles, params, dependency outputs by column) -> outputs by column
+    compute: Callable[[pd.DataFrame, dict, Dict[str, pd.Series]], Dict[str, pd.Series]]
+    # same contract on numpy arrays (indicators.numpy_backend)
+    compute_numpy: Callable[[pd.DataFrame, dict, Dict[str, np.ndarray]], Dict[str, np.ndarray]]
+
+
+_REGISTRY: Dict[str, _Definition] = {}
+
+
+def register(name: str, columns, compute, numpy, deps=lambda p: [], **defaults) -> None:
+    _REGISTRY[name] = _Definition(
+        defaults=defaults, columns=columns, deps=deps, compute=compute, compute_numpy=numpy,
+    )
+
+
+# ---- Built-in indicators ----
+
+register(
+    "sma", period=50,
+    columns=lambda p: [f"sma{p['period']}"],
+    compute=lambda df, p, _: {f"sma{p['period']}": sma(df["close"], p["period"])},
+    numpy=lambda df, p, _: {f"sma{p['period']}": nb.sma(df["close"], p["period"])},
+)
+register(
+    "ema", period=21,
+    columns=lambda p: [f"ema{p['period']}"],
+    compute=lambda df, p, _: {f"ema{p['period']}": ema(df["close"], p["period"])},
+    numpy=lambda df, p, _: {f"ema{p['period']}": nb.ema(df["close"], p["period"])},
+)
+register(
+    "rsi", period=14,
+    columns=lambda p: [f"rsi{p['period']}"],
+    compute=lambda df, p, _: {f"rsi{p['period']}": rsi(df["close"], p["period"])},
+    numpy=lambda df, p, _: {f"rsi{p['period']}": nb.rsi(df["close"], p["period"])},
+)
+register(
+    "atr", period=14,
+    columns=lambda p: [f"atr{p['period']}"],
+    compute=lambda df, p, _: {f"atr{p['period']}": atr(df, p["period"])},
+    numpy=lambda df, p, _: {f"atr{p['period']}": nb.atr(df["high"], df["low"], df["close"], p["period"])},
+)
+
+
+def _macd_columns(p: dict) -> List[str]:
+    if (p["fast"], p["slow"], p["signal"]) == (12, 26, 9):
+        return ["macd_line", "macd_signal", "macd_hist"]
+    suffix = f"_{p['fast']}_{p['slow']}_{p['signal']}"
+    return [f"macd_line{suffix}", f"macd_signal{suffix}", f"macd_hist{suffix}"]
+
+
+def _macd(df: pd.DataFrame, p: dict, inputs: Dict[str, pd.Series]) -> Dict[str, pd.Series]:
+    line = inputs[f"ema{p['fast']}"] - inputs[f"ema{p['slow']}"]
+    signal = ema(line, p["signal"])
+    names = _macd_columns(p)
+    return {names[0]: line, names[1]: signal, names[2]: line - signal}
+
+
+def _macd_numpy(df: pd.DataFrame, p: dict, inputs: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    line = inputs[f"ema{p['fast']}"] - inputs[f"ema{p['slow']}"]
+    signal = nb.ema(line, p["signal"])
+    names = _macd_columns(p)
+    return {names[0]: line, names[1]: signal, names[2]: line - signal}
+
+
+register(
+    "macd", fast=12, slow=26, signal=9,
+    columns=_macd_columns,
+    deps=lambda p: [spec("ema", period=p["fast"]), spec("ema", period=p["slow"])],
+    compute=_macd,
+    numpy=_macd_numpy,
+)
+
+
+def _range(df: pd.DataFrame, p: dict, _) -> Dict[str, pd.Series]:
+    high_col, low_col = range_columns(p["period"])
+    return {high_col: rolling_high(df["high"], p["period"]), low_col: rolling_low(df["low"], p["period"])}
+
+
+def _range_numpy(df: pd.DataFrame, p: dict, _) -> Dict[str, np.ndarray]:
+    high_col, low_col = range_columns(p["period"])
+    return {high_col: nb.rolling_high(df["high"], p["period"]), low_col: nb.rolling_low(df["low"], p["period"])}
+
+
+register(
+    "range", period=DEFAULT_RANGE_LOOKBACK,
+    columns=lambda p: list(range_columns(p["period"])),
+    compute=_range,
+    numpy=_range_numpy,
+)
+
+
+DEFAULT_INDICATORS: Tuple[IndicatorSpec, ...] = (
+    spec("sma", period=50),
+    spec("sma", period=200),
+    spec("ema", period=21),
+    spec("ema", period=50),
+    spec("rsi", period=14),
+    spec("macd"),
+    spec("atr", period=14),
+    spec("range", period=DEFAULT_RANGE_LOOKBACK),
+)
+
+
+# ---- Memoized computation ----
+
+_cache: "OrderedDict[Tuple[Tuple[str, str], IndicatorSpec], Dict[str, np.ndarray]]" = OrderedDict()
+_stats = {"hits": 0, "misses": 0, "bytes": 0}
+
+
+def fingerprint(df: pd.DataFrame) -> str:
+    """Digest of the price columns indicators read (high, low, close)."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(len(df)).encode())
+    for column in ("high", "low", "close"):
+        if column in df.columns:
+            digest.update(np.ascontiguousarray(df[column].to_numpy(dtype=np.float64)).tobytes())
+    return digest.hexdigest()
+
+
+def clear_cache() -> None:
+    _cache.clear()
+    _stats["hits"] = _stats["misses"] = _stats["bytes"] = 0
+
+
+def cache_info() -> dict:
+    return {**_stats, "entries": len(_cache)}
+
+
+def _nbytes(entry: Dict[str, np.ndarray]) -> int:
+    return sum(arr.nbytes for arr in entry.values())
+
+
+def _store(key, entry: Dict[str, np.ndarray]) -> None:
+    """Add an entry, evicting least recently used ones to stay within CACHE_MAX_BYTES."""
+    size = _nbytes(entry)
+    if size > CACHE_MAX_BYTES:
+        return
+    _cache[key] = entry
+    _stats["bytes"] += size
+    while _stats["bytes"] > CACHE_MAX_BYTES:
+        _, evicted = _cache.popitem(last=False)
+        _stats["bytes"] -= _nbytes(evicted)
+
+
+def _resolve(specs: Iterable[IndicatorSpec]) -> List[IndicatorSpec]:
+    """Specs plus their dependencies, dependencies first, each once."""
+    ordered: List[IndicatorSpec] = []
+    seen = set()
+
+    def visit(item: IndicatorSpec):
+        if item in seen:
+            return
+        seen.add(item)
+        for dep in _REGISTRY[item.name].deps(dict(item.params)):
+            visit(dep)
+        ordered.append(item)
+
+    for item in specs:
+        visit(item)
+    return ordered
+
+
+def compute_indicators(
+    df: pd.DataFrame,
+    specs: Iterable[IndicatorSpec] = DEFAULT_INDICATORS,
+    use_cache: bool = True,
+    backend: str = "pandas",
+) -> Dict[str, np.ndarray]:
+    """
+    Values (positional numpy arrays) for every column of the requested specs.
+    backend="numpy" uses indicators.numpy_backend (same values to rounding).
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown indicator backend: {backend}")
+    specs = list(specs)
+    key = (fingerprint(df), backend) if use_cache else None
+    values: Dict[str, np.ndarray] = {}
+    # indicator functions build positional Series (e.g. rsi), so compute on a 0..n-1 index
+    frame = df
+    if not (isinstance(df.index, pd.RangeIndex) and df.index.start == 0 and df.index.step == 1):
+        frame = df.reset_index(drop=True)
+
+    for item in _resolve(specs):
+        cached = _cache.get((key, item)) if use_cache else None
+        if cached is not None:
+            _cache.move_to_end((key, item))
+            _stats["hits"] += 1
+        else:
+            definition = _REGISTRY[item.name]
+            params = dict(item.params)
+            dep_columns = [col for dep in definition.deps(params) for col in dep.columns]
+            if backend == "numpy":
+                inputs = {col: values[col] for col in dep_columns}
+                cached = definition.compute_numpy(frame, params, inputs)
+            else:
+                inputs = {col: pd.Series(values[col]) for col in dep_columns}
+                cached = {col: series.to_numpy() for col, series in definition.compute(frame, params, inputs).items()}
+            if use_cache:
+                _stats["misses"] += 1
+                _store((key, item), cached)
+        values.update(cached)
+
+    requested = {col for item in specs for col in item.columns}
+    # copies, so callers writing into their frame never touch the cache
+    return {col: arr.copy() for col, arr in values.items() if col in requested}
+
+
+def ensure_indicators(df: pd.DataFrame, specs: Iterable[IndicatorSpec], backend: str = "pandas") -> pd.DataFrame:
+    """df if it already has every column of specs, else a copy with the missing ones added."""
+    missing = [item for item in specs if any(col not in df.columns for col in item.columns)]
+    if not missing:
+        return df
+    df = df.copy()
+    for col, arr in compute_indicators(df, missing, backend=backend).items():
+        df[col] = arr
+    return df
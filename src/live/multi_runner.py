@@ -0,0 +1,115 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional
+
+from utils.logger import log
+
+
+class CombinedTradeLimiter:
+    """
+    Applies a per-symbol TradeLimiter and a global TradeLimiter together.
+
+    Exposes the TradeLimiter interface (can_trade / reserve_trade /
+    release_trade / record_trade_opened / record_trade_result) so
+    LiveTrader and LiveBroker use it unchanged. The global limiter is
+    shared across threads, so every call takes `lock` (default: a private
+    lock). Only the counters are guarded: reserve_trade checks and takes a
+    slot atomically, so orders can be placed outside the lock.
+    """
+
+    def __init__(self, local, global_limiter, lock=None):
+        self.local = local
+        self.global_limiter = global_limiter
+        self.lock = lock if lock is not None else threading.Lock()
+
+    def can_trade(self, now_utc=None) -> bool:
+        with self.lock:
+            # Evaluate both so each limiter runs its daily reset.
+            local_ok = self.local.can_trade(now_utc=now_utc)
+            global_ok = self.global_limiter.can_trade(now_utc=now_utc)
+            return local_ok and global_ok
+
+    def reserve_trade(self, now_utc=None) -> bool:
+        with self.lock:
+            local_ok = self.local.can_trade(now_utc=now_utc)
+            global_ok = self.global_limiter.can_trade(now_utc=now_utc)
+            if not (local_ok and global_ok):
+                return False
+            self.local.record_trade_opened()
+            self.global_limiter.record_trade_opened()
+            return True
+
+    def release_trade(self, now_utc=None):
+        with self.lock:
+            self.local.release_trade(now_utc=now_utc)
+            self.global_limiter.release_trade(now_utc=now_utc)
+
+    def record_trade_opened(self):
+        with self.lock:
+            self.local.record_trade_opened()
+            self.global_limiter.record_trade_opened()
+
+    def record_trade_result(self, pnl_pct: float):
+        with self.lock:
+            self.local.record_trade_result(pnl_pct)
+            self.global_limiter.record_trade_result(pnl_pct)
+
+
+class MultiSymbolRunner:
+    """
+    Runs N live.trader.LiveTrader instances from one process on a shared
+    thread pool.
+
+    Plug on_candle_close / sync into a CandleCloseScheduler: every close
+    fans out to all symbols concurrently, and symbols whose candle is not
+    published yet are retried on the next scheduler retry without
+    re-running the ones already handled. Traders run concurrently, so they
+    must not share an exchange client unless it is thread-safe.
+    """
+
+    def __init__(self, traders: Iterable, max_workers: Optional[int] = None):
+        self.traders: List = list(traders)
+        if not self.traders:
+            raise ValueError("MultiSymbolRunner needs at least one trader.")
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers or len(self.traders),
+            thread_name_prefix="live-symbol",
+        )
+        self._close_ts: Optional[float] = None
+        self._pending: List = []
+
+    def _run_safely(self, fn, trader, *args):
+        try:
+            return fn(*args)
+        except Exception as exc:
+            log.error(f"{trader.symbol}: {exc}")
+            return False
+
+    def on_candle_close(self, close_ts: float) -> bool:
+        """Process close_ts for every symbol; True once all are done."""
+        if close_ts != self._close_ts:
+            self._close_ts = close_ts
+            self._pending = list(self.traders)
+
+        futures = [
+            (trader, self._pool.submit(self._run_safely, trader.on_candle_close, trader, close_ts))
+            for trader in self._pending
+        ]
+        self._pending = [trader for trader, future in futures if not future.result()]
+        if self._pending:
+            log.debug(
+                f"Waiting on closed candle for {', '.join(t.symbol for t in self._pending)}."
+            )
+        return not self._pending
+
+    def sync(self) -> None:
+        futures = [
+            self._pool.submit(self._run_safely, trader.sync, trader)
+            for trader in self.traders
+        ]
+        for future in futures:
+            future.result()
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True)
+
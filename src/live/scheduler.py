@@ -0,0 +1,137 @@
+"""
+Candle-close aligned scheduler for the live loop.
+
+Instead of polling every N seconds, the scheduler computes the next
+close of the configured timeframe and wakes up just after it:
+
+    close      -> wait `close_delay` seconds, then call on_close()
+    not ready  -> retry every `retry_seconds` until `max_wait_seconds`
+    in between -> call on_sync() every `sync_seconds` (position checks)
+
+Clock and sleep are injectable so the same schedule can run against
+wall time, a simulated exchange, or a virtual replay clock.
+"""
+
+import math
+import time
+from typing import Callable, Optional
+
+from utils.logger import log
+
+_TIMEFRAME_UNITS = {"m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def timeframe_to_seconds(timeframe: str) -> int:
+    """Convert a ccxt-style timeframe ("1m", "15m", "1h", "4h", "1d") to seconds."""
+    try:
+        amount = int(timeframe[:-1])
+        unit = _TIMEFRAME_UNITS[timeframe[-1]]
+    except (ValueError, KeyError, IndexError):
+        raise ValueError(f"Unsupported timeframe: {timeframe!r}")
+    if amount <= 0:
+        raise ValueError(f"Unsupported timeframe: {timeframe!r}")
+    return amount * unit
+
+
+def next_candle_close(now_ts: float, timeframe_seconds: int) -> float:
+    """Return the epoch second of the next candle close strictly after now_ts."""
+    return (math.floor(now_ts / timeframe_seconds) + 1) * timeframe_seconds
+
+
+class CandleCloseScheduler:
+    """
+    Drives a live loop on candle-close boundaries.
+
+    on_close(close_ts) receives the epoch second of the close that was just
+    reached and returns True once the closed candle has been processed
+    (False = candle not published yet, retry shortly).
+    on_sync() runs lighter position-sync checks between closes.
+    """
+
+    def __init__(
+        self,
+        timeframe: str,
+        on_close: Callable[[float], bool],
+        on_sync: Optional[Callable[[], None]] = None,
+        close_delay: float = 2.0,
+        retry_seconds: float = 2.0,
+        max_wait_seconds: float = 120.0,
+        sync_seconds: float = 60.0,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.timeframe = timeframe
+        self.timeframe_seconds = timeframe_to_seconds(timeframe)
+        self.on_close = on_close
+        self.on_sync = on_sync
+        self.close_delay = close_delay
+        self.retry_seconds = retry_seconds
+        self.max_wait_seconds = max_wait_seconds
+        self.sync_seconds = sync_seconds
+        self.clock = clock
+        self.sleep = sleep
+        self._running = False
+
+    def stop(self) -> None:
+        """Stop after the current wake-up (safe to call from callbacks)."""
+        self._running = False
+
+    def _sleep_until(self, target_ts: float) -> None:
+        delay = target_ts - self.clock()
+        if delay > 0:
+            self.sleep(delay)
+
+    def _handle_close(self, close_ts: float) -> bool:
+        """Call on_close until the closed candle is available or we give up."""
+        deadline = close_ts + self.max_wait_seconds
+        while self._running:
+            if self.on_close(close_ts):
+                return True
+            if self.clock() + self.retry_seconds > deadline:
+                log.warning(
+                    f"Closed candle not available {self.max_wait_seconds:.0f}s "
+                    f"after close — skipping until next close."
+                )
+                return False
+            self.sleep(self.retry_seconds)
+        return False
+
+    def run(self, max_closes: Optional[int] = None) -> int:
+        """
+        Run until stop() is called or max_closes closes have been handled.
+        Returns the number of closes handled.
+        """
+        self._running = True
+        closes = 0
+        next_close = next_candle_close(self.clock(), self.timeframe_seconds)
+        next_sync = self.clock() + self.sync_seconds
+
+        while self._running:
+            wake_ts = next_close + self.close_delay
+
+            if self.on_sync and self.sync_seconds > 0 and next_sync < wake_ts:
+                self._sleep_until(next_sync)
+                if not self._running:
+                    break
+                self.on_sync()
+                next_sync += self.sync_seconds
+                continue
+
+            self._sleep_until(wake_ts)
+            if not self._running:
+                break
+            self._handle_close(next_close)
+            closes += 1
+            if max_closes is not None and closes >= max_closes:
+                break
+
+            # Skip closes we missed (slow callbacks, suspended host).
+            next_close = max(
+                next_close + self.timeframe_seconds,
+                next_candle_close(self.clock() - self.close_delay, self.timeframe_seconds),
+            )
+            # The close handler already synced the position.
+            next_sync = self.clock() + self.sync_seconds
+
+        self._running = False
+        return closes
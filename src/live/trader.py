@@ -0,0 +1,201 @@
+import time
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Callable, List, Optional, Tuple
+
+import pandas as pd
+
+from data.market_data import MarketData
+from execution.live_broker import LiveBroker
+from filters.trade_limiter import TradeLimiter
+from live.multi_runner import CombinedTradeLimiter
+from live.scheduler import timeframe_to_seconds
+from strategy.base_strategy import BaseStrategy
+from strategy.variants import MeanReversionStrategy
+from utils.config import Config
+from utils.logger import log
+from utils.metrics import (
+    CLOSE_TO_DECISION,
+    DECISIONS,
+    POLLS,
+    SIGNAL_TO_ORDER,
+    STAGE_SECONDS,
+    STALE_CANDLES,
+)
+from utils.profiling import StageTimer
+
+
+class LiveTrader:
+    """
+    Per-symbol live decision logic, driven by the candle-close scheduler.
+
+    on_candle_close() fetches candles, keeps only fully closed ones and runs
+    strategy -> limiter -> broker once per new closed candle; the limiter
+    is checked at the candle's close time.
+    sync() is the lighter check used between closes to notice SL/TP exits,
+    marked at the current ticker price.
+
+    A trade slot is reserved in the limiter before the order is placed and
+    released if the order fails, so traders sharing a global limiter (see
+    live.multi_runner) only serialize on the counters, not on the order.
+    Time spent per stage is accumulated in self.timer and exported to
+    utils.metrics; with record_signals=True every decision is kept in
+    self.signals as (candle timestamp, side, reason). clock is the
+    scheduler's clock, used for close-to-decision latency.
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        data,
+        strategy: BaseStrategy,
+        limiter,
+        broker,
+        timeframe: str = "1h",
+        record_signals: bool = False,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.symbol = symbol
+        self.timeframe_seconds = timeframe_to_seconds(timeframe)
+        self.data = data
+        self.strategy = strategy
+        self.limiter = limiter
+        self.broker = broker
+        self.timer = StageTimer()
+        self.clock = clock
+        self.record_signals = record_signals
+        self.signals: List[Tuple[pd.Timestamp, str, str]] = []
+        self.last_candle_ts: Optional[pd.Timestamp] = None
+        self.mark_price: Optional[float] = None
+
+    @contextmanager
+    def _stage(self, name: str):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = perf_counter() - start
+            self.timer.add(name, elapsed)
+            STAGE_SECONDS.observe(elapsed, stage=name, symbol=self.symbol)
+
+    def on_candle_close(self, close_ts: float) -> bool:
+        """
+        Process the candle that closed at close_ts (epoch seconds).
+        Returns False while the exchange has not published it yet.
+        """
+        POLLS.inc(symbol=self.symbol)
+        with self._stage("fetch_ohlcv"):
+            candles = self.data.fetch_ohlcv()
+        if candles.empty:
+            log.warning(f"No candle data for {self.symbol} — retrying.")
+            return False
+
+        # Binance returns the still-forming candle last: it is the freshest
+        # price for marking exits, but decisions use closed candles only.
+        self.mark_price = float(candles["close"].iloc[-1])
+        expected_open = pd.Timestamp(close_ts - self.timeframe_seconds, unit="s")
+        candles = candles[candles["timestamp"] <= expected_open]
+        if candles.empty or candles["timestamp"].iloc[-1] < expected_open:
+            STALE_CANDLES.inc(symbol=self.symbol)
+            log.debug(f"Closed candle {expected_open} not published yet for {self.symbol}.")
+            return False
+
+        last_ts = candles["timestamp"].iloc[-1]
+
+        if self.last_candle_ts is not None and last_ts <= self.last_candle_ts:
+            return True
+
+        self.last_candle_ts = last_ts
+        with self._stage("generate_signal"):
+            signal = self.strategy.generate_signal(candles)
+        signal_at = perf_counter()
+        if self.record_signals:
+            self.signals.append((last_ts, signal.side, signal.reason))
+
+        with self._stage("sync_position"):
+            self.broker.sync_position(mark_price=self.mark_price, trade_limiter=self.limiter)
+
+        if signal.is_actionable() and not self.broker.has_open_position():
+            with self._stage("limiter"):
+                decided_at = pd.Timestamp(close_ts, unit="s")
+                reserved = self.limiter.reserve_trade(now_utc=decided_at)
+            if reserved:
+                opened = False
+                try:
+                    with self._stage("open_position"):
+                        opened = self.broker.open_position(
+                            side=signal.side,
+                            entry_price=float(signal.entry_price),
+                            stop_loss=float(signal.stop_loss),
+                            take_profit=float(signal.take_profit)
+                        )
+                finally:
+                    if not opened:
+                        self.limiter.release_trade(now_utc=decided_at)
+                if opened:
+                    SIGNAL_TO_ORDER.observe(perf_counter() - signal_at, symbol=self.symbol)
+
+        DECISIONS.inc(symbol=self.symbol, side=signal.side)
+        CLOSE_TO_DECISION.observe(max(self.clock() - close_ts, 0.0), symbol=self.symbol)
+        log.info(f"Signal for {self.symbol}: {signal.side} ({signal.reason})")
+        return True
+
+    def sync(self) -> None:
+        """Lightweight position check between candle closes."""
+        if self.mark_price is None:
+            return
+        with self._stage("fetch_mark_price"):
+            mark_price = self.data.fetch_mark_price()
+        if mark_price is not None:
+            self.mark_price = mark_price
+        with self._stage("sync_position"):
+            self.broker.sync_position(mark_price=self.mark_price, trade_limiter=self.limiter)
+
+
+def build_live_trader(
+    symbol: str,
+    client,
+    global_limiter=None,
+    trade_lock=None,
+    record_signals: bool = False,
+    clock: Callable[[], float] = time.time,
+) -> LiveTrader:
+    """
+    Assemble the live stack for one symbol from Config:
+    MarketData + MeanReversionStrategy + TradeLimiter + LiveBroker.
+    With a global_limiter, the per-symbol limiter is combined with it
+    (trade_lock guards the shared counters).
+    """
+    data = MarketData(
+        symbol,
+        timeframe=Config.LIVE_TIMEFRAME,
+        limit=Config.LIVE_CANDLE_LOOKBACK,
+        client=client
+    )
+    strategy = MeanReversionStrategy(
+        symbol,
+        atr_mult=Config.ATR_MULT,
+        rsi_low=Config.RSI_LOW,
+        rsi_high=Config.RSI_HIGH,
+        min_stretch=Config.MIN_STRETCH,
+        min_stretch_atr_mult=Config.MIN_STRETCH_ATR_MULT
+    )
+    limiter = TradeLimiter(
+        max_trades_per_day=Config.MAX_TRADES_PER_DAY,
+        max_daily_loss_pct=Config.MAX_DAILY_LOSS_PCT,
+        max_daily_profit_pct=Config.MAX_DAILY_PROFIT_PCT
+    )
+    if global_limiter is not None:
+        limiter = CombinedTradeLimiter(limiter, global_limiter, trade_lock)
+    broker = LiveBroker(
+        symbol=symbol,
+        leverage=Config.LIVE_LEVERAGE,
+        risk_per_trade=Config.RISK_PER_TRADE,
+        client=client
+    )
+    return LiveTrader(
+        symbol, data, strategy, limiter, broker,
+        timeframe=Config.LIVE_TIMEFRAME,
+        record_signals=record_signals,
+        clock=clock
+    )
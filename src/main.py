@@ -1,90 +1,109 @@
+import threading
 import time
 
-from data.market_data import MarketData
-from execution.live_broker import LiveBroker
+from data.market_data import create_client
 from filters.trade_limiter import TradeLimiter
-from strategy.variants import MeanReversionStrategy
+from live.multi_runner import MultiSymbolRunner
+from live.scheduler import CandleCloseScheduler
+from live.trader import build_live_trader
 from utils.config import Config
-from utils.logger import log
+from utils.logger import log, setup_logging
+from utils.metrics import start_http_server, start_summary_logger
+
+
+def _build_sim_exchange():
+    from execution.sim_exchange import SimulatedExchange
+
+    return SimulatedExchange.from_csv(
+        Config.PAPER_LIVE_DATA,
+        symbols=Config.LIVE_SYMBOLS,
+        timeframe=Config.LIVE_TIMEFRAME,
+        start=Config.PAPER_LIVE_START,
+        warmup_candles=Config.LIVE_CANDLE_LOOKBACK,
+        speed=Config.PAPER_LIVE_SPEED or None,
+        latency_seconds=Config.PAPER_LIVE_LATENCY_MS / 1000,
+        failure_rate=Config.PAPER_LIVE_FAILURE_RATE,
+    )
 
 
 def main():
-    if not Config.ENABLE_LIVE_TRADING:
+    setup_logging("live")
+
+    if Config.PAPER_LIVE:
+        log.info(f"=== Paper live loop (simulated exchange, data={Config.PAPER_LIVE_DATA}) ===")
+        client = _build_sim_exchange()
+    elif not Config.ENABLE_LIVE_TRADING:
         log.error("ENABLE_LIVE_TRADING=false. Set to true in .env to place live orders.")
         return
+    elif not Config.BINANCE_API_KEY or not Config.BINANCE_API_SECRET:
+        log.error("Binance API keys are required for live trading.")
+        return
+    else:
+        log.info("=== Live trading loop (auto execution enabled) ===")
+        client = None
 
-    log.info("=== Live trading loop (auto execution enabled) ===")
     log.info(
-        f"Config — fixed_notional={Config.FIXED_NOTIONAL_USDC:.2f}, "
+        f"Config — symbols={','.join(Config.LIVE_SYMBOLS)}, "
+        f"fixed_notional={Config.FIXED_NOTIONAL_USDC:.2f}, "
         f"max_margin_util={Config.MAX_MARGIN_UTILIZATION:.2f}, "
         f"min_order_notional={Config.MIN_ORDER_NOTIONAL_USDC:.2f}, "
         f"min_order_qty={Config.MIN_ORDER_QTY:.6f}, "
         f"leverage={Config.LIVE_LEVERAGE}"
     )
 
-    data = MarketData(
-        Config.LIVE_SYMBOL,
-        timeframe=Config.LIVE_TIMEFRAME,
-        limit=Config.LIVE_CANDLE_LOOKBACK
-    )
-    strategy = MeanReversionStrategy(
-        Config.LIVE_SYMBOL,
-        atr_mult=Config.ATR_MULT,
-        rsi_low=Config.RSI_LOW,
-        rsi_high=Config.RSI_HIGH,
-        min_stretch=Config.MIN_STRETCH,
-        min_stretch_atr_mult=Config.MIN_STRETCH_ATR_MULT
-    )
-    limiter = TradeLimiter(
-        max_trades_per_day=Config.MAX_TRADES_PER_DAY,
-        max_daily_loss_pct=Config.MAX_DAILY_LOSS_PCT,
-        max_daily_profit_pct=Config.MAX_DAILY_PROFIT_PCT
-    )
-    try:
-        broker = LiveBroker(
-            symbol=Config.LIVE_SYMBOL,
-            leverage=Config.LIVE_LEVERAGE,
-            risk_per_trade=Config.RISK_PER_TRADE
+    global_limiter = None
+    trade_lock = None
+    if len(Config.LIVE_SYMBOLS) > 1:
+        trade_lock = threading.RLock()
+        global_limiter = TradeLimiter(
+            max_trades_per_day=Config.GLOBAL_MAX_TRADES_PER_DAY,
+            max_daily_loss_pct=Config.GLOBAL_MAX_DAILY_LOSS_PCT,
+            max_daily_profit_pct=Config.GLOBAL_MAX_DAILY_PROFIT_PCT
         )
+
+    # In paper live mode everything follows the simulated exchange clock.
+    clock, sleep = (client.time, client.sleep) if Config.PAPER_LIVE else (time.time, time.sleep)
+    try:
+        # Symbols run on parallel worker threads and ccxt clients are not
+        # thread-safe, so each live symbol gets its own client. The
+        # simulated exchange locks internally and is shared.
+        traders = [
+            build_live_trader(symbol, client or create_client(), global_limiter, trade_lock, clock=clock)
+            for symbol in Config.LIVE_SYMBOLS
+        ]
     except ValueError as exc:
         log.error(str(exc))
         return
 
-    last_candle_ts = None
-
-    while True:
-        candles = data.fetch_ohlcv()
-        if candles.empty:
-            log.warning("No candle data — retrying.")
-            time.sleep(Config.LIVE_POLL_SECONDS)
-            continue
-
-        last = candles.iloc[-1]
-        last_ts = last["timestamp"]
-
-        if last_candle_ts is not None and last_ts <= last_candle_ts:
-            broker.sync_position(mark_price=float(last["close"]), trade_limiter=limiter)
-            time.sleep(Config.LIVE_POLL_SECONDS)
-            continue
-
-        last_candle_ts = last_ts
-        signal = strategy.generate_signal(candles)
+    if Config.METRICS_PORT:
+        start_http_server(Config.METRICS_PORT)
+    if Config.METRICS_SUMMARY_SECONDS > 0:
+        start_summary_logger(Config.METRICS_SUMMARY_SECONDS)
 
-        broker.sync_position(mark_price=float(last["close"]), trade_limiter=limiter)
-
-        if signal.is_actionable() and limiter.can_trade(now_utc=last_ts):
-            if not broker.has_open_position():
-                opened = broker.open_position(
-                    side=signal.side,
-                    entry_price=float(signal.entry_price),
-                    stop_loss=float(signal.stop_loss),
-                    take_profit=float(signal.take_profit)
-                )
-                if opened:
-                    limiter.record_trade_opened()
-
-        log.info(f"Signal for {Config.LIVE_SYMBOL}: {signal.side} ({signal.reason})")
-        time.sleep(Config.LIVE_POLL_SECONDS)
+    runner = MultiSymbolRunner(traders, max_workers=Config.LIVE_MAX_WORKERS or None)
+    scheduler = CandleCloseScheduler(
+        Config.LIVE_TIMEFRAME,
+        on_close=runner.on_candle_close,
+        on_sync=runner.sync,
+        close_delay=Config.LIVE_CLOSE_DELAY_SECONDS,
+        retry_seconds=Config.LIVE_CLOSE_RETRY_SECONDS,
+        max_wait_seconds=Config.LIVE_CLOSE_MAX_WAIT_SECONDS,
+        sync_seconds=Config.LIVE_POLL_SECONDS,
+        clock=clock,
+        sleep=sleep
+    )
+    log.info(
+        f"Scheduling decisions on {Config.LIVE_TIMEFRAME} closes "
+        f"(+{Config.LIVE_CLOSE_DELAY_SECONDS:.0f}s), position sync every {Config.LIVE_POLL_SECONDS}s."
+    )
+    try:
+        if Config.PAPER_LIVE:
+            scheduler.run(max_closes=client.remaining_closes())
+            client.log_stats()
+        else:
+            scheduler.run()
+    finally:
+        runner.shutdown()
 
 
 if __name__ == "__main__":
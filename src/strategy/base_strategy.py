@@ -1,5 +1,9 @@
 from abc import ABC, abstractmethod
+from typing import Sequence
+
 import pandas as pd
+
+from indicators.registry import DEFAULT_INDICATORS, IndicatorSpec
 from .signal import TradeSignal
 
 
@@ -11,6 +15,13 @@ class BaseStrategy(ABC):
     def __init__(self, symbol: str):
         self.symbol = symbol
 
+    def required_indicators(self) -> Sequence[IndicatorSpec]:
+        """
+        Indicator specs generate_signal() reads (see indicators.registry).
+        Backtests compute exactly these up front; the default is the full set.
+        """
+        return DEFAULT_INDICATORS
+
     @abstractmethod
     def generate_signal(self, candles: pd.DataFrame) -> TradeSignal:
         """
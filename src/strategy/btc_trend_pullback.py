@@ -1,6 +1,6 @@
 import pandas as pd
 
-from indicators.indicator_engine import add_indicators
+from indicators.registry import ensure_indicators, spec
 from strategy.base_strategy import BaseStrategy
 from strategy.regime import MarketRegime, detect_regime
 from strategy.signal import TradeSignal
@@ -20,12 +20,17 @@ class BTCTrendPullbackStrategy(BaseStrategy):
     def __init__(self, symbol: str = "BTC/USDC"):
         super().__init__(symbol)
 
+    def required_indicators(self):
+        return (
+            spec("ema", period=21), spec("ema", period=50),
+            spec("sma", period=200), spec("atr", period=self.ATR_PERIOD),
+        )
+
     def generate_signal(self, df: pd.DataFrame) -> TradeSignal:
         if df is None or df.empty or len(df) < 2:
             return TradeSignal(symbol=self.symbol, side="FLAT", reason="Insufficient data")
 
-        if "ema21" not in df.columns:
-            df = add_indicators(df.copy())
+        df = ensure_indicators(df, self.required_indicators())
         regime = detect_regime(df)
         last = df.iloc[-1]
         prev = df.iloc[-2]
@@ -26,6 +26,10 @@ def detect_regime(candles: pd.DataFrame) -> MarketRegime:
 
     last = candles.iloc[-1]
 
+    # Precomputed by add_regime() (batch backtests)
+    if "regime" in candles.columns:
+        return MarketRegime(last["regime"])
+
     # Must have indicators for regime detection
     required = ["sma200", "ema21", "ema50", "close"]
     if any(key not in last or pd.isna(last[key]) for key in required):
@@ -45,4 +49,25 @@ def detect_regime(candles: pd.DataFrame) -> MarketRegime:
         return MarketRegime.DOWNTREND
 
     # ---- Sideways ----
-    return MarketRegime.SIDEWAYS
\ No newline at end of file
+    return MarketRegime.SIDEWAYS
+
+def add_regime(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Vectorized detect_regime() for every row, stored as a "regime" column
+    of MarketRegime values (strings). Same rules as detect_regime.
+    """
+    close = df["close"]
+    sma200 = df["sma200"]
+    ema21 = df["ema21"]
+    ema50 = df["ema50"]
+
+    unknown = close.isna() | sma200.isna() | ema21.isna() | ema50.isna()
+    up = (close > sma200) & (ema21 > ema50)
+    down = (close < sma200) & (ema21 < ema50)
+
+    df["regime"] = np.select(
+        [unknown, up, down],
+        [MarketRegime.UNKNOWN.value, MarketRegime.UPTREND.value, MarketRegime.DOWNTREND.value],
+        default=MarketRegime.SIDEWAYS.value,
+    )
+    return df
@@ -1,11 +1,25 @@
 import pandas as pd
 
+from indicators.indicator_engine import range_columns
+
+
 def detect_range(candles: pd.DataFrame, lookback: int = 50):
     """
     Identify the recent trading range by looking back N candles.
     Returns (range_low, range_high) as floats.
+
+    Uses the precomputed range_high_<N> / range_low_<N> columns from the
+    indicator engine when present; falls back to scanning the last N rows.
     """
+    high_col, low_col = range_columns(lookback)
+    if high_col in candles.columns and low_col in candles.columns:
+        last = candles.iloc[-1]
+        range_high = last[high_col]
+        range_low = last[low_col]
+        if not (pd.isna(range_high) or pd.isna(range_low)):
+            return float(range_low), float(range_high)
+
     recent = candles.tail(lookback)
     range_low = float(recent["low"].min())
     range_high = float(recent["high"].max())
-    return range_low, range_high
\ No newline at end of file
+    return range_low, range_high
@@ -2,11 +2,15 @@ from typing import Iterable, Optional
 
 import pandas as pd
 
-from indicators.indicator_engine import add_indicators
+from indicators.registry import ensure_indicators, spec
 from strategy.base_strategy import BaseStrategy
 from strategy.regime import MarketRegime, detect_regime
+from strategy.sideways import detect_range
 from strategy.signal import TradeSignal
 
+# columns detect_regime() reads
+REGIME_INDICATORS = (spec("sma", period=200), spec("ema", period=21), spec("ema", period=50))
+
 
 class TrendBreakoutStrategy(BaseStrategy):
     """
@@ -20,12 +24,14 @@ class TrendBreakoutStrategy(BaseStrategy):
         self.lookback = lookback
         self.atr_mult = atr_mult
 
+    def required_indicators(self):
+        return REGIME_INDICATORS + (spec("atr", period=14), spec("range", period=self.lookback))
+
     def generate_signal(self, df: pd.DataFrame) -> TradeSignal:
         if df is None or df.empty or len(df) < self.lookback + 2:
             return TradeSignal(symbol=self.symbol, side="FLAT", reason="Insufficient data")
 
-        if "ema21" not in df.columns:
-            df = add_indicators(df.copy())
+        df = ensure_indicators(df, self.required_indicators())
 
         last = df.iloc[-1]
         prev = df.iloc[-2]
@@ -35,9 +41,7 @@ class TrendBreakoutStrategy(BaseStrategy):
         regime = detect_regime(df)
         atr = float(last["atr14"])
         close = float(last["close"])
-        recent = df.tail(self.lookback)
-        range_high = float(recent["high"].max())
-        range_low = float(recent["low"].min())
+        range_low, range_high = detect_range(df, self.lookback)
 
         if regime == MarketRegime.UPTREND and close > range_high:
             entry = close
@@ -86,6 +90,9 @@ class MeanReversionStrategy(BaseStrategy):
         min_stretch_atr_mult: Optional[float] = None,
         allowed_regimes: Optional[Iterable[MarketRegime]] = None,
         allowed_utc_hours: Optional[Iterable[int]] = None,
+        rsi_period: int = 14,
+        ema_period: int = 21,
+        atr_period: int = 14,
     ):
         super().__init__(symbol)
         self.atr_mult = atr_mult
@@ -95,22 +102,33 @@ class MeanReversionStrategy(BaseStrategy):
         self.min_stretch_atr_mult = min_stretch_atr_mult
         self.allowed_regimes = set(allowed_regimes) if allowed_regimes else None
         self.allowed_utc_hours = set(allowed_utc_hours) if allowed_utc_hours else None
+        self.rsi_spec = spec("rsi", period=rsi_period)
+        self.ema_spec = spec("ema", period=ema_period)
+        self.atr_spec = spec("atr", period=atr_period)
+
+    def required_indicators(self):
+        specs = (self.rsi_spec, self.ema_spec, self.atr_spec)
+        if self.allowed_regimes:
+            specs += tuple(item for item in REGIME_INDICATORS if item not in specs)
+        return specs
 
     def generate_signal(self, df: pd.DataFrame) -> TradeSignal:
         if df is None or df.empty or len(df) < 50:
             return TradeSignal(symbol=self.symbol, side="FLAT", reason="Insufficient data")
 
-        if "rsi14" not in df.columns:
-            df = add_indicators(df.copy())
+        df = ensure_indicators(df, self.required_indicators())
+        rsi_col, = self.rsi_spec.columns
+        ema_col, = self.ema_spec.columns
+        atr_col, = self.atr_spec.columns
 
         last = df.iloc[-1]
-        if pd.isna(last.get("atr14")) or pd.isna(last.get("rsi14")):
+        if pd.isna(last.get(atr_col)) or pd.isna(last.get(rsi_col)):
             return TradeSignal(symbol=self.symbol, side="FLAT", reason="Indicators not ready")
 
-        rsi = float(last["rsi14"])
+        rsi = float(last[rsi_col])
         close = float(last["close"])
-        ema21 = float(last["ema21"])
-        atr = float(last["atr14"])
+        ema21 = float(last[ema_col])
+        atr = float(last[atr_col])
 
         if self.allowed_regimes:
             regime = detect_regime(df)
@@ -168,12 +186,14 @@ class MomentumCrossoverStrategy(BaseStrategy):
         super().__init__(symbol)
         self.atr_mult = atr_mult
 
+    def required_indicators(self):
+        return REGIME_INDICATORS + (spec("atr", period=14),)
+
     def generate_signal(self, df: pd.DataFrame) -> TradeSignal:
         if df is None or df.empty or len(df) < 200:
             return TradeSignal(symbol=self.symbol, side="FLAT", reason="Insufficient data")
 
-        if "ema21" not in df.columns:
-            df = add_indicators(df.copy())
+        df = ensure_indicators(df, self.required_indicators())
 
         last = df.iloc[-1]
         prev = df.iloc[-2]
@@ -13,20 +13,40 @@ class Config:
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
     LIVE_SYMBOL = os.getenv("LIVE_SYMBOL", "BTC/USDC")
+    LIVE_SYMBOLS = [
+        s.strip() for s in os.getenv("LIVE_SYMBOLS", LIVE_SYMBOL).split(",") if s.strip()
+    ]
+    LIVE_MAX_WORKERS = int(os.getenv("LIVE_MAX_WORKERS", "0"))
     LIVE_TIMEFRAME = os.getenv("LIVE_TIMEFRAME", "1h")
     LIVE_CANDLE_LOOKBACK = int(os.getenv("LIVE_CANDLE_LOOKBACK", "200"))
     LIVE_POLL_SECONDS = int(os.getenv("LIVE_POLL_SECONDS", "60"))
+    LIVE_CLOSE_DELAY_SECONDS = float(os.getenv("LIVE_CLOSE_DELAY_SECONDS", "2"))
+    LIVE_CLOSE_RETRY_SECONDS = float(os.getenv("LIVE_CLOSE_RETRY_SECONDS", "2"))
+    LIVE_CLOSE_MAX_WAIT_SECONDS = float(os.getenv("LIVE_CLOSE_MAX_WAIT_SECONDS", "120"))
     LIVE_LEVERAGE = int(os.getenv("LIVE_LEVERAGE", "1"))
     RISK_PER_TRADE = float(os.getenv("RISK_PER_TRADE", "0.01"))
     MAX_TRADES_PER_DAY = int(os.getenv("MAX_TRADES_PER_DAY", "5"))
     MAX_DAILY_LOSS_PCT = float(os.getenv("MAX_DAILY_LOSS_PCT", "0.02"))
     MAX_DAILY_PROFIT_PCT = float(os.getenv("MAX_DAILY_PROFIT_PCT", "0.015"))
+    GLOBAL_MAX_TRADES_PER_DAY = int(os.getenv("GLOBAL_MAX_TRADES_PER_DAY", "10"))
+    GLOBAL_MAX_DAILY_LOSS_PCT = float(os.getenv("GLOBAL_MAX_DAILY_LOSS_PCT", "0.05"))
+    GLOBAL_MAX_DAILY_PROFIT_PCT = float(os.getenv("GLOBAL_MAX_DAILY_PROFIT_PCT", "0.05"))
     ENABLE_LIVE_TRADING = os.getenv("ENABLE_LIVE_TRADING", "false").lower() == "true"
+    METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+    METRICS_SUMMARY_SECONDS = float(os.getenv("METRICS_SUMMARY_SECONDS", "3600"))
+    PAPER_LIVE = os.getenv("PAPER_LIVE", "false").lower() == "true"
+    PAPER_LIVE_DATA = os.getenv("PAPER_LIVE_DATA", "data/binance_BTCUSDC_1h.csv")
+    PAPER_LIVE_START = os.getenv("PAPER_LIVE_START") or None
+    PAPER_LIVE_SPEED = float(os.getenv("PAPER_LIVE_SPEED", "0"))
+    PAPER_LIVE_LATENCY_MS = float(os.getenv("PAPER_LIVE_LATENCY_MS", "0"))
+    PAPER_LIVE_FAILURE_RATE = float(os.getenv("PAPER_LIVE_FAILURE_RATE", "0"))
     MAX_MARGIN_UTILIZATION = float(os.getenv("MAX_MARGIN_UTILIZATION", "0.5"))
     MIN_NOTIONAL_USDC = float(os.getenv("MIN_NOTIONAL_USDC", "5"))
     FIXED_NOTIONAL_USDC = float(os.getenv("FIXED_NOTIONAL_USDC", "0"))
     MIN_ORDER_QTY = float(os.getenv("MIN_ORDER_QTY", "0.001"))
     MIN_ORDER_NOTIONAL_USDC = float(os.getenv("MIN_ORDER_NOTIONAL_USDC", "100"))
+    DISABLE_JIT = os.getenv("DISABLE_JIT", "false").lower() == "true"
+    INDICATOR_CACHE_MB = float(os.getenv("INDICATOR_CACHE_MB", "256"))
 
     RSI_LOW = float(os.getenv("RSI_LOW", "32"))
     RSI_HIGH = float(os.getenv("RSI_HIGH", "68"))
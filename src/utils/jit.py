@@ -0,0 +1,54 @@
+"""
+Optional compiled kernels.
+
+Path-dependent loops (EMA recursion, exit scans, daily caps) are written
+once as plain Python loops decorated with @njit. If numba is installed
+they are compiled on first call (nopython, cached on disk); callers check
+JIT_ENABLED and otherwise use their NumPy implementation, so numba is
+never required.
+
+Detection only looks numba up (no import), so importing this module stays
+cheap. Set DISABLE_JIT=true to force the NumPy paths.
+"""
+
+import importlib.util
+from typing import Callable
+
+from utils.config import Config
+
+NUMBA_AVAILABLE = importlib.util.find_spec("numba") is not None
+JIT_ENABLED = NUMBA_AVAILABLE and not Config.DISABLE_JIT
+
+
+class _LazyJit:
+    """Compiles py_func with numba.njit on first call."""
+
+    def __init__(self, py_func: Callable, options: dict):
+        self.py_func = py_func
+        self.options = options
+        self._compiled = None
+        self.__name__ = py_func.__name__
+        self.__doc__ = py_func.__doc__
+
+    def __call__(self, *args):
+        if self._compiled is None:
+            import numba
+            self._compiled = numba.njit(**self.options)(self.py_func)
+        return self._compiled(*args)
+
+
+def njit(fn: Callable = None, **options):
+    """
+    @njit / @njit(fastmath=False): compiled loop when JIT_ENABLED, else the
+    Python function unchanged (still callable, e.g. by parity tests).
+    """
+    options = {"cache": True, "nogil": True, **options}
+
+    def wrap(py_func):
+        return _LazyJit(py_func, options) if JIT_ENABLED else py_func
+
+    return wrap(fn) if fn is not None else wrap
+
+
+def backend() -> str:
+    return "numba" if JIT_ENABLED else "numpy"
@@ -1,18 +1,117 @@
+"""
+Project logger (loguru) with run modes.
+
+setup_logging(mode) picks the sinks for a run:
+    default - stderr + daily-rotated logs/runtime.log (INFO)
+    live    - same sinks, enqueued so the trading thread never blocks on I/O
+    quiet   - stdout only, at `level` (WARNING by default) — backtests/sweeps
+    silent  - no sinks at all
+
+Importing this module has no side effects: until an entrypoint calls
+setup_logging(), loguru's default stderr sink is the only one.
+
+Hot paths guard message formatting with enabled(level), so disabled levels
+cost one comparison instead of an f-string plus a loguru call. A
+TraceBuffer can be installed to record structured events (columns, no
+text) via trace_event().
+"""
+
 from loguru import logger
 from pathlib import Path
+import sys
+from typing import Dict, List, Optional
+
+LEVELS = {
+    "TRACE": 5, "DEBUG": 10, "INFO": 20, "SUCCESS": 25,
+    "WARNING": 30, "ERROR": 40, "CRITICAL": 50,
+}
+SILENT = 100
+
+# lowest level any configured sink accepts (loguru's default stderr sink is DEBUG)
+_min_level_no = LEVELS["DEBUG"]
+_trace: Optional["TraceBuffer"] = None
+
+
+class TraceBuffer:
+    """
+    Columnar event recorder: one list per field, rows padded with None.
+    Nothing is formatted until to_frame() is called.
+    """
+
+    def __init__(self):
+        self.columns: Dict[str, List] = {"event": []}
+        self.rows = 0
+
+    def record(self, event: str, **fields) -> None:
+        columns = self.columns
+        for name, value in fields.items():
+            column = columns.get(name)
+            if column is None:
+                column = columns[name] = [None] * self.rows
+            column.append(value)
+        columns["event"].append(event)
+        self.rows += 1
+        for column in columns.values():
+            if len(column) < self.rows:
+                column.append(None)
+
+    def clear(self) -> None:
+        self.columns = {"event": []}
+        self.rows = 0
+
+    def to_frame(self):
+        import pandas as pd
+        return pd.DataFrame(self.columns)
+
+
+def enabled(level: str) -> bool:
+    """True if some sink would emit `level`; use it to skip building messages."""
+    return LEVELS[level] >= _min_level_no
+
+
+def trace_event(event: str, **fields) -> None:
+    """Record a structured event if a TraceBuffer is installed."""
+    if _trace is not None:
+        _trace.record(event, **fields)
+
+
+def setup_logging(
+    mode: str = "default",
+    level: Optional[str] = None,
+    log_dir: str = "logs",
+    trace: Optional[TraceBuffer] = None,
+) -> Optional[TraceBuffer]:
+    """Replace all sinks for the given mode; returns the installed TraceBuffer."""
+    global _min_level_no, _trace
+
+    logger.remove()
+    if mode in ("default", "live"):
+        enqueue = mode == "live"
+        console_level = level or "DEBUG"
+        Path(log_dir).mkdir(parents=True, exist_ok=True)
+        logger.add(sys.stderr, level=console_level, enqueue=enqueue)
+        logger.add(
+            Path(log_dir) / "runtime.log",
+            rotation="1 day",
+            retention="7 days",
+            level="INFO",
+            enqueue=enqueue,
+            backtrace=True,
+            # variable dumps in tracebacks are slow and leak values in live logs
+            diagnose=not enqueue,
+        )
+        _min_level_no = min(LEVELS[console_level], LEVELS["INFO"])
+    elif mode == "quiet":
+        level = level or "WARNING"
+        logger.add(lambda msg: print(msg, end=""), level=level)
+        _min_level_no = LEVELS[level]
+    elif mode == "silent":
+        _min_level_no = SILENT
+    else:
+        raise ValueError(f"Unknown logging mode: {mode}")
+
+    _trace = trace
+    return trace
+
 
-# Create logs directory if it doesn't exist
-log_dir = Path("logs")
-log_dir.mkdir(exist_ok=True)
-
-# Configure logger
-logger.add(
-    log_dir / "runtime.log",
-    rotation="1 day",       # new file each day
-    retention="7 days",     # keep logs for a week
-    level="INFO",
-    backtrace=True,
-    diagnose=True
-)
-
-log = logger
\ No newline at end of file
+log = logger
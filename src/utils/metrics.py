@@ -0,0 +1,244 @@
+"""
+Lightweight in-process metrics for the live bot.
+
+Counters, gauges and latency histograms with optional labels, rendered in
+the Prometheus text exposition format on a local HTTP endpoint and as a
+periodic log summary. Standard library only, thread-safe.
+"""
+
+import bisect
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import perf_counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from utils.logger import log
+
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    items = key + extra
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in items) + "}"
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(_label_key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{_format_labels(k)} {v:g}" for k, v in self._values.items()]
+
+    def summary(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{_format_labels(k)}={v:g}" for k, v in self._values.items()]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        # per label set: [bucket counts..., +Inf count], sum, count
+        self._series: Dict[LabelKey, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_key(labels)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][idx] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        series = self._series.get(_label_key(labels))
+        return series[2] if series else 0
+
+    def quantile(self, q: float, **labels) -> Optional[float]:
+        """Upper bucket bound containing the q-quantile (bucket resolution)."""
+        series = self._series.get(_label_key(labels))
+        if not series or not series[2]:
+            return None
+        target = q * series[2]
+        seen = 0
+        for bound, n in zip(self.buckets + (float("inf"),), series[0]):
+            seen += n
+            if seen >= target:
+                return bound
+        return float("inf")
+
+    def render(self) -> List[str]:
+        lines = []
+        with self._lock:
+            for key, (counts, total, n) in self._series.items():
+                cumulative = 0
+                for bound, c in zip(self.buckets, counts):
+                    cumulative += c
+                    lines.append(f"{self.name}_bucket{_format_labels(key, (('le', f'{bound:g}'),))} {cumulative}")
+                lines.append(f"{self.name}_bucket{_format_labels(key, (('le', '+Inf'),))} {n}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {total:.6f}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {n}")
+        return lines
+
+    def summary(self) -> List[str]:
+        out = []
+        for key, (_, total, n) in list(self._series.items()):
+            labels = dict(key)
+            p50 = self.quantile(0.5, **labels)
+            p95 = self.quantile(0.95, **labels)
+            out.append(
+                f"{self.name}{_format_labels(key)} n={n} mean={total / n * 1000:.1f}ms "
+                f"p50<={p50 * 1000:.0f}ms p95<={p95 * 1000:.0f}ms"
+            )
+        return out
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name: str, help_text: str, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help_text, **kwargs)
+            return metric
+
+    def counter(self, name: str, help_text: str = "") -> Counter:
+        return self._get(Counter, name, help_text)
+
+    def gauge(self, name: str, help_text: str = "") -> Gauge:
+        return self._get(Gauge, name, help_text)
+
+    def histogram(self, name: str, help_text: str = "", buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, help_text, buckets=buckets)
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> str:
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.summary())
+        return "\n".join(lines)
+
+
+registry = MetricsRegistry()
+
+# ---- Live bot metrics ----
+POLLS = registry.counter("live_polls_total", "Candle polls made by the live loop")
+STALE_CANDLES = registry.counter("live_stale_candles_total", "Polls where the closed candle was not published yet")
+DECISIONS = registry.counter("live_decisions_total", "Closed candles decided on")
+ORDERS = registry.counter("live_orders_total", "Orders sent to the exchange")
+ERRORS = registry.counter("live_errors_total", "Errors by call site")
+STAGE_SECONDS = registry.histogram("live_stage_seconds", "Live loop stage latency")
+CLOSE_TO_DECISION = registry.histogram(
+    "live_close_to_decision_seconds", "Candle close to finished decision",
+)
+SIGNAL_TO_ORDER = registry.histogram("live_signal_to_order_seconds", "Actionable signal to entry order sent")
+EXCHANGE_SECONDS = registry.histogram("exchange_call_seconds", "Exchange call latency")
+EXCHANGE_WEIGHT = registry.gauge("exchange_used_weight_1m", "Binance request weight used in the last minute")
+
+
+def record_exchange_weight(client) -> None:
+    """Update the used-weight gauge from the last Binance response headers."""
+    headers = getattr(client, "last_response_headers", None) or {}
+    for key, value in headers.items():
+        if key.lower() == "x-mbx-used-weight-1m":
+            try:
+                EXCHANGE_WEIGHT.set(float(value))
+            except (TypeError, ValueError):
+                pass
+            return
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_http_server(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve /metrics on a daemon thread."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    log.info(f"Metrics available at http://{host}:{server.server_port}/metrics")
+    return server
+
+
+def start_summary_logger(interval_seconds: float) -> threading.Event:
+    """Log registry.summary() every interval_seconds; set the returned event to stop."""
+    stop = threading.Event()
+
+    def _loop():
+        while not stop.wait(interval_seconds):
+            text = registry.summary()
+            if text:
+                log.info("Metrics summary:\n" + text)
+
+    threading.Thread(target=_loop, name="metrics-summary", daemon=True).start()
+    return stop
@@ -0,0 +1,60 @@
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Dict, List
+
+
+class StageTimer:
+    """
+    Accumulates wall time and call counts per named stage.
+
+    Cheap enough for hot paths: one perf_counter() pair and two dict
+    updates per stage.
+    """
+
+    def __init__(self):
+        self.seconds: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+
+    def add(self, stage: str, seconds: float, calls: int = 1) -> None:
+        self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+        self.calls[stage] = self.calls.get(stage, 0) + calls
+
+    @contextmanager
+    def stage(self, name: str):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, perf_counter() - start)
+
+    def merge(self, other: "StageTimer") -> None:
+        for name, seconds in other.seconds.items():
+            self.add(name, seconds, other.calls.get(name, 0))
+
+    def reset(self) -> None:
+        self.seconds.clear()
+        self.calls.clear()
+
+    def rows(self) -> List[dict]:
+        """Stages sorted by total time, with per-call means and shares."""
+        total = sum(self.seconds.values()) or 1.0
+        rows = []
+        for name, seconds in sorted(self.seconds.items(), key=lambda kv: kv[1], reverse=True):
+            calls = self.calls.get(name, 0)
+            rows.append({
+                "stage": name,
+                "calls": calls,
+                "total_s": seconds,
+                "mean_us": (seconds / calls * 1e6) if calls else 0.0,
+                "share": seconds / total,
+            })
+        return rows
+
+    def format_table(self) -> str:
+        lines = [f"{'Stage':<28}{'Calls':>10}{'Total s':>12}{'Mean us':>12}{'Share':>8}"]
+        for row in self.rows():
+            lines.append(
+                f"{row['stage']:<28}{row['calls']:>10}{row['total_s']:>12.3f}"
+                f"{row['mean_us']:>12.1f}{row['share']:>8.1%}"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+
+from backtesting import consistency_sweep, live_config_sweep
+from backtesting.analytics import (
+    breakdown,
+    daily_returns,
+    drawdown_series,
+    metrics,
+    rolling_metrics,
+    trade_arrays,
+)
+from backtesting.engine import BacktestEngine
+from backtesting.run_window_backtests import year_windows
+from backtesting.session_state import SessionState, TradeRecord
+from data.synthetic_data import synthetic_ohlcv
+from indicators.indicator_engine import add_indicators
+from strategy.variants import MeanReversionStrategy
+
+
+def _session(pnls, start="2024-01-01", hours=6):
+    session = SessionState()
+    for i, pnl in enumerate(pnls):
+        exit_ts = pd.Timestamp(start, tz="UTC") + pd.Timedelta(hours=hours * (i + 1))
+        session.record_trade(TradeRecord(
+            "BTC/USDC", "LONG" if i % 2 else "SHORT", 1.0, 1.0, float(pnl), "test", exit_ts,
+            entry_timestamp=exit_ts - pd.Timedelta(hours=2),
+        ))
+    return session
+
+
+def _backtest():
+    candles = add_indicators(synthetic_ohlcv(24 * 200, seed=3))
+    return candles, BacktestEngine(MeanReversionStrategy("BTC/USDC"), "BTC/USDC").run(candles)
+
+
+def test_metrics_agree_with_session_summary():
+    _, session = _backtest()
+    summary = session.summary()
+    result = metrics(session)
+    assert result["trades"] == summary["total_trades"] > 0
+    assert abs(result["total_return"] - summary["return_pct"]) < 1e-12
+    assert abs(result["max_drawdown"] - summary["max_drawdown_pct"]) < 1e-12
+    assert abs(result["win_rate"] - summary["win_rate"]) < 1e-12
+    assert abs(result["expectancy"] - summary["expectancy_pct"]) < 1e-12
+    assert abs((1 + daily_returns(session)).prod() - 1 - summary["return_pct"]) < 1e-9
+    assert all(trade.entry_timestamp <= trade.timestamp for trade in session.trades)
+
+
+def test_drawdown_series_matches_running_peak():
+    equity = [1.0, 1.1, 0.99, 1.2, 0.9, 1.3]
+    expected, peak = [], equity[0]
+    for value in equity:
+        peak = max(peak, value)
+        expected.append((value - peak) / peak)
+    np.testing.assert_allclose(drawdown_series(equity), expected)
+
+
+def test_ratios_and_drawdown_duration_on_a_known_series():
+    # one trade per day: +2%, -1%, -1%, +3%
+    session = _session([0.02, -0.01, -0.01, 0.03], hours=24)
+    result = metrics(session)
+    daily = daily_returns(session).to_numpy()
+    np.testing.assert_allclose(daily, [0.0, 0.02, -0.01, -0.01, 0.03], atol=1e-12)
+    expected_sharpe = daily.mean() / daily.std(ddof=1) * np.sqrt(365)
+    assert abs(result["sharpe"] - expected_sharpe) < 1e-9
+    assert abs(result["profit_factor"] - 0.05 / 0.02) < 1e-12
+    assert abs(result["payoff_ratio"] - 0.025 / 0.01) < 1e-12
+    assert result["max_drawdown_duration_trades"] == 2
+    assert result["max_drawdown_duration_days"] == 2.0
+    assert result["sortino"] > result["sharpe"] > 0
+
+
+def test_rolling_metrics_match_pandas():
+    pnls = np.random.default_rng(1).normal(0.001, 0.02, 120)
+    rolling = rolling_metrics(_session(pnls), window=20)
+    reference = pd.Series(pnls).rolling(20)
+    assert len(rolling) == 101
+    np.testing.assert_allclose(rolling["mean_pnl"], reference.mean().dropna(), atol=1e-12)
+    np.testing.assert_allclose(rolling["sharpe"], (reference.mean() / reference.std()).dropna(), atol=1e-9)
+    assert (rolling["drawdown"] <= 0).all()
+
+
+def test_breakdowns_use_entry_time_and_cover_every_trade():
+    session = _session([0.01, -0.02, 0.03, 0.01])
+    by_hour = breakdown(session, "hour")
+    assert by_hour.index.tolist() == [4, 10, 16, 22]       # exits at 6/12/18/24h, entries 2h earlier
+    assert by_hour["trades"].sum() == 4
+    by_side = breakdown(session, "side")
+    assert abs(by_side.loc["SHORT", "total_return"] - (1.01 * 1.03 - 1)) < 1e-12
+    assert abs(by_side.loc["LONG", "profit_factor"] - 0.01 / 0.02) < 1e-12
+
+    candles, session = _backtest()
+    by_regime = breakdown(trade_arrays(session), "regime", candles=candles)
+    assert by_regime["trades"].sum() == len(session.trades)
+    assert set(by_regime.index) <= {"UPTREND", "DOWNTREND", "SIDEWAYS"}
+
+
+def test_sweeps_rank_by_any_metric():
+    candles = add_indicators(synthetic_ohlcv(24 * 120, seed=1))
+    configs = [live_config_sweep.SweepConfig(30.0, 70.0, atr_mult, 0.004) for atr_mult in (0.8, 1.2)]
+    ranked = live_config_sweep.sweep_candles(candles, configs, rank_by="sortino")
+    assert ranked["sortino"].is_monotonic_decreasing
+    assert {"sharpe", "calmar", "profit_factor", "max_drawdown_duration_days"} <= set(ranked.columns)
+
+    windows = year_windows(2000, 2000, "2000-04-30")
+    config = consistency_sweep.SweepConfig(30.0, 70.0, 1.0, 0.004, None, None, None)
+    row = consistency_sweep.sweep_windows(candles, windows, [config], rank_by="median_sharpe").iloc[0]
+    assert row["worst_max_drawdown"] <= 0
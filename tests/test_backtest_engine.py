@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+from backtesting.engine import BacktestEngine
+from filters.trade_limiter import TradeLimiter
+from filters.trading_calendar import TradingDayCalendar
+from indicators.indicator_engine import add_indicators
+from strategy.variants import MeanReversionStrategy
+
+
+def _candles(n=1500, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, size=n)))
+    open_ = np.r_[close[0], close[:-1]]
+    spread = np.abs(rng.normal(0.0, 0.006, size=n)) * close
+    df = pd.DataFrame({
+        "timestamp": pd.date_range("2024-01-01", periods=n, freq="h"),
+        "open": open_,
+        "high": np.maximum(open_, close) + spread,
+        "low": np.minimum(open_, close) - spread,
+        "close": close,
+        "volume": 1.0,
+    })
+    return add_indicators(df)
+
+
+def _run(candles, fast_forward):
+    limiter = TradeLimiter(
+        max_trades_per_day=1, max_daily_loss_pct=0.005, max_daily_profit_pct=0.005,
+        log_resets=False, log_blocks=False,
+        calendar=TradingDayCalendar.for_timestamps(candles["timestamp"]),
+    )
+    strategy = MeanReversionStrategy(rsi_low=40, rsi_high=60, min_stretch=0.0)
+    engine = BacktestEngine(strategy, "BTC/USDC", limiter=limiter, fast_forward=fast_forward)
+    return engine, engine.run(candles)
+
+
+def test_fast_forward_matches_full_loop():
+    candles = _candles()
+    slow_engine, slow = _run(candles, fast_forward=False)
+    fast_engine, fast = _run(candles, fast_forward=True)
+
+    assert len(slow.trades) > 5
+    assert fast.trades == slow.trades
+    assert fast_engine.bars_skipped > 0
+    assert fast_engine.bars_evaluated < slow_engine.bars_evaluated
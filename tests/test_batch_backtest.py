@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+from backtesting.batch_backtest import build_shared_features, run_strategies
+from backtesting.engine import BacktestEngine
+from filters.trade_limiter import TradeLimiter
+from filters.trading_calendar import TradingDayCalendar
+from indicators.indicator_engine import add_indicators
+from strategy.regime import MarketRegime, detect_regime
+from strategy.variants import MeanReversionStrategy, MomentumCrossoverStrategy, TrendBreakoutStrategy
+
+
+def _candles(n=900, seed=5):
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, size=n)))
+    spread = np.abs(rng.normal(0.0, 0.006, size=n)) * close
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2024-01-01", periods=n, freq="h"),
+        "open": close, "high": close + spread, "low": close - spread,
+        "close": close, "volume": 1.0,
+    })
+
+
+def test_shared_features_match_per_bar_computation():
+    raw = _candles()
+    plain = add_indicators(raw.copy())
+    features = build_shared_features(raw, range_lookbacks=(20,))
+    breakout = TrendBreakoutStrategy(lookback=20)
+
+    for i in range(150, len(raw), 37):
+        assert detect_regime(features.iloc[:i]) == detect_regime(plain.iloc[:i])
+        assert breakout.generate_signal(features.iloc[:i]) == breakout.generate_signal(plain.iloc[:i])
+    assert MarketRegime(features["regime"].iloc[0]) == MarketRegime.UNKNOWN
+
+
+def test_run_strategies_matches_sequential_engine():
+    raw = _candles()
+    strategies = [
+        ("MeanRev", MeanReversionStrategy(rsi_low=40, rsi_high=60, min_stretch=0.0)),
+        ("Momentum", MomentumCrossoverStrategy()),
+    ]
+    results = run_strategies(raw, strategies, "BTC/USDC", max_workers=1)
+
+    plain = add_indicators(raw.copy())
+    for result, (_, strategy) in zip(results, strategies):
+        limiter = TradeLimiter(
+            log_resets=False, log_blocks=False,
+            calendar=TradingDayCalendar.for_timestamps(plain["timestamp"]),
+        )
+        expected = BacktestEngine(strategy, "BTC/USDC", limiter=limiter).run(plain)
+        assert result.session.trades == expected.trades
+        assert result.bars_per_sec > 0
+
+
+def test_process_pool_matches_sequential_run():
+    raw = _candles()
+    strategies = [
+        ("MeanRev", MeanReversionStrategy(rsi_low=40, rsi_high=60, min_stretch=0.0)),
+        ("Momentum", MomentumCrossoverStrategy()),
+    ]
+    sequential = run_strategies(raw, strategies, "BTC/USDC", max_workers=1)
+    pooled = run_strategies(raw, strategies, "BTC/USDC", max_workers=2)
+
+    assert [r.name for r in pooled] == [r.name for r in sequential]
+    for got, expected in zip(pooled, sequential):
+        assert got.session.trades == expected.session.trades
+    assert any(r.session.trades for r in pooled)
@@ -0,0 +1,52 @@
+import json
+import sys
+
+from benchmarks.harness import ROOT, SRC, compare_results, merge_processes, regressions, run_interleaved
+
+
+def _row(case, runs, peak_mb=10.0, bars=1000):
+    return {"case": case, "bars": bars, "runs": runs, "peak_mb": peak_mb}
+
+
+BASE = [
+    _row("loop", [1.00, 1.02, 0.98, 1.01, 0.99]),
+    _row("signals", [0.50, 0.52, 0.49, 0.51, 0.50]),
+    _row("gone", [1.0, 1.0, 1.0]),
+]
+
+
+def test_within_noise_passes_and_clear_slowdown_fails():
+    current = [
+        _row("loop", [1.05, 1.07, 1.04, 1.06, 1.05]),      # +5%: inside the tolerance
+        _row("signals", [0.80, 0.82, 0.79, 0.81, 0.80]),   # +60%
+        _row("added", [1.0, 1.0, 1.0]),
+    ]
+    rows = {row["key"]: row for row in compare_results(BASE, current)}
+    assert rows["loop@1000"]["status"] == "ok"
+    assert rows["signals@1000"]["status"] == "slower"
+    assert rows["added@1000"]["status"] == "new"
+    assert rows["gone@1000"]["status"] == "missing"
+    assert [row["key"] for row in regressions(rows.values())] == ["signals@1000"]
+
+
+def test_single_outlier_and_memory_growth():
+    # one slow run moves neither the median nor Q1 past the baseline box
+    outlier = [_row("loop", [1.0, 1.01, 0.99, 1.0, 9.0])]
+    assert regressions(compare_results(BASE, outlier)) == []
+
+    bloated = [_row("loop", [1.0, 1.0, 1.0, 1.0, 1.0], peak_mb=25.0)]
+    assert compare_results(BASE, bloated)[0]["status"] == "memory"
+
+
+def test_unchanged_tree_passes_the_interleaved_gate():
+    spec = {
+        "settings": {"sizes": [20_000], "repeat": 3, "loop_bars": 1_500, "signal_bars": 300},
+        "cases": ["add_indicators[pandas]", "MeanReversionStrategy.generate_signal"],
+    }
+    command = [sys.executable, str(ROOT / "benchmarks" / "regression_gate.py"), "--measure", json.dumps(spec)]
+    reports = run_interleaved(command, {"baseline": SRC, "current": SRC}, rounds=3)
+
+    baseline, current = merge_processes(reports["baseline"]), merge_processes(reports["current"])
+    assert all(len(row["runs"]) == 3 for row in baseline + current)
+    rows = compare_results(baseline, current)
+    assert [row["status"] for row in rows] == ["ok", "ok"]
@@ -0,0 +1,31 @@
+import json
+import os
+import subprocess
+import sys
+
+from conftest import SRC_ROOT
+
+IMPORT_BUDGET_SECONDS = 3.0
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import backtesting.run_backtest, backtesting.engine, backtesting.live_config_sweep
+import data.market_data, data.historical_data, live.trader, utils.logger
+import main, backtesting.live_replay, execution.sim_exchange
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "modules": sorted(m for m in ("matplotlib", "ccxt") if m in sys.modules)}))
+"""
+
+
+def test_core_imports_are_lazy_and_fast(tmp_path):
+    env = dict(os.environ, PYTHONPATH=SRC_ROOT)
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE], cwd=tmp_path, env=env,
+        capture_output=True, text=True, check=True,
+    )
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+
+    assert result["modules"] == []
+    assert not (tmp_path / "logs").exists()
+    assert result["elapsed"] < IMPORT_BUDGET_SECONDS
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+from indicators import indicator_engine as ie
+from indicators import registry
+from indicators.registry import (
+    cache_info,
+    clear_cache,
+    compute_indicators,
+    ensure_indicators,
+    spec,
+)
+from strategy.variants import MeanReversionStrategy
+
+
+def _candles(n=400, seed=5):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2024-01-01", periods=n, freq="h", tz="UTC"),
+        "open": close,
+        "high": close + rng.uniform(0.1, 1.0, n),
+        "low": close - rng.uniform(0.1, 1.0, n),
+        "close": close,
+        "volume": np.ones(n),
+    })
+
+
+def test_default_set_matches_indicator_functions():
+    df = _candles()
+    out = ie.add_indicators(df.copy())
+    line, signal, hist = ie.macd(df["close"])
+
+    pd.testing.assert_series_equal(out["sma200"], ie.sma(df["close"], 200), check_names=False)
+    pd.testing.assert_series_equal(out["ema50"], ie.ema(df["close"], 50), check_names=False)
+    pd.testing.assert_series_equal(out["rsi14"], ie.rsi(df["close"], 14), check_names=False)
+    pd.testing.assert_series_equal(out["atr14"], ie.atr(df, 14), check_names=False)
+    pd.testing.assert_series_equal(out["macd_hist"], hist, check_names=False)
+    assert "ema12" not in out.columns  # MACD inputs stay internal
+
+
+def test_memoized_and_dependencies_shared():
+    df = _candles()
+    clear_cache()
+    compute_indicators(df, [spec("ema", period=12)])
+    assert cache_info() == {"hits": 0, "misses": 1, "entries": 1, "bytes": 400 * 8}
+
+    # MACD reuses the cached ema12, computes ema26 and itself
+    compute_indicators(df, [spec("macd")])
+    assert cache_info()["hits"] == 1
+    assert cache_info()["misses"] == 3
+
+    # same prices in a new frame -> all hits
+    compute_indicators(df.copy(), [spec("macd")])
+    assert cache_info()["misses"] == 3
+
+
+
+def test_cache_is_bounded_by_bytes(monkeypatch):
+    df = _candles()
+    clear_cache()
+    monkeypatch.setattr(registry, "CACHE_MAX_BYTES", 2 * 400 * 8)
+    for period in (5, 10, 20):
+        compute_indicators(df, [spec("ema", period=period)])
+    assert cache_info()["entries"] == 2 and cache_info()["bytes"] == 2 * 400 * 8
+
+    # ema5 was evicted first (least recently used); ema20 is still cached
+    compute_indicators(df, [spec("ema", period=20)])
+    compute_indicators(df, [spec("ema", period=5)])
+    assert cache_info()["hits"] == 1 and cache_info()["misses"] == 4
+
+    # an entry larger than the whole budget is computed but not cached
+    monkeypatch.setattr(registry, "CACHE_MAX_BYTES", 100)
+    clear_cache()
+    compute_indicators(df, [spec("ema", period=5)])
+    assert cache_info()["entries"] == 0 and cache_info()["bytes"] == 0
+
+def test_ensure_adds_only_missing_and_handles_sliced_index():
+    df = _candles().iloc[100:]
+    out = ensure_indicators(df, [spec("rsi", period=7)])
+    assert out is not df
+    assert list(out.columns) == list(df.columns) + ["rsi7"]
+    expected = ie.rsi(df["close"].reset_index(drop=True), 7).to_numpy()
+    np.testing.assert_allclose(out["rsi7"].to_numpy(), expected, equal_nan=True)
+    assert ensure_indicators(out, [spec("rsi", period=7)]) is out
+
+
+def test_strategy_with_custom_periods():
+    strat = MeanReversionStrategy(rsi_period=7, ema_period=10, rsi_low=45, rsi_high=55, min_stretch=0.0)
+    assert [s.columns[0] for s in strat.required_indicators()] == ["rsi7", "ema10", "atr14"]
+    signal = strat.generate_signal(_candles())
+    assert signal.reason != "Indicators not ready"
@@ -1,5 +1,9 @@
+import numpy as np
 import pandas as pd
-from indicators.indicator_engine import add_indicators
+
+from indicators.indicator_engine import add_indicators, add_range
+from strategy.sideways import detect_range
+
 
 def test_indicator_engine_basic():
     # minimal fake data: 300 candles ascending
@@ -20,3 +24,16 @@ def test_indicator_engine_basic():
     assert not last["sma200"] is None
     assert not last["rsi14"] is None
     assert not last["atr14"] is None
+
+
+def test_rolling_range_matches_detect_range():
+    rng = np.random.default_rng(2)
+    close = 100 + np.cumsum(rng.normal(0, 1, 300))
+    df = pd.DataFrame({"high": close + 1.0, "low": close - 1.0})
+    add_range(df, 20)
+
+    for i in range(19, len(df)):
+        expected = (df["range_low_20"].iloc[i], df["range_high_20"].iloc[i])
+        assert expected == (df["low"].iloc[i - 19:i + 1].min(), df["high"].iloc[i - 19:i + 1].max())
+        assert detect_range(df.iloc[:i + 1], 20) == expected
+        assert detect_range(df[["high", "low"]].iloc[:i + 1], 20) == expected
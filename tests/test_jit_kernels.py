@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from execution.paper_broker import Position, _first_exit_loop, _first_exit_numpy, first_exit_bar
+from filters.trade_limiter import _daily_limit_loop, daily_limit_mask
+from indicators import numpy_backend as nb
+from utils import jit
+
+KERNELS = [nb._ema_loop, _first_exit_loop, _daily_limit_loop]
+
+
+def _py(kernel):
+    # the plain Python loop, whether or not numba compiled it
+    return getattr(kernel, "py_func", kernel)
+
+
+def _prices(n=400, seed=9):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    return close, close + rng.uniform(0.1, 2, n), close - rng.uniform(0.1, 2, n)
+
+
+def test_ema_loop_matches_numpy_path():
+    close, _, _ = _prices()
+    alpha = 2.0 / 22
+    loop = _py(nb._ema_loop)(close, alpha, np.empty(len(close)))
+    np.testing.assert_allclose(loop, nb._ema_row(close, 21, np.empty(len(close)), nb.EMA_MAX_BLOCK), rtol=1e-12)
+    np.testing.assert_allclose(loop, pd.Series(close).ewm(span=21, adjust=False).mean(), rtol=1e-12)
+
+
+@pytest.mark.parametrize("side", ["LONG", "SHORT"])
+def test_first_exit_scans_agree(side):
+    close, high, low = _prices(seed=4)
+    for start in range(0, 350, 7):
+        price = close[start]
+        sign = 1 if side == "LONG" else -1
+        for width in (0.5, 3.0, 50.0):
+            position = Position("BTC/USDC", side, price, price - sign * width, price + sign * width)
+            args = (side == "LONG", position.stop_loss, position.take_profit, high, low, start)
+            expected = _py(_first_exit_loop)(*args)
+            assert _first_exit_numpy(*args) == expected
+            assert first_exit_bar(position, high, low, start) == expected
+    assert _first_exit_numpy(True, 0.0, 1e9, high, low, 0) == -1
+
+
+def test_daily_limit_loop_matches_mask():
+    rng = np.random.default_rng(1)
+    day_ids = np.sort(rng.integers(0, 40, 500))
+    pnls = rng.normal(0, 0.006, 500)
+    expected = daily_limit_mask(day_ids, pnls, 3, 0.01, 0.008)
+    loop = _py(_daily_limit_loop)(day_ids, pnls, 3, 0.01, 0.008, np.empty(500, dtype=bool))
+    np.testing.assert_array_equal(loop, expected)
+
+
+def test_njit_falls_back_to_python():
+    assert jit.backend() == ("numba" if jit.JIT_ENABLED else "numpy")
+    if not jit.JIT_ENABLED:
+        assert all(callable(kernel) and not hasattr(kernel, "py_func") for kernel in KERNELS)
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+from backtesting import live_replay
+from backtesting.live_replay import replay_live
+
+
+def _candles(n=320):
+    rng = np.random.default_rng(7)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2024-01-01", periods=len(close), freq="h", tz="UTC"),
+        "open": close,
+        "high": close * 1.005,
+        "low": close * 0.995,
+        "close": close,
+        "volume": 1.0,
+    })
+
+
+def test_replay_drives_live_path_over_every_closed_candle():
+    candles = _candles()
+
+    report = replay_live(candles, symbols=["BTC/USDC"], sync_seconds=0)
+
+    # warmup is 200 candles; every later candle is decided once
+    assert report.candles == len(candles) - 200
+    assert report.candles_per_sec > 0
+    assert report.stages.calls["generate_signal"] == report.candles
+    assert len(report.signals) == report.candles
+    # live and backtest agree on every bar, and the comparison is not vacuous
+    assert report.divergences.empty
+    assert report.signals["backtest_side"].notna().all()
+    assert (report.signals["live_side"] != "FLAT").any()
+
+
+def test_replay_reports_an_injected_mismatch(monkeypatch):
+    backtest_signals = live_replay._backtest_signals
+
+    def flip_one(candles, strategy, timestamps):
+        expected = backtest_signals(candles, strategy, timestamps)
+        expected.loc[5, "backtest_side"] = "SHORT" if expected.loc[5, "backtest_side"] == "LONG" else "LONG"
+        return expected
+
+    monkeypatch.setattr(live_replay, "_backtest_signals", flip_one)
+    report = replay_live(_candles(), symbols=["BTC/USDC"], sync_seconds=0)
+
+    assert len(report.divergences) == 1
+    row = report.divergences.iloc[0]
+    assert row["timestamp"] == report.signals["timestamp"].iloc[5]
+    assert row["live_side"] != row["backtest_side"]
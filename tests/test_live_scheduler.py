@@ -0,0 +1,49 @@
+from live.scheduler import CandleCloseScheduler, next_candle_close, timeframe_to_seconds
+
+
+class FakeClock:
+    def __init__(self, start: float):
+        self.now = start
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def test_timeframe_and_next_close():
+    assert timeframe_to_seconds("1h") == 3600
+    assert timeframe_to_seconds("15m") == 900
+    assert next_candle_close(7200, 3600) == 10800
+    assert next_candle_close(7201, 3600) == 10800
+
+
+def test_scheduler_wakes_after_close_and_retries_until_published():
+    clock = FakeClock(start=3600 * 10 + 100)
+    calls = []
+    syncs = []
+
+    def on_close(close_ts):
+        calls.append((close_ts, clock.now))
+        # candle appears on the exchange 5s after the close
+        return clock.now >= close_ts + 5
+
+    scheduler = CandleCloseScheduler(
+        "1h",
+        on_close=on_close,
+        on_sync=lambda: syncs.append(clock.now),
+        close_delay=2,
+        retry_seconds=2,
+        sync_seconds=600,
+        clock=clock.time,
+        sleep=clock.sleep,
+    )
+    assert scheduler.run(max_closes=2) == 2
+
+    first_close = 3600 * 11
+    assert calls[0] == (first_close, first_close + 2)
+    assert [c for c, _ in calls].count(first_close) == 3
+    assert calls[-1][0] == first_close + 3600
+    # sync checks ran between closes but never replaced the close wake-up
+    assert syncs and all(s % 3600 != 2 for s in syncs)
@@ -0,0 +1,86 @@
+import threading
+
+import pandas as pd
+
+from data.market_data import MarketData
+from filters.trade_limiter import TradeLimiter
+from execution.sim_exchange import SimulatedExchange
+from live.multi_runner import CombinedTradeLimiter
+from live.trader import LiveTrader
+from strategy.signal import TradeSignal
+
+
+def _candles(n=10):
+    prices = [100.0 + i for i in range(n)]
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2024-01-01", periods=n, freq="h", tz="UTC"),
+        "open": prices,
+        "high": [p + 0.5 for p in prices],
+        "low": [p - 0.5 for p in prices],
+        "close": [p + 0.2 for p in prices],
+        "volume": [1.0] * n,
+    })
+
+
+class LongStrategy:
+    def generate_signal(self, candles):
+        return TradeSignal("BTC/USDC", "LONG", 100.0, 99.0, 101.0, reason="test")
+
+
+class RecordingLimiter:
+    def __init__(self):
+        self.checks = []
+
+    def reserve_trade(self, now_utc=None):
+        self.checks.append(now_utc)
+        return False
+
+
+class RecordingBroker:
+    def __init__(self, fill=True):
+        self.marks = []
+        self.fill = fill
+        self.lock_free_during_order = None
+
+    def sync_position(self, mark_price=None, trade_limiter=None):
+        self.marks.append(mark_price)
+
+    def has_open_position(self):
+        return False
+
+    def open_position(self, side, entry_price, stop_loss, take_profit):
+        self.lock_free_during_order = self.lock.acquire(blocking=False)
+        if self.lock_free_during_order:
+            self.lock.release()
+        return self.fill
+
+
+def test_limiter_sees_close_time_and_sync_marks_at_the_ticker():
+    sim = SimulatedExchange({"BTC/USDC": _candles()}, warmup_candles=3)
+    limiter, broker = RecordingLimiter(), RecordingBroker()
+    trader = LiveTrader(
+        "BTC/USDC", MarketData("BTC/USDC", client=sim), LongStrategy(), limiter, broker, clock=sim.time,
+    )
+    close_ts = int(sim.time()) // 3600 * 3600
+
+    assert trader.on_candle_close(close_ts)
+    assert limiter.checks == [pd.Timestamp(close_ts, unit="s")]
+    assert broker.marks == [103.0]             # forming candle, not the last closed close (102.2)
+
+    sim.sleep(3600)                            # next candle opens at 104
+    trader.sync()
+    assert broker.marks[-1] == sim.fetch_ticker("BTC/USDC")["last"] == 104.0
+
+
+def test_failed_order_releases_its_reserved_slot_outside_the_lock():
+    sim = SimulatedExchange({"BTC/USDC": _candles()}, warmup_candles=3)
+    lock = threading.Lock()
+    global_limiter = TradeLimiter(max_trades_per_day=1, log_blocks=False)
+    limiter = CombinedTradeLimiter(TradeLimiter(max_trades_per_day=3), global_limiter, lock)
+    broker = RecordingBroker(fill=False)
+    broker.lock = lock
+    trader = LiveTrader("BTC/USDC", MarketData("BTC/USDC", client=sim), LongStrategy(), limiter, broker)
+
+    assert trader.on_candle_close(int(sim.time()) // 3600 * 3600)
+    assert broker.lock_free_during_order
+    assert global_limiter.trades_today == limiter.local.trades_today == 0
@@ -0,0 +1,36 @@
+import sys
+
+import pytest
+
+from execution.paper_broker import PaperBroker
+from filters.trade_limiter import TradeLimiter
+from utils import logger as logger_mod
+from utils.logger import TraceBuffer, enabled, setup_logging
+
+
+@pytest.fixture
+def restore_logging(monkeypatch):
+    """Undo setup_logging(): module level/trace via monkeypatch, loguru's default stderr sink."""
+    monkeypatch.setattr(logger_mod, "_min_level_no", logger_mod._min_level_no)
+    monkeypatch.setattr(logger_mod, "_trace", logger_mod._trace)
+    yield
+    logger_mod.logger.remove()
+    logger_mod.logger.add(sys.stderr)
+
+
+def test_silent_mode_skips_formatting_and_trace_records_events(restore_logging):
+    trace = TraceBuffer()
+    setup_logging("silent", trace=trace)
+    assert not enabled("ERROR")
+    assert logger_mod._trace is trace
+
+    broker = PaperBroker(fee_rate=0.0)
+    limiter = TradeLimiter(log_resets=False, log_blocks=False)
+    broker.open_position("BTC/USDC", "LONG", 100.0, 99.0, 102.0)
+    limiter.record_trade_opened()
+    pnl = broker.check_and_close(high=102.5, low=100.5, close=102.0, trade_limiter=limiter)
+
+    frame = trace.to_frame()
+    assert frame["event"].tolist() == ["open", "close", "limiter_result"]
+    assert frame.loc[1, "exit"] == "take_profit"
+    assert frame.loc[2, "pnl_pct"] == pnl
@@ -0,0 +1,20 @@
+from utils.metrics import MetricsRegistry
+
+
+def test_histogram_and_counter_render_prometheus_text():
+    registry = MetricsRegistry()
+    polls = registry.counter("polls_total", "Polls")
+    latency = registry.histogram("stage_seconds", "Latency", buckets=(0.01, 0.1, 1.0))
+
+    polls.inc(symbol="BTC/USDC")
+    polls.inc(symbol="BTC/USDC")
+    latency.observe(0.05, stage="fetch")
+    latency.observe(0.5, stage="fetch")
+
+    text = registry.render()
+    assert '# TYPE polls_total counter' in text
+    assert 'polls_total{symbol="BTC/USDC"} 2' in text
+    assert 'stage_seconds_bucket{stage="fetch",le="0.1"} 1' in text
+    assert 'stage_seconds_bucket{stage="fetch",le="+Inf"} 2' in text
+    assert 'stage_seconds_count{stage="fetch"} 2' in text
+    assert latency.quantile(0.95, stage="fetch") == 1.0
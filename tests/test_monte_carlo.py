@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtesting import live_config_sweep
+from backtesting.monte_carlo import _path_stats_loop, simulate, trade_returns
+from backtesting.session_state import SessionState, TradeRecord
+from data.synthetic_data import synthetic_ohlcv
+from indicators.indicator_engine import add_indicators
+
+
+def _session(pnls):
+    session = SessionState()
+    for pnl in pnls:
+        session.record_trade(TradeRecord("BTC/USDC", "LONG", 1.0, 1.0, float(pnl), "test", pd.Timestamp("2024-01-01")))
+    return session
+
+
+def test_bootstrap_paths_match_session_replays():
+    pnls = np.random.default_rng(2).normal(0.001, 0.02, 60)
+    result = simulate(pnls, paths=7, seed=11)
+    draws = np.random.default_rng(11).integers(0, 60, size=(7, 60))
+    for path in range(7):
+        replay = _session(pnls[draws[path]])
+        assert result.returns[path] == pytest.approx(replay.summary()["return_pct"], abs=1e-12)
+        assert result.max_drawdowns[path] == pytest.approx(replay.max_drawdown(), abs=1e-12)
+
+    chunked = simulate(pnls, paths=7, seed=11, max_chunk_mb=0.002)   # 1 path per chunk
+    np.testing.assert_allclose(chunked.returns, result.returns, atol=1e-12)
+
+
+def test_shuffle_keeps_the_final_return():
+    session = _session(np.random.default_rng(3).normal(0.002, 0.01, 200))
+    result = simulate(session, paths=500, method="shuffle")
+    np.testing.assert_allclose(result.returns, session.summary()["return_pct"], atol=1e-12)
+    assert result.max_drawdowns.min() < session.max_drawdown() < result.max_drawdowns.max()
+    summary = result.summary()
+    assert summary["mc_drawdown_p5"] <= summary["mc_drawdown_p50"] <= summary["mc_drawdown_p95"] <= 0
+    assert summary["mc_prob_loss"] == 0.0
+
+
+def test_numpy_and_loop_kernels_agree():
+    log_pnl = np.log1p(np.random.default_rng(4).normal(0, 0.01, 40))
+    idx = np.random.default_rng(5).integers(0, 40, size=(30, 40))
+    returns, drawdowns = np.empty(30), np.empty(30)
+    getattr(_path_stats_loop, "py_func", _path_stats_loop)(log_pnl, idx, returns, drawdowns)
+    equity = np.cumsum(log_pnl[idx], axis=1)
+    peak = np.maximum(np.maximum.accumulate(equity, axis=1), 0.0)
+    np.testing.assert_allclose(returns, equity[:, -1], atol=1e-12)
+    np.testing.assert_allclose(drawdowns, (equity - peak).min(axis=1), atol=1e-12)
+
+
+def test_empty_session_and_sweep_columns():
+    assert simulate(trade_returns(SessionState()), paths=10).returns.tolist() == [0.0] * 10
+    candles = add_indicators(synthetic_ohlcv(1500, seed=1))
+    configs = [live_config_sweep.SweepConfig(30.0, 70.0, 1.0, 0.004)]
+    row = live_config_sweep.sweep_candles(candles, configs, monte_carlo_paths=200).iloc[0]
+    assert row["mc_drawdown_p5"] <= row["mc_drawdown_p95"] <= 0
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+
+from indicators import indicator_engine as ie
+from indicators.multi_period import add_multi_period, atr_multi, ema_multi, rsi_multi, sma_multi
+
+PERIODS = [2, 7, 14, 21, 50]
+
+
+def _candles(n=500, seed=11):
+    rng = np.random.default_rng(seed)
+    close = 20000 + np.cumsum(rng.normal(0, 50, n))
+    close[100:130] = np.linspace(close[100], close[100] + 300, 30)   # no losses -> RSI 100
+    return pd.DataFrame({
+        "high": close + rng.uniform(1, 40, n),
+        "low": close - rng.uniform(1, 40, n),
+        "close": close,
+    })
+
+
+def _assert_rows(matrix, reference, rtol=1e-9):
+    assert matrix.shape == (len(PERIODS), len(reference(PERIODS[0])))
+    for k, period in enumerate(PERIODS):
+        np.testing.assert_allclose(matrix[k], reference(period).to_numpy(), rtol=rtol, atol=1e-9)
+
+
+def test_multi_period_kernels_match_single_period():
+    df = _candles()
+    _assert_rows(sma_multi(df["close"], PERIODS), lambda p: ie.sma(df["close"], p))
+    _assert_rows(ema_multi(df["close"], PERIODS), lambda p: ie.ema(df["close"], p))
+    _assert_rows(ema_multi(df["close"], PERIODS, max_block=7), lambda p: ie.ema(df["close"], p))
+    _assert_rows(rsi_multi(df["close"], PERIODS), lambda p: ie.rsi(df["close"], p))
+    _assert_rows(atr_multi(df, PERIODS), lambda p: ie.atr(df, p))
+    assert rsi_multi(df["close"], [14])[0, 129] == 100.0
+
+
+def test_add_multi_period_uses_registry_names():
+    df = add_multi_period(_candles(), "rsi", [7, 14])
+    assert {"rsi7", "rsi14"} <= set(df.columns)
@@ -0,0 +1,59 @@
+import threading
+
+from filters.trade_limiter import TradeLimiter
+from live.multi_runner import CombinedTradeLimiter, MultiSymbolRunner
+
+
+class FakeTrader:
+    def __init__(self, symbol, ready_after):
+        self.symbol = symbol
+        self.ready_after = ready_after
+        self.calls = 0
+
+    def on_candle_close(self, close_ts):
+        self.calls += 1
+        return self.calls > self.ready_after
+
+    def sync(self):
+        pass
+
+
+def test_runner_retries_only_pending_symbols():
+    fast = FakeTrader("BTC/USDC", ready_after=0)
+    slow = FakeTrader("ETH/USDC", ready_after=2)
+    runner = MultiSymbolRunner([fast, slow])
+
+    assert not runner.on_candle_close(3600)
+    assert not runner.on_candle_close(3600)
+    assert runner.on_candle_close(3600)
+    assert fast.calls == 1
+    assert slow.calls == 3
+
+    # a new close re-arms every symbol
+    assert runner.on_candle_close(7200)
+    assert fast.calls == 2
+    runner.shutdown()
+
+
+def test_global_limiter_caps_trades_across_symbols():
+    lock = threading.RLock()
+    global_limiter = TradeLimiter(max_trades_per_day=1, log_blocks=False)
+    btc = CombinedTradeLimiter(TradeLimiter(max_trades_per_day=3), global_limiter, lock)
+    eth = CombinedTradeLimiter(TradeLimiter(max_trades_per_day=3), global_limiter, lock)
+
+    assert btc.can_trade()
+    btc.record_trade_opened()
+    assert not eth.can_trade()
+    assert eth.local.trades_today == 0
+
+
+def test_reserve_takes_a_slot_atomically_and_release_gives_it_back():
+    global_limiter = TradeLimiter(max_trades_per_day=1, log_blocks=False)
+    btc = CombinedTradeLimiter(TradeLimiter(max_trades_per_day=3), global_limiter)
+    eth = CombinedTradeLimiter(TradeLimiter(max_trades_per_day=3), global_limiter)
+
+    assert btc.reserve_trade()
+    assert not eth.reserve_trade()
+    btc.release_trade()
+    assert global_limiter.trades_today == btc.local.trades_today == 0
+    assert eth.reserve_trade()
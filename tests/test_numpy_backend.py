@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators import indicator_engine as ie
+from indicators import numpy_backend as nb
+
+
+def _candles(n=600, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 30000 + np.cumsum(rng.normal(0, 60, n))
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2024-01-01", periods=n, freq="h", tz="UTC"),
+        "open": close,
+        "high": close + rng.uniform(1, 50, n),
+        "low": close - rng.uniform(1, 50, n),
+        "close": close,
+        "volume": np.ones(n),
+    })
+
+
+def _close(actual, expected, rtol=1e-9):
+    np.testing.assert_allclose(actual, np.asarray(expected, dtype=np.float64), rtol=rtol, atol=1e-8)
+
+
+def test_kernels_match_pandas():
+    df = _candles()
+    close = df["close"]
+    _close(nb.sma(close, 50), ie.sma(close, 50))
+    _close(nb.ema(close, 21), ie.ema(close, 21))
+    _close(nb.rsi(close, 14), ie.rsi(close, 14))
+    _close(nb.true_range(df["high"], df["low"], close), ie.atr(df, 1))
+    _close(nb.atr(df["high"], df["low"], close, 14), ie.atr(df, 14))
+    for actual, expected in zip(nb.macd(close), ie.macd(close)):
+        _close(actual, expected)
+    _close(nb.rolling_high(df["high"], 50), ie.rolling_high(df["high"], 50))
+    _close(nb.rolling_low(df["low"], 50), ie.rolling_low(df["low"], 50))
+    _close(nb.rolling_high(df["high"], 7), ie.rolling_high(df["high"], 7))   # 600 % 7 != 0
+
+
+def test_out_buffers_and_float32():
+    close = _candles()["close"]
+    out = np.empty(len(close), dtype=np.float32)
+    assert nb.rsi(close, 14, out=out) is out
+    _close(out, ie.rsi(close, 14), rtol=1e-5)
+    _close(nb.ema(close, 21, dtype=np.float32), ie.ema(close, 21), rtol=1e-6)
+    with pytest.raises(ValueError):
+        nb.sma(close, 10, out=np.empty(3))
+
+
+def test_add_indicators_numpy_backend():
+    df = _candles()
+    expected = ie.add_indicators(df.copy())
+    actual = ie.add_indicators(df.copy(), backend="numpy")
+    assert list(actual.columns) == list(expected.columns)
+    for column in expected.columns[6:]:
+        _close(actual[column], expected[column])
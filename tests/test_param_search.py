@@ -0,0 +1,85 @@
+import numpy as np
+
+from backtesting.engine import default_limiter, run_strategy_loop
+from backtesting.param_search import (
+    SEARCH_SPACES,
+    Choice,
+    IntRange,
+    LatinHypercubeSampler,
+    ResultCache,
+    TPESampler,
+    Uniform,
+    evaluate,
+    prepare_candles,
+    search,
+)
+from data.synthetic_data import synthetic_ohlcv
+from utils.config import Config
+
+SYMBOL = "BTC/USDC"
+
+
+def test_dimensions_decode_inside_their_ranges():
+    assert Uniform(1.0, 3.0).decode(0.5) == 2.0
+    assert abs(Uniform(0.001, 0.1, log=True).decode(0.5) - 0.01) < 1e-12
+    assert [IntRange(10, 20, 5).decode(u) for u in (0.0, 0.5, 0.999)] == [10, 15, 20]
+    assert Choice((None, "a")).decode(0.99) == "a"
+
+
+def test_latin_hypercube_covers_every_stratum():
+    points = LatinHypercubeSampler(dims=3, size=10, seed=1).ask(10)
+    for column in points.T:
+        assert sorted(np.floor(column * 10).astype(int)) == list(range(10))
+
+
+def test_tpe_concentrates_near_the_optimum():
+    sampler = TPESampler(dims=2, seed=3, startup=10)
+    target = np.array([0.8, 0.2])
+    for _ in range(12):
+        points = sampler.ask(4)
+        sampler.tell(points, -((points - target) ** 2).sum(axis=1))
+    late = sampler.points[-16:]
+    early = sampler.points[:10]
+    assert np.linalg.norm(late - target, axis=1).mean() < np.linalg.norm(early - target, axis=1).mean() / 2
+
+
+def test_prepared_candles_give_the_same_backtest():
+    candles = synthetic_ohlcv(1500, seed=4)
+    space = SEARCH_SPACES["mean_reversion"]
+    params = space.decode([0.5] * space.dims)
+    expected = run_strategy_loop(space.build(params, SYMBOL), candles, SYMBOL, limiter=default_limiter(candles))
+    assert evaluate(space, params, prepare_candles(candles, space), SYMBOL) == expected.summary()
+
+
+def test_search_respects_budget_and_reuses_cache(tmp_path):
+    space = SEARCH_SPACES["trend_breakout"]
+    candles = prepare_candles(synthetic_ohlcv(1200, seed=6), space)
+    cache_path = tmp_path / "cache.jsonl"
+
+    first = search(candles, space, sampler="lhs", budget=4, min_trades=0, prepared=True,
+                   symbol=SYMBOL, cache=ResultCache(cache_path))
+    assert first.evaluations == 4 and first.cache_hits == 0
+    assert len(first.trials) == 4
+    assert list(first.trials["score"]) == sorted(first.trials["score"], reverse=True)
+    assert set(first.best) == {"lookback", "atr_mult"}
+
+    again = search(candles, space, sampler="lhs", budget=4, min_trades=0, prepared=True,
+                   symbol=SYMBOL, cache=ResultCache(cache_path))
+    assert again.cache_hits == 4 and again.evaluations == 0
+    assert again.trials["cached"].all()
+    assert again.best == first.best
+
+    longer = search(candles, space, sampler="random", budget=6, min_trades=0, prepared=True,
+                    symbol=SYMBOL, cache=ResultCache(cache_path), seed=5)
+    assert longer.evaluations + longer.cache_hits == len(longer.trials) == 6
+
+
+def test_cache_misses_when_limiter_caps_change(tmp_path, monkeypatch):
+    space = SEARCH_SPACES["trend_breakout"]
+    candles = prepare_candles(synthetic_ohlcv(1200, seed=6), space)
+    cache = ResultCache(tmp_path / "cache.jsonl")
+
+    search(candles, space, sampler="lhs", budget=3, min_trades=0, prepared=True, symbol=SYMBOL, cache=cache)
+    monkeypatch.setattr(Config, "MAX_TRADES_PER_DAY", Config.MAX_TRADES_PER_DAY + 1)
+    rerun = search(candles, space, sampler="lhs", budget=3, min_trades=0, prepared=True, symbol=SYMBOL, cache=cache)
+    assert rerun.evaluations == 3 and rerun.cache_hits == 0
@@ -0,0 +1,58 @@
+from backtesting.engine import BacktestEngine
+from backtesting.profiling import ROOT_FRAME, SIGNAL, StageProfiler
+from data.synthetic_data import synthetic_ohlcv
+from strategy.variants import MeanReversionStrategy
+
+SYMBOL = "BTC/USDC"
+
+
+def _run(profiler=None, **strategy_kwargs):
+    candles = synthetic_ohlcv(3000, seed=3)
+    strategy = MeanReversionStrategy(SYMBOL, **strategy_kwargs)
+    return BacktestEngine(strategy, SYMBOL, profiler=profiler).run(candles)
+
+
+def test_profiler_does_not_change_results():
+    profiler = StageProfiler()
+    plain = _run(allowed_utc_hours=range(13, 21))
+    profiled = _run(profiler, allowed_utc_hours=range(13, 21))
+    assert plain.summary() == profiled.summary()
+    assert [t.pnl_pct for t in plain.trades] == [t.pnl_pct for t in profiled.trades]
+
+
+def test_profiler_records_stages_and_signal_branches():
+    profiler = StageProfiler()
+    session = _run(profiler, allowed_utc_hours=range(13, 21))
+
+    assert profiler.runs == 1 and profiler.run_seconds > 0
+    assert (SIGNAL, "Time filter") in profiler.seconds
+    assert profiler.calls[("session.record_trade",)] == len(session.trades)
+    calls = sum(c for stack, c in profiler.calls.items() if stack[0] == SIGNAL)
+    assert 0 < calls <= profiler.calls[("limiter.blocked_until",)]
+
+    rows = profiler.rows()
+    signal_row = next(r for r in rows if r["stage"] == SIGNAL)
+    assert signal_row["depth"] == 0 and signal_row["calls"] == calls
+    assert any(r["stage"] == "Time filter" and r["depth"] == 1 for r in rows)
+    assert "generate_signal" in profiler.table()
+
+
+def test_collapsed_stacks_and_merge(tmp_path):
+    profiler = StageProfiler()
+    profiler.add((SIGNAL, "a;b"), 0.002)
+    profiler.add(("broker.check_and_close",), 0.001)
+    profiler.add_run(0.010)
+
+    lines = profiler.collapsed()
+    assert f"{ROOT_FRAME};{SIGNAL};a:b 2000" in lines
+    assert f"{ROOT_FRAME};broker.check_and_close 1000" in lines
+    assert lines[-1] == f"{ROOT_FRAME} 7000"
+
+    other = StageProfiler()
+    other.merge(profiler)
+    other.merge(profiler)
+    assert other.runs == 2 and other.calls[(SIGNAL, "a;b")] == 2
+    assert other.seconds[(SIGNAL, "a;b")] == 0.004
+
+    path = profiler.write_collapsed(tmp_path / "out" / "stacks.txt")
+    assert path.read_text().splitlines() == lines
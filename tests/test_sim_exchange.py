@@ -0,0 +1,47 @@
+import ccxt
+import pandas as pd
+import pytest
+
+from execution.sim_exchange import SimulatedExchange
+
+
+def _candles(n=10):
+    prices = [100.0 + i for i in range(n)]
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2024-01-01", periods=n, freq="h", tz="UTC"),
+        "open": prices,
+        "high": [p + 0.5 for p in prices],
+        "low": [p - 0.5 for p in prices],
+        "close": [p + 0.2 for p in prices],
+        "volume": [1.0] * n,
+    })
+
+
+def test_fetch_ohlcv_hides_forming_candle_prices():
+    sim = SimulatedExchange({"BTC/USDC": _candles()}, warmup_candles=3)
+    rows = sim.fetch_ohlcv("BTC/USDC", limit=5)
+    assert len(rows) == 4
+    forming = rows[-1]
+    assert forming[1] == forming[2] == forming[3] == forming[4] == 103.0
+
+
+def test_protective_stop_closes_long_on_later_candle():
+    df = _candles()
+    df.loc[5, "low"] = 90.0
+    sim = SimulatedExchange({"BTC/USDC": df}, warmup_candles=3, fee_rate=0.0)
+    sim.create_order("BTC/USDC", "market", "buy", 1.0)
+    sim.create_order("BTC/USDC", "STOP_MARKET", "sell", 1.0, None, {"stopPrice": 95.0, "reduceOnly": True})
+    sim.create_order("BTC/USDC", "TAKE_PROFIT_MARKET", "sell", 1.0, None, {"stopPrice": 120.0, "reduceOnly": True})
+
+    sim.sleep(3 * 3600)
+    positions = sim.fetch_positions(["BTC/USDC"])
+    assert positions[0]["contracts"] == 0
+    assert sim.balance == pytest.approx(10_000.0 - 8.0)
+    assert sim.fills[-1]["type"] == "STOP_MARKET"
+
+
+def test_failure_injection_raises_network_error():
+    sim = SimulatedExchange({"BTC/USDC": _candles()}, warmup_candles=3, failure_rate=1.0, seed=1)
+    with pytest.raises(ccxt.NetworkError):
+        sim.fetch_balance()
+    assert sim.failures == 1
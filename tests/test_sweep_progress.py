@@ -0,0 +1,65 @@
+import io
+import json
+
+import pandas as pd
+
+from backtesting import consistency_sweep, live_config_sweep
+from backtesting.progress import SweepProgress, load_progress
+from backtesting.run_window_backtests import year_windows
+from data.synthetic_data import synthetic_ohlcv
+from indicators.indicator_engine import add_indicators
+from strategy.regime import MarketRegime
+
+
+def _candles(bars=2000):
+    return add_indicators(synthetic_ohlcv(bars, seed=5, start="2021-11-01"))
+
+
+def _events(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_live_sweep_writes_one_run_event_per_config(tmp_path):
+    candles = _candles()
+    configs = [live_config_sweep.SweepConfig(low, 100 - low, 1.0, 0.004) for low in (28.0, 32.0)]
+    path = tmp_path / "sweep.jsonl"
+    stream = io.StringIO()
+
+    with SweepProgress(len(configs), path=path, label="test", stream=stream) as progress:
+        results = live_config_sweep.sweep_candles(candles, configs, progress=progress)
+
+    events = _events(path)
+    assert [e["event"] for e in events] == ["start", "run", "run", "done"]
+    last_run = events[2]
+    assert last_run["runs_done"] == last_run["total_runs"] == 2
+    assert last_run["configs_done"] == 1 and events[-1]["configs_done"] == 2
+    assert last_run["eta_seconds"] == 0.0 and last_run["bars"] == len(candles)
+    assert sorted(e["trades"] for e in events[1:3]) == sorted(results["total_trades"])
+    assert len(events[-1]["slowest"]) == 2
+    assert "configs 2/2" in stream.getvalue()
+
+    frame = load_progress(path)
+    assert list(frame["rsi_low"]) == [28.0, 32.0]
+    assert (frame["seconds"] > 0).all()
+
+
+def test_consistency_sweep_records_windows_and_skips(tmp_path):
+    candles = _candles(bars=24 * 120)
+    windows = year_windows(2021, 2023, "2023-06-01")   # 2023 has no candles
+    config = consistency_sweep.SweepConfig(
+        rsi_low=30.0, rsi_high=70.0, atr_mult=1.0, min_stretch=0.004, min_stretch_atr_mult=None,
+        allowed_regimes=(MarketRegime.SIDEWAYS,), allowed_utc_hours=range(13, 21),
+    )
+    path = tmp_path / "consistency.jsonl"
+
+    with SweepProgress(1, len(windows), path=path, stream=None) as progress:
+        consistency_sweep.sweep_windows(candles, windows, [config], progress=progress)
+
+    events = _events(path)
+    runs = [e for e in events if e["event"] == "run"]
+    assert [e["window"] for e in runs] == [2021, 2022]
+    assert [e["window"] for e in events if e["event"] == "skip"] == [2023]
+    assert runs[0]["config"]["allowed_regimes"] == ["SIDEWAYS"]
+    assert runs[0]["config"]["allowed_utc_hours"] == list(range(13, 21))
+    assert events[-1]["runs_done"] == 3 and events[-1]["eta_seconds"] == 0.0
+    assert pd.Timestamp(events[0]["started_at"]).tzinfo is not None
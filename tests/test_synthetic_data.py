@@ -0,0 +1,21 @@
+import numpy as np
+
+from data.synthetic_data import synthetic_ohlcv
+
+
+def test_synthetic_ohlcv_is_seeded_and_consistent():
+    df = synthetic_ohlcv(5_000, seed=3)
+    assert df.equals(synthetic_ohlcv(5_000, seed=3))
+    assert not df.equals(synthetic_ohlcv(5_000, seed=4))
+
+    assert list(df.columns) == ["timestamp", "open", "high", "low", "close", "volume"]
+    assert (df["high"] >= df[["open", "close"]].max(axis=1)).all()
+    assert (df["low"] <= df[["open", "close"]].min(axis=1)).all()
+    assert (df["open"].iloc[1:].to_numpy() == df["close"].iloc[:-1].to_numpy()).all()
+    assert df["timestamp"].is_monotonic_increasing and str(df["timestamp"].dt.tz) == "UTC"
+
+
+def test_volatility_regimes_switch():
+    df = synthetic_ohlcv(20_000, seed=1, regimes=((0.2, 0.5), (2.0, 0.5)), mean_regime_bars=1_000)
+    vol = np.log(df["close"]).diff().rolling(500).std().dropna()
+    assert vol.max() > 4 * vol.min()
@@ -1,4 +1,9 @@
+import numpy as np
+import pandas as pd
+
 from filters.trade_limiter import TradeLimiter
+from filters.trading_calendar import TradingDayCalendar
+
 
 def test_daily_trade_limit_and_reset():
     limiter = TradeLimiter(max_trades_per_day=1)
@@ -9,4 +14,71 @@ def test_daily_trade_limit_and_reset():
 
     # force-reset for test
     limiter.trades_today = 0  
-    assert limiter.can_trade()
\ No newline at end of file
+    assert limiter.can_trade()
+
+
+def test_calendar_boundaries_follow_us_open_across_dst():
+    cal = TradingDayCalendar.for_range("2024-03-01", "2024-03-20")
+    # 9:30 EST = 14:30 UTC before the switch, 9:30 EDT = 13:30 UTC after
+    assert cal.day_id(pd.Timestamp("2024-03-05 14:29")) + 1 == cal.day_id(pd.Timestamp("2024-03-05 14:30"))
+    assert cal.day_id(pd.Timestamp("2024-03-12 13:29")) + 1 == cal.day_id(pd.Timestamp("2024-03-12 13:30"))
+
+
+def test_calendar_limiter_matches_clock_limiter():
+    times = pd.date_range("2024-01-02", "2024-02-20", freq="h")
+    pnls = [((i * 37) % 11 - 5) / 1000 for i in range(len(times))]
+    kwargs = dict(max_trades_per_day=2, log_resets=False, log_blocks=False)
+    clock = TradeLimiter(**kwargs)
+    fast = TradeLimiter(calendar=TradingDayCalendar.for_timestamps(pd.Series(times)), **kwargs)
+
+    for ts, pnl in zip(times, pnls):
+        allowed = clock.can_trade(ts)
+        assert fast.can_trade(ts) == allowed
+        if allowed:
+            for limiter in (clock, fast):
+                limiter.record_trade_opened()
+                limiter.record_trade_result(pnl)
+    assert fast.trades_today == clock.trades_today
+    assert fast.next_reset_ts == clock.next_reset_ts
+
+
+def test_allowed_mask_matches_stateful_limiter():
+    rng = np.random.default_rng(7)
+    gaps = rng.integers(1, 9, size=400)
+    entries = pd.Timestamp("2024-01-01") + pd.to_timedelta(np.cumsum(gaps), unit="h")
+    exits = entries + pd.Timedelta(minutes=30)
+    pnls = rng.normal(0.0, 0.01, size=400)
+
+    kwargs = dict(max_trades_per_day=3, max_daily_loss_pct=0.015, max_daily_profit_pct=0.01,
+                  log_resets=False, log_blocks=False)
+    stateful = TradeLimiter(**kwargs)
+    expected = []
+    for ts, pnl in zip(entries, pnls):
+        allowed = stateful.can_trade(ts)
+        expected.append(allowed)
+        if allowed:
+            stateful.record_trade_opened()
+            stateful.record_trade_result(pnl)
+
+    mask = TradeLimiter(**kwargs).allowed_mask(entries, pnls, exit_times=exits)
+    assert mask.tolist() == expected
+    assert 0 < mask.sum() < len(mask)
+
+
+def test_release_ignores_reservations_from_before_the_reset():
+    limiter = TradeLimiter(max_trades_per_day=2, log_resets=False, log_blocks=False)
+    monday = pd.Timestamp("2024-01-08 15:00", tz="UTC")         # 10:00 ET
+    tuesday = pd.Timestamp("2024-01-09 15:00", tz="UTC")
+
+    assert limiter.reserve_trade(monday)
+    assert limiter.reserve_trade(tuesday)                         # resets, then takes Tuesday's first slot
+    limiter.release_trade(monday)                                 # Monday's order failed late
+    assert limiter.trades_today == 1
+    limiter.release_trade(tuesday)
+    assert limiter.trades_today == 0
+
+    calendar = TradeLimiter(max_trades_per_day=2, log_resets=False, log_blocks=False,
+                            calendar=TradingDayCalendar.for_range("2024-01-01", "2024-01-31"))
+    assert calendar.reserve_trade(monday) and calendar.reserve_trade(tuesday)
+    calendar.release_trade(monday)
+    assert calendar.trades_today == 1
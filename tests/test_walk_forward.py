@@ -0,0 +1,45 @@
+import pandas as pd
+
+from backtesting.param_search import SEARCH_SPACES, prepare_candles
+from backtesting.walk_forward import make_folds, walk_forward
+from data.synthetic_data import synthetic_ohlcv
+
+
+def test_rolling_and_anchored_folds_tile_the_test_period():
+    rolling = make_folds("2020-01-01", "2021-08-15", train_months=6, test_months=3)
+    assert [f.test_start.strftime("%Y-%m") for f in rolling] == ["2020-07", "2020-10", "2021-01", "2021-04", "2021-07"]
+    assert all(f.train_end == f.test_start for f in rolling)
+    assert all(f.train_start == f.test_start - pd.DateOffset(months=6) for f in rolling)
+    assert rolling[-1].test_end == pd.Timestamp("2021-08-15", tz="UTC")
+    assert all(a.test_end == b.test_start for a, b in zip(rolling, rolling[1:]))
+
+    anchored = make_folds("2020-01-01", "2021-08-15", train_months=6, test_months=3, anchored=True)
+    assert [f.test_start for f in anchored] == [f.test_start for f in rolling]
+    assert {f.train_start for f in anchored} == {pd.Timestamp("2020-01-01", tz="UTC")}
+
+
+def test_walk_forward_trades_only_out_of_sample(tmp_path):
+    space = SEARCH_SPACES["momentum"]
+    candles = prepare_candles(synthetic_ohlcv(24 * 200, seed=8, start="2020-01-01"), space)
+    folds = make_folds("2020-01-01", "2020-07-15", train_months=3, test_months=2)
+
+    result = walk_forward(
+        candles, space, folds, workers=1, prepared=True, cache_dir=tmp_path,
+        sampler="random", budget=2, min_trades=0,
+    )
+
+    assert len(result.folds) == 2
+    for item in result.folds:
+        stamps = [t.timestamp for t in item.test_session.trades]
+        assert all(item.fold.test_start <= ts < item.fold.test_end for ts in stamps)
+        assert set(item.params) == {"atr_mult"}
+    assert len(result.session.trades) == sum(len(item.test_session.trades) for item in result.folds)
+    assert list(result.table()["fold"]) == [0, 1]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["momentum_fold0.jsonl", "momentum_fold1.jsonl"]
+
+    again = walk_forward(   # every trial is cached now
+        candles, space, folds, workers=1, prepared=True, cache_dir=tmp_path,
+        sampler="random", budget=2, min_trades=0,
+    )
+    assert again.summary() == result.summary()
+    assert sum(item.evaluations for item in again.folds) == 0
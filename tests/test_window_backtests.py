@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+from backtesting import run_window_backtests as rwb
+from indicators.indicator_engine import add_indicators
+
+
+def _raw_candles():
+    rng = np.random.default_rng(11)
+    ts = pd.date_range("2023-11-01", "2024-02-15", freq="h", tz="UTC")
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, size=len(ts))))
+    spread = np.abs(rng.normal(0.0, 0.006, size=len(ts))) * close
+    return pd.DataFrame({
+        "timestamp": ts, "open": close, "high": close + spread,
+        "low": close - spread, "close": close, "volume": 1.0,
+    })
+
+
+def test_isolated_year_windows_match_standalone_runs(monkeypatch, tmp_path):
+    raw = _raw_candles()
+
+    def fake_load(symbol, timeframe, start, end=None):
+        lo, hi = pd.Timestamp(start, tz="UTC"), pd.Timestamp(end, tz="UTC")
+        return raw[(raw["timestamp"] >= lo) & (raw["timestamp"] <= hi)].reset_index(drop=True)
+
+    monkeypatch.setattr(rwb, "load_historical_ohlcv", fake_load)
+    monkeypatch.setattr(rwb, "plot_equity_curve", lambda *a, **k: None)
+    monkeypatch.chdir(tmp_path)
+
+    sessions = rwb.run_multi_window_backtests("BTC/USDC", "1h", "2023-01-01", "2024-02-15", max_workers=1)
+
+    standalone = add_indicators(fake_load("BTC/USDC", "1h", "2024-01-01", "2024-02-15"))
+    expected = rwb._run_window(standalone, "BTC/USDC")
+    assert sessions[2024].trades == expected.trades
+    assert sessions[2024].trades
+
+    carried = rwb.run_multi_window_backtests(
+        "BTC/USDC", "1h", "2023-01-01", "2024-02-15", carry_warmup=True, max_workers=1,
+    )
+    assert min(t.timestamp for t in carried[2024].trades) >= pd.Timestamp("2024-01-01", tz="UTC")
+
+
+def test_tz_naive_candles_run_like_utc_ones(monkeypatch, tmp_path):
+    # the Binance path of load_historical_ohlcv returns naive UTC timestamps
+    raw = _raw_candles()
+    naive = raw.assign(timestamp=raw["timestamp"].dt.tz_localize(None))
+    monkeypatch.setattr(rwb, "plot_equity_curve", lambda *a, **k: None)
+    monkeypatch.chdir(tmp_path)
+
+    runs = {}
+    for label, frame in (("aware", raw), ("naive", naive)):
+        monkeypatch.setattr(rwb, "load_historical_ohlcv", lambda *a, frame=frame, **k: frame)
+        runs[label] = rwb.run_multi_window_backtests(
+            "BTC/USDC", "1h", "2023-01-01", "2024-02-15", carry_warmup=True, max_workers=1,
+        )
+
+    assert sorted(runs["naive"]) == sorted(runs["aware"]) == [2023, 2024]
+    pnls = {label: [t.pnl_pct for t in sessions[2024].trades] for label, sessions in runs.items()}
+    assert pnls["naive"] == pnls["aware"] and pnls["naive"]